@@ -0,0 +1,6 @@
+"""
+Offline benchmarks of eltiempoes. They run against the saved pages of
+tests/fixtures, so the results do not depend on the network or on the site.
+
+    python -m benchmarks [--quick] [--output results.json] [--baseline old.json]
+"""
@@ -0,0 +1,116 @@
+"""
+Run every benchmark and write one JSON report.
+
+    python -m benchmarks [--quick] [--rounds 5] [--output results.json]
+                         [--baseline old.json] [--max-regression 0.5]
+                         [--fail-on-regression]
+
+Every round runs all the benchmarks again and the report has the median of the
+rounds, so one slow round on a shared machine does not move the figures. With
+--baseline, the benchmarks slower than the baseline by more than
+--max-regression (a fraction) are listed in the report. The exit code is 1 for
+them only with --fail-on-regression.
+"""
+
+import argparse
+import json
+import statistics
+import sys
+import time
+
+from . import bench_client, bench_import, bench_parsing
+
+
+def compare(report: dict, baseline: dict, max_regression: float) -> list:
+    """Benchmarks slower than the baseline by more than max_regression"""
+    regressions = []
+    for suite, results in report["suites"].items():
+        baseline_results = baseline.get("suites", {}).get(suite, {})
+        for name, result in results.items():
+            if name not in baseline_results:
+                continue
+            old, new = baseline_results[name]["median_us"], result["median_us"]
+            if old > 0 and (new - old) / old > max_regression:
+                regressions.append(
+                    {"suite": suite, "name": name, "baseline_us": old, "median_us": new}
+                )
+    return regressions
+
+
+def run_suites(quick: bool) -> dict:
+    parsing = (3, 3) if quick else (20, 5)
+    client = (2, 3) if quick else (5, 5)
+    import_timings = bench_import.time_statement("import eltiempoes", 3 if quick else 10)
+    return {
+        "import": {
+            "import eltiempoes": {
+                "median_us": statistics.median(import_timings) * 1e6,
+                "min_us": min(import_timings) * 1e6,
+            }
+        },
+        "parsing": bench_parsing.run(*parsing),
+        "client": bench_client.run(*client),
+    }
+
+
+def merge_rounds(rounds: list) -> dict:
+    """Median of the rounds of every benchmark, with the minimum of all of them"""
+    suites = {}
+    for suite, results in rounds[0].items():
+        suites[suite] = {}
+        for name, result in results.items():
+            results_of_rounds = [suites_of_round[suite][name] for suites_of_round in rounds]
+            suites[suite][name] = {
+                **result,
+                "median_us": statistics.median(
+                    result_of_round["median_us"] for result_of_round in results_of_rounds
+                ),
+                "min_us": min(result_of_round["min_us"] for result_of_round in results_of_rounds),
+                "rounds": len(rounds),
+            }
+    return suites
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--quick", action="store_true", help="Fewer repetitions")
+    parser.add_argument("--output", help="JSON file. Printed to stdout by default")
+    parser.add_argument("--baseline", help="JSON report of a previous run")
+    parser.add_argument("--rounds", type=int, default=1, help="Runs of every benchmark")
+    parser.add_argument("--max-regression", type=float, default=0.5)
+    parser.add_argument(
+        "--fail-on-regression",
+        action="store_true",
+        help="Exit code 1 when a benchmark regressed. Only reported by default",
+    )
+    args = parser.parse_args(argv)
+    if args.rounds < 1:
+        parser.error("--rounds must be at least 1")
+
+    report = {
+        "python": sys.version.split()[0],
+        "time": time.time(),
+        "suites": merge_rounds([run_suites(args.quick) for _ in range(args.rounds)]),
+    }
+    if args.baseline:
+        with open(args.baseline) as baseline_file:
+            report["regressions"] = compare(
+                report, json.load(baseline_file), args.max_regression
+            )
+
+    text = json.dumps(report, indent=2)
+    if args.output:
+        with open(args.output, "w") as output_file:
+            output_file.write(text)
+    else:
+        print(text)
+    for regression in report.get("regressions", []):
+        print(
+            "{suite}/{name}: {baseline_us:.1f} us -> {median_us:.1f} us".format(**regression),
+            file=sys.stderr,
+        )
+    return 1 if args.fail_on_regression and report.get("regressions") else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
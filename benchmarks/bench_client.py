@@ -0,0 +1,73 @@
+"""
+Macro benchmarks of ElTiempoEs against a local stand-in of the site that
+serves the saved pages.
+
+    python -m benchmarks.bench_client [--quick] [--output client.json]
+"""
+
+import argparse
+import json
+import sys
+import time
+
+from eltiempoes import ElTiempoEs
+from eltiempoes.constants import MAIN_URL
+
+from .common import LocalSite, measure
+
+STATIONS = tuple(f"station{index}" for index in range(16))
+
+
+def create_client(site: LocalSite, parser: str) -> ElTiempoEs:
+    tiempo = ElTiempoEs(parser=parser, pool_maxsize=8)
+    tiempo.session.mount(MAIN_URL, site.adapter(pool_maxsize=8))
+    return tiempo
+
+
+def run(number: int = 5, repeat: int = 5) -> dict:
+    results = {}
+    with LocalSite(stations=("cordoba",) + STATIONS) as site:
+        for parser in ("html.parser", "auto"):
+            with create_client(site, parser) as tiempo:
+                results[f"get_all_data_in_json.{tiempo.parser}"] = measure(
+                    lambda: tiempo.get_all_data_in_json("cordoba"), number, repeat
+                )
+                results[f"stream_hourly_prediction_json.{tiempo.parser}"] = measure(
+                    lambda: list(tiempo.stream_hourly_prediction_json("cordoba")),
+                    number,
+                    repeat,
+                )
+                results[f"get_many.16.{tiempo.parser}"] = measure(
+                    lambda: list(tiempo.get_many(STATIONS, max_workers=8)), 1, repeat
+                )
+        with create_client(site, "auto") as tiempo:
+            results["search_location"] = measure(
+                lambda: tiempo.search_location("cordoba"), number, repeat
+            )
+    return results
+
+
+def main(argv=None) -> dict:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--quick", action="store_true", help="Fewer repetitions")
+    parser.add_argument("--output", help="JSON file. Printed to stdout by default")
+    args = parser.parse_args(argv)
+
+    number, repeat = (2, 3) if args.quick else (5, 5)
+    report = {
+        "benchmark": "client",
+        "python": sys.version.split()[0],
+        "time": time.time(),
+        "results": run(number, repeat),
+    }
+    text = json.dumps(report, indent=2)
+    if args.output:
+        with open(args.output, "w") as output_file:
+            output_file.write(text)
+    else:
+        print(text)
+    return report
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,64 @@
+"""
+Import time of the package, measured in fresh interpreters.
+
+    python -m benchmarks.bench_import [--repeat 20] [--output import.json]
+"""
+
+import argparse
+import json
+import statistics
+import subprocess
+import sys
+import time
+
+STATEMENTS = {
+    "import eltiempoes": "import eltiempoes",
+    "import ElTiempoEs": "from eltiempoes import ElTiempoEs",
+    "first client": "from eltiempoes import ElTiempoEs; ElTiempoEs()",
+}
+
+
+def time_statement(statement: str, repeat: int) -> list:
+    # Time of the statement only: the start of the interpreter is subtracted
+    code = (
+        "import time\n"
+        "start = time.perf_counter()\n"
+        f"{statement}\n"
+        "print(time.perf_counter() - start)"
+    )
+    timings = []
+    for _ in range(repeat):
+        output = subprocess.run(
+            [sys.executable, "-c", code], capture_output=True, text=True, check=True
+        ).stdout
+        timings.append(float(output))
+    return timings
+
+
+def main(argv=None) -> dict:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--repeat", type=int, default=20)
+    parser.add_argument("--output", help="JSON file. Printed to stdout by default")
+    args = parser.parse_args(argv)
+
+    results = {}
+    for name, statement in STATEMENTS.items():
+        timings = time_statement(statement, args.repeat)
+        results[name] = {
+            "median_ms": statistics.median(timings) * 1000,
+            "min_ms": min(timings) * 1000,
+            "repeat": args.repeat,
+        }
+
+    report = {"benchmark": "import", "python": sys.version.split()[0], "time": time.time(), "results": results}
+    text = json.dumps(report, indent=2)
+    if args.output:
+        with open(args.output, "w") as output_file:
+            output_file.write(text)
+    else:
+        print(text)
+    return report
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,128 @@
+"""
+Micro benchmarks of the scraping path: every getter of web_scraping.py, the
+single-pass extractor, the parser backends, the regex fast path and the
+streaming parser.
+
+    python -m benchmarks.bench_parsing [--quick] [--output parsing.json]
+"""
+
+import argparse
+import json
+import sys
+import time
+
+from bs4 import BeautifulSoup
+
+from eltiempoes import web_scraping
+from eltiempoes.fast_extract import extract_daily_prediction, extract_detallada_prediction
+from eltiempoes.parsers import is_parser_available, parse_table
+from eltiempoes.predictions import parse_daily_prediction, parse_detallada_prediction
+from eltiempoes.streaming import iter_table_rows
+from eltiempoes.web_scraping import HOURLY_CLASS_NAME_FIELDS
+
+from .common import measure, read_fixture
+
+DAILY_GETTERS = (
+    "get_daily_dates",
+    "get_max_temperatures",
+    "get_min_temperatures",
+    "get_precipitations",
+    "get_winds_speed",
+    "get_sunrise_hours",
+    "get_sunset_hours",
+)
+DETALLADA_GETTERS = (
+    "get_detallada_dates",
+    "get_precipitation_probabilities",
+    "get_cloud_percentages",
+    "get_ultraviolet_radiations",
+)
+PAGES = {
+    "dias": "cordoba_dias.html",
+    "detallada": "cordoba_detallada.html",
+    "por_hora": "cordoba_por_hora.html",
+}
+
+
+def run(number: int = 20, repeat: int = 5) -> dict:
+    texts = {name: read_fixture(file_name).decode("utf-8") for name, file_name in PAGES.items()}
+    soups = {
+        name: BeautifulSoup(texts[name], "html.parser") for name in ("dias", "detallada")
+    }
+    results = {}
+
+    for getter_name in DAILY_GETTERS:
+        getter = getattr(web_scraping, getter_name)
+        results[f"getter.{getter_name}"] = measure(
+            lambda: getter(soups["dias"]), number, repeat
+        )
+    for getter_name in DETALLADA_GETTERS:
+        getter = getattr(web_scraping, getter_name)
+        results[f"getter.{getter_name}"] = measure(
+            lambda: getter(soups["detallada"]), number, repeat
+        )
+
+    for page in ("dias", "detallada"):
+        results[f"extract_table.{page}"] = measure(
+            lambda: web_scraping.extract_table(soups[page]), number, repeat
+        )
+
+    for parser in ("html.parser", "lxml", "selectolax"):
+        if not is_parser_available(parser):
+            continue
+        for partial in (False, True):
+            name = f"parse_table.{parser}{'.partial' if partial else ''}.dias"
+            results[name] = measure(
+                lambda: parse_table(texts["dias"], parser, partial), number, repeat
+            )
+        results[f"parse_daily_prediction.{parser}"] = measure(
+            lambda: parse_daily_prediction(texts["dias"], parser), number, repeat
+        )
+        results[f"parse_detallada_prediction.{parser}"] = measure(
+            lambda: parse_detallada_prediction(texts["detallada"], parser), number, repeat
+        )
+
+    results["fast_extract.dias"] = measure(
+        lambda: extract_daily_prediction(texts["dias"]), number, repeat
+    )
+    results["fast_extract.detallada"] = measure(
+        lambda: extract_detallada_prediction(texts["detallada"]), number, repeat
+    )
+
+    results["stream.dias"] = measure(
+        lambda: list(iter_table_rows([texts["dias"]], max_rows=14)), number, repeat
+    )
+    results["stream.por_hora"] = measure(
+        lambda: list(
+            iter_table_rows([texts["por_hora"]], None, HOURLY_CLASS_NAME_FIELDS, {})
+        ),
+        number,
+        repeat,
+    )
+    return results
+
+
+def main(argv=None) -> dict:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--quick", action="store_true", help="Fewer repetitions")
+    parser.add_argument("--output", help="JSON file. Printed to stdout by default")
+    args = parser.parse_args(argv)
+
+    number, repeat = (3, 3) if args.quick else (20, 5)
+    report = {
+        "benchmark": "parsing",
+        "python": sys.version.split()[0],
+        "time": time.time(),
+        "results": run(number, repeat),
+    }
+    text = json.dumps(report, indent=2)
+    if args.output:
+        with open(args.output, "w") as output_file:
+            output_file.write(text)
+    else:
+        print(text)
+    return report
+
+
+if __name__ == "__main__":
+    main()
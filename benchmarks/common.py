@@ -0,0 +1,113 @@
+"""
+Helpers shared by the benchmarks: fixtures, timing and the local stand-in site
+"""
+
+import os
+import statistics
+import threading
+import timeit
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Callable, Dict, Tuple
+from urllib.parse import urlsplit
+
+from eltiempoes.constants import MAIN_URL
+from eltiempoes.utils.create_urls import create_prediction_url, create_search_url
+
+FIXTURES_DIR = os.path.join(os.path.dirname(os.path.dirname(__file__)), "tests", "fixtures")
+
+
+def read_fixture(file_name: str) -> bytes:
+    with open(os.path.join(FIXTURES_DIR, file_name), "rb") as fixture_file:
+        return fixture_file.read()
+
+
+def site_routes(station: str = "cordoba") -> Dict[str, Tuple[str, bytes]]:
+    """Urls of the site and the saved page answered for each one"""
+    pages = {
+        create_prediction_url(station, "dias"): ("text/html", "cordoba_dias.html"),
+        create_prediction_url(station, "long_detallada"): ("text/html", "cordoba_detallada.html"),
+        create_prediction_url(station, "por_hora"): ("text/html", "cordoba_por_hora.html"),
+        create_search_url(name=station): ("application/json", "search_cordoba.json"),
+    }
+    return {
+        url: (content_type, read_fixture(file_name))
+        for url, (content_type, file_name) in pages.items()
+    }
+
+
+def measure(function: Callable[[], object], number: int, repeat: int) -> Dict[str, float]:
+    """Time the function. The median of the repeats is the stable figure to compare"""
+    function()  # Warm up
+    timings = [
+        timing / number for timing in timeit.repeat(function, number=number, repeat=repeat)
+    ]
+    return {
+        "median_us": statistics.median(timings) * 1e6,
+        "min_us": min(timings) * 1e6,
+        "number": number,
+        "repeat": repeat,
+    }
+
+
+class LocalSite:
+    """Local HTTP server that answers the eltiempo.es urls with the saved pages.
+
+    Mount adapter() on a session and every request to the site goes to the
+    local server through a real pooled connection.
+    """
+
+    def __init__(self, stations=("cordoba",)):
+        routes = {}
+        for station in stations:
+            routes.update(site_routes(station))
+        self.routes = {self._path(url): page for url, page in routes.items()}
+        site = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+            disable_nagle_algorithm = True
+
+            def do_GET(self):
+                content_type, body = site.routes.get(self.path, ("text/plain", b"Not Found"))
+                self.send_response(200 if self.path in site.routes else 404)
+                self.send_header("Content-Type", f"{content_type}; charset=utf-8")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, *args):
+                pass
+
+        self.server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self.server.daemon_threads = True
+        self.thread = threading.Thread(target=self.server.serve_forever, daemon=True)
+
+    @staticmethod
+    def _path(url: str) -> str:
+        parts = urlsplit(url)
+        return parts.path + (f"?{parts.query}" if parts.query else "")
+
+    @property
+    def url(self) -> str:
+        host, port = self.server.server_address
+        return f"http://{host}:{port}/"
+
+    def adapter(self, **kwargs):
+        from requests.adapters import HTTPAdapter
+
+        local_url = self.url
+
+        class LocalSiteAdapter(HTTPAdapter):
+            def send(self, request, **send_kwargs):
+                request.url = request.url.replace(MAIN_URL, local_url, 1)
+                return super().send(request, **send_kwargs)
+
+        return LocalSiteAdapter(**kwargs)
+
+    def __enter__(self) -> "LocalSite":
+        self.thread.start()
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.server.shutdown()
+        self.server.server_close()
@@ -1 +1,52 @@
-from .main import ElTiempoEs
\ No newline at end of file
+"""
+The modules are imported on first use, so `import eltiempoes` does not load
+requests, bs4, unidecode, numpy or httpx.
+"""
+
+from importlib import import_module
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from .main import ElTiempoEs, StationResult
+    from .aio import AsyncElTiempoEs
+    from .cache import ForecastCache, HttpCache
+    from .catalog import StationCatalog
+    from .changes import ForecastChange, ForecastUpdate
+    from .columnar import ForecastRecord, ForecastTable
+    from .history import ForecastHistory
+    from .maps import MapStation
+    from .metrics import MetricEvent
+    from .refresher import ForecastRefresher, RefreshedForecast
+
+_LAZY_ATTRIBUTES = {
+    "ElTiempoEs": ".main",
+    "StationResult": ".main",
+    "AsyncElTiempoEs": ".aio",
+    "ForecastCache": ".cache",
+    "HttpCache": ".cache",
+    "StationCatalog": ".catalog",
+    "ForecastChange": ".changes",
+    "ForecastUpdate": ".changes",
+    "ForecastRecord": ".columnar",
+    "ForecastTable": ".columnar",
+    "ForecastHistory": ".history",
+    "MapStation": ".maps",
+    "MetricEvent": ".metrics",
+    "ForecastRefresher": ".refresher",
+    "RefreshedForecast": ".refresher",
+}
+
+__all__ = list(_LAZY_ATTRIBUTES)
+
+
+def __getattr__(name: str):
+    module_name = _LAZY_ATTRIBUTES.get(name)
+    if module_name is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(import_module(module_name, __name__), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(list(globals()) + __all__)
@@ -0,0 +1,192 @@
+"""
+Fetch the forecast of many stations and write one json line per station.
+
+    python -m eltiempoes stations.txt > forecasts.ndjson
+    cat stations.txt | python -m eltiempoes --catalog stations.json --workers 16
+
+Every input line is a station name (the urlize field of the search API) or, with
+--catalog, a station id of the search API. Empty lines and lines starting with #
+are skipped. The lines are read as the stations are fetched and every result is
+written as soon as it is ready, so the memory used does not grow with the input.
+"""
+
+import argparse
+import json
+import os
+import sys
+from typing import IO, Iterable, Iterator, List, Optional
+
+from .catalog import StationCatalog
+from .constants import DEFAULT_POOL_MAXSIZE
+from .main import ElTiempoEs
+
+
+def _write_line(output: IO[str], record: dict) -> None:
+    output.write(json.dumps(record, ensure_ascii=False) + "\n")
+    output.flush()
+
+
+def _error_message(error: Exception) -> str:
+    return str(error) or type(error).__name__
+
+
+def _resolve(line: str, catalog: Optional[StationCatalog]) -> str:
+    """Station name of an input line
+
+    Raises:
+        LookupError: The line is a station id that can not be resolved
+    """
+    if not line.isdigit():
+        return line
+    if catalog is None:
+        raise LookupError("Station ids need a catalog (--catalog).")
+    station = catalog.get(line)
+    if station is None:
+        raise LookupError(f"Station id {line} is not in the catalog.")
+    return str(station["urlize"])
+
+
+def _positive_int(value: str) -> int:
+    number = int(value)
+    if number < 1:
+        raise argparse.ArgumentTypeError(f"{value} is not greater than 0.")
+    return number
+
+
+def run(
+    client: ElTiempoEs,
+    lines: Iterable[str],
+    output: IO[str],
+    catalog: Optional[StationCatalog] = None,
+    max_workers: Optional[int] = None,
+    max_pending: Optional[int] = None,
+    parser_processes: Optional[int] = None,
+) -> int:
+    """Write one json line per input line, in the order the stations complete
+
+    Args:
+        client (ElTiempoEs): Client used for the fetches
+        lines (Iterable[str]): Station names or ids. It is consumed lazily.
+        output (IO[str]): Where the lines are written. It is flushed after every line.
+        catalog (Optional[StationCatalog], optional): Catalog used to resolve the ids
+        max_workers (Optional[int], optional): Stations fetched at once
+        max_pending (Optional[int], optional): Stations read but not written yet
+        parser_processes (Optional[int], optional): See ElTiempoEs.get_many
+
+    Returns:
+        int: Number of stations that failed
+    """
+    failed = 0
+
+    def station_names() -> Iterator[str]:
+        # Ids that can not be resolved are written as errors right away
+        nonlocal failed
+        for line in lines:
+            line = line.strip()
+            if not line or line.startswith("#"):
+                continue
+            try:
+                station_name = _resolve(line, catalog)
+            except LookupError as error:
+                failed += 1
+                _write_line(output, {"station": line, "ok": False, "error": str(error)})
+                continue
+            yield station_name
+
+    for result in client.get_many(
+        station_names(),
+        max_workers=max_workers,
+        max_pending=max_pending,
+        parser_processes=parser_processes,
+    ):
+        if result.ok:
+            record = {"station": result.station_name, "ok": True, "data": result.data}
+        else:
+            failed += 1
+            record = {
+                "station": result.station_name,
+                "ok": False,
+                "error": _error_message(result.error),
+            }
+        _write_line(output, record)
+    return failed
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    argument_parser = argparse.ArgumentParser(
+        prog="python -m eltiempoes",
+        description="Write the 14 days forecast of every input station as NDJSON.",
+    )
+    argument_parser.add_argument(
+        "input",
+        nargs="?",
+        default="-",
+        help="File with one station name or id per line. Defaults to stdin.",
+    )
+    argument_parser.add_argument(
+        "--catalog", help="Station catalog (StationCatalog.save) to resolve the ids."
+    )
+    argument_parser.add_argument(
+        "--workers", type=_positive_int, default=None, help="Stations fetched at once."
+    )
+    argument_parser.add_argument(
+        "--max-pending",
+        type=_positive_int,
+        default=None,
+        help="Stations read but not written yet. Defaults to twice --workers.",
+    )
+    argument_parser.add_argument(
+        "--rate-limit",
+        type=float,
+        default=None,
+        help="Maximum requests per second to eltiempo.es.",
+    )
+    argument_parser.add_argument(
+        "--parser-processes",
+        type=_positive_int,
+        default=None,
+        help="Parse the pages in this many processes.",
+    )
+    argument_parser.add_argument(
+        "--fast",
+        action="store_true",
+        help="Read the pages with the regex fast path (see fast_extraction).",
+    )
+    arguments = argument_parser.parse_args(argv)
+
+    catalog = StationCatalog.load(arguments.catalog) if arguments.catalog else None
+    input_file = (
+        sys.stdin
+        if arguments.input == "-"
+        else open(arguments.input, encoding="utf-8")
+    )
+    client = ElTiempoEs(
+        pool_maxsize=arguments.workers or DEFAULT_POOL_MAXSIZE,
+        rate_limit=arguments.rate_limit,
+        fast_extraction=arguments.fast,
+    )
+    try:
+        failed = run(
+            client,
+            input_file,
+            sys.stdout,
+            catalog=catalog,
+            max_workers=arguments.workers,
+            max_pending=arguments.max_pending,
+            parser_processes=arguments.parser_processes,
+        )
+    except BrokenPipeError:
+        # The reader of stdout stopped, for example "| head". Point stdout to
+        # devnull so the flush at exit does not raise again
+        devnull = os.open(os.devnull, os.O_WRONLY)
+        os.dup2(devnull, sys.stdout.fileno())
+        return 0
+    finally:
+        client.close()
+        if input_file is not sys.stdin:
+            input_file.close()
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
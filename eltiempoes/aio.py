@@ -0,0 +1,294 @@
+import asyncio
+import json
+import time
+from typing import TYPE_CHECKING, Dict, List, Optional, Tuple, Union
+
+from .constants import (
+    DEFAULT_POOL_CONNECTIONS,
+    DEFAULT_POOL_MAXSIZE,
+    DEFAULT_TIMEOUT,
+    DEFAULT_MAX_RETRIES,
+    DEFAULT_DETALLADA_RETRIES,
+    DEFAULT_DETALLADA_BACKOFF,
+    DEFAULT_DETALLADA_WARMUP_TTL,
+)
+from .parsers import resolve_parser
+from .utils.create_urls import (
+    create_current_conditions_url,
+    create_prediction_url,
+    create_search_url,
+    get_pelmorex_id,
+)
+from .predictions import (
+    DailyPrediction,
+    DetalladaPrediction,
+    normalize_station_name,
+    parse_daily_prediction,
+    parse_detallada_prediction,
+    daily_prediction_to_json,
+    detallada_prediction_to_json,
+    all_data_to_json,
+)
+
+if TYPE_CHECKING:
+    import httpx
+
+
+class AsyncElTiempoEs:
+    def __init__(
+        self,
+        pool_connections: int = DEFAULT_POOL_CONNECTIONS,
+        pool_maxsize: int = DEFAULT_POOL_MAXSIZE,
+        timeout: Union[float, Tuple[float, float]] = DEFAULT_TIMEOUT,
+        max_retries: int = DEFAULT_MAX_RETRIES,
+        keep_alive: bool = True,
+        client: Optional["httpx.AsyncClient"] = None,
+        parser: str = "auto",
+        partial_parsing: bool = True,
+        detallada_retries: int = DEFAULT_DETALLADA_RETRIES,
+        detallada_backoff: float = DEFAULT_DETALLADA_BACKOFF,
+        detallada_warmup_ttl: float = DEFAULT_DETALLADA_WARMUP_TTL,
+        fast_extraction: bool = False,
+    ):
+        """Asyncio client for eltiempo.es. Same surface as ElTiempoEs, but every
+        method is a coroutine and the calls share one httpx.AsyncClient.
+
+        Args:
+            pool_connections (int, optional): Connections kept alive in the pool.
+            pool_maxsize (int, optional): Maximum concurrent connections.
+            timeout (Union[float, Tuple[float, float]], optional): Seconds to wait
+                for the server, or a (connect, read) tuple.
+            max_retries (int, optional): Retries on connection errors.
+            keep_alive (bool, optional): Keep the connections open between requests.
+            client (Optional[httpx.AsyncClient], optional): Use this client instead of
+                creating one. The pool options are ignored when it is given.
+            parser (str, optional): HTML parser backend: "selectolax", "lxml",
+                "html.parser" or "auto" for the fastest one installed.
+            partial_parsing (bool, optional): Build only the forecast table rows
+                of the pages instead of the whole document.
+            detallada_retries (int, optional): Times the long detallada page is asked
+                again after a 404, visiting the short page before every retry.
+            detallada_backoff (float, optional): Seconds to wait before the second
+                retry, doubled on every following one.
+            detallada_warmup_ttl (float, optional): Seconds a station that needed the
+                short page keeps visiting it first. Then the long page is tried
+                directly again.
+            fast_extraction (bool, optional): Read the daily and detallada pages with
+                precompiled patterns instead of a parser (see ElTiempoEs).
+
+        Raises:
+            ImportError: httpx is not installed
+        """
+        try:
+            import httpx
+        except ImportError:
+            raise ImportError(
+                "AsyncElTiempoEs needs httpx. Install it with: pip install python-eltiempoes[async]"
+            ) from None
+        if client is None:
+            if isinstance(timeout, tuple):
+                connect_timeout, read_timeout = timeout
+                httpx_timeout = httpx.Timeout(read_timeout, connect=connect_timeout)
+            else:
+                httpx_timeout = httpx.Timeout(timeout)
+            limits = httpx.Limits(
+                max_connections=pool_maxsize,
+                max_keepalive_connections=pool_connections if keep_alive else 0,
+            )
+            client = httpx.AsyncClient(
+                timeout=httpx_timeout,
+                transport=httpx.AsyncHTTPTransport(limits=limits, retries=max_retries),
+            )
+        self.client = client
+        self.parser = resolve_parser(parser)
+        self.partial_parsing = partial_parsing
+        self.fast_extraction = fast_extraction
+        self.detallada_retries = detallada_retries
+        self.detallada_backoff = detallada_backoff
+        self.detallada_warmup_ttl = detallada_warmup_ttl
+        # Stations whose long detallada page needs a visit to the short one first,
+        # until the monotonic time of the value. Then the long page is tried directly
+        self._detallada_warmup_stations: Dict[str, float] = {}
+
+    async def __aenter__(self) -> "AsyncElTiempoEs":
+        return self
+
+    async def __aexit__(self, *exc_info) -> None:
+        await self.close()
+
+    async def close(self) -> None:
+        """Close the pooled connections"""
+        await self.client.aclose()
+
+    async def _get(self, url: str) -> "httpx.Response":
+        return await self.client.get(url)
+
+    async def search_location(
+        self, location_name: str, limit: int = 100
+    ) -> List[Dict[str, Union[str, int, float]]]:
+        """Search for all stations of the given name
+
+        Args:
+            location_name (str): Any name of a location. For example: "Córdoba"
+            limit (int, optional): Maximum number of results returned. Defaults to 100.
+
+        Returns:
+            List[Dict[str, Union[str, int, float]]]: Results with stations data
+        """
+        search_url = create_search_url(name=location_name, lim=limit)
+        response_data = await self._get(search_url)
+        return json.loads(response_data.text)
+
+    async def get_current_conditions(
+        self, station: Union[str, Dict[str, object]]
+    ) -> Dict[str, object]:
+        """Gets the weather now from the current conditions API
+
+        Args:
+            station (Union[str, Dict[str, object]]): pelmorex_id of the station, like
+                "ESXX0007", or a station returned by search_location
+
+        Raises:
+            Exception: The API did not answer 200
+
+        Returns:
+            Dict[str, object]: Same as ElTiempoEs.get_current_conditions
+        """
+        pelmorex_id = get_pelmorex_id(station)
+        response_data = await self._get(create_current_conditions_url(pelmorex_id))
+        if response_data.status_code != 200:
+            raise Exception(
+                f"The current conditions of '{pelmorex_id}' are not available"
+                f" (status {response_data.status_code})."
+            )
+        return json.loads(response_data.text)
+
+    async def _get_daily_prediction(self, station_name: str) -> DailyPrediction:
+        """Gets the daily forecast over a 14-day period.
+
+        Args:
+            station_name (str): Station name (must be the same as the urlize fiel in the station json data)
+
+        Returns:
+            DailyPrediction: Same tuple as ElTiempoEs._get_daily_prediction
+        """
+        station_name_lowercase = normalize_station_name(station_name)
+
+        daily_url = create_prediction_url(
+            station=station_name_lowercase, prediction_type="dias"
+        )
+        response_data = await self._get(daily_url)
+        return parse_daily_prediction(
+            response_data.text,
+            self.parser,
+            self.partial_parsing,
+            fast_path=self.fast_extraction,
+        )
+
+    async def _get_daily_prediction_json(
+        self, station_name: str
+    ) -> List[Dict[str, object]]:
+        """Gets the daily forecast over a 14-day period in json format.
+
+        Args:
+            station_name (str): Station name (must be the same as the urlize fiel in the station json data)
+
+        Returns:
+            List[Dict[str, object]]: Same items as ElTiempoEs._get_daily_prediction_json
+        """
+        daily_prediction = await self._get_daily_prediction(station_name=station_name)
+        return daily_prediction_to_json(daily_prediction)
+
+    def _needs_detallada_warmup(self, station: str) -> bool:
+        expires_at = self._detallada_warmup_stations.get(station)
+        if expires_at is None:
+            return False
+        if expires_at <= time.monotonic():
+            # Added back if the long page still answers 404
+            self._detallada_warmup_stations.pop(station, None)
+            return False
+        return True
+
+    async def _get_long_detallada(self, station: str) -> "httpx.Response":
+        """Long detallada page of the station (see ElTiempoEs._get_long_detallada)"""
+        long_detallada_url = create_prediction_url(
+            station=station, prediction_type="long_detallada"
+        )
+        detallada_url = create_prediction_url(
+            station=station, prediction_type="detallada"
+        )
+        short_response_data = None
+        if self._needs_detallada_warmup(station):
+            short_response_data = await self._get(detallada_url)
+        response_data = await self._get(long_detallada_url)
+
+        attempt = 0
+        while response_data.status_code == 404 and attempt < self.detallada_retries:
+            self._detallada_warmup_stations[station] = (
+                time.monotonic() + self.detallada_warmup_ttl
+            )
+            if attempt > 0:
+                await asyncio.sleep(self.detallada_backoff * 2 ** (attempt - 1))
+            attempt += 1
+            short_response_data = await self._get(detallada_url)
+            if short_response_data.status_code == 404:
+                # The station does not exist
+                break
+            response_data = await self._get(long_detallada_url)
+
+        if response_data.status_code == 404 and short_response_data is not None:
+            return short_response_data
+        return response_data
+
+    async def _get_detallada_prediction(
+        self, station_name: str
+    ) -> DetalladaPrediction:
+        """Gets the detallada daily forecast over a 14-day period.
+
+        Args:
+            station_name (str): Station name (must be the same as the urlize fiel in the station json data)
+
+        Returns:
+            DetalladaPrediction: Same tuple as ElTiempoEs._get_detallada_prediction
+        """
+        station_name_lowercase = normalize_station_name(station_name)
+
+        response_data = await self._get_long_detallada(station_name_lowercase)
+        return parse_detallada_prediction(
+            response_data.text,
+            self.parser,
+            self.partial_parsing,
+            fast_path=self.fast_extraction,
+        )
+
+    async def _get_detallada_prediction_json(
+        self, station_name: str
+    ) -> List[Dict[str, object]]:
+        """Gets the detallada daily forecast over a 14-day period in json format.
+
+        Args:
+            station_name (str): Station name (must be the same as the urlize fiel in the station json data)
+
+        Returns:
+            List[Dict[str, object]]: Same items as ElTiempoEs._get_detallada_prediction_json
+        """
+        detallada_prediction = await self._get_detallada_prediction(
+            station_name=station_name
+        )
+        return detallada_prediction_to_json(detallada_prediction)
+
+    async def get_all_data_in_json(self, station_name: str) -> List[Dict[str, object]]:
+        """Gets all daily forecast data over a 14-day period in json format.
+        The "dias" and the "long_detallada" pages are fetched concurrently.
+
+        Args:
+            station_name (str): Station name (must be the same as the urlize fiel in the station json data)
+
+        Returns:
+            List[Dict[str, object]]: Same items as ElTiempoEs.get_all_data_in_json
+        """
+        detallada_prediction, daily_prediction = await asyncio.gather(
+            self._get_detallada_prediction(station_name=station_name),
+            self._get_daily_prediction(station_name=station_name),
+        )
+        return all_data_to_json(daily_prediction, detallada_prediction)
@@ -0,0 +1,206 @@
+import threading
+import time
+from collections import OrderedDict
+from typing import TYPE_CHECKING, Dict, Hashable, NamedTuple, Optional, Tuple, Union
+
+from .constants import (
+    DEFAULT_CACHE_TTL,
+    DEFAULT_FORECAST_CACHE_SIZE,
+    DEFAULT_FORECAST_CACHE_TTL,
+)
+from .predictions import normalize_station_name
+from .utils.create_urls import get_url_endpoint
+
+if TYPE_CHECKING:
+    from requests import Response
+
+
+class CachedResponse(NamedTuple):
+    url: str
+    status_code: int
+    body: bytes
+    encoding: Optional[str]
+    etag: Optional[str]
+    last_modified: Optional[str]
+    stored_at: float
+
+    def to_response(self) -> "Response":
+        """Rebuild a requests Response, so the callers do not notice the cache"""
+        from requests import Response
+        from requests.structures import CaseInsensitiveDict
+
+        response = Response()
+        response.url = self.url
+        response.status_code = self.status_code
+        response._content = self.body
+        response._content_consumed = True
+        response.encoding = self.encoding
+        response.headers = CaseInsensitiveDict()
+        if self.etag:
+            response.headers["ETag"] = self.etag
+        if self.last_modified:
+            response.headers["Last-Modified"] = self.last_modified
+        return response
+
+
+class HttpCache:
+    """Disk cache of the eltiempo.es responses, stored in sqlite.
+
+    The file can be shared by several processes and survives restarts. Every
+    entry is fresh during the TTL of its endpoint. After that it is revalidated
+    with ETag / Last-Modified, so an unchanged page is not downloaded again.
+
+    Args:
+        path (str): sqlite file. ":memory:" keeps the cache in this process only.
+        ttl (Union[float, Dict[str, float], None], optional): Seconds an entry is fresh,
+            for all the endpoints or per endpoint ("search", "current_conditions",
+            "maps", "dias", "detallada", "por_hora"). Missing endpoints use DEFAULT_CACHE_TTL.
+    """
+
+    def __init__(self, path: str, ttl: Union[float, Dict[str, float], None] = None):
+        self.path = path
+        if isinstance(ttl, (int, float)):
+            self.ttl = {endpoint: float(ttl) for endpoint in DEFAULT_CACHE_TTL}
+        else:
+            self.ttl = {**DEFAULT_CACHE_TTL, **(ttl or {})}
+        self._lock = threading.Lock()
+        import sqlite3
+
+        self._connection = sqlite3.connect(path, timeout=30, check_same_thread=False)
+        with self._lock, self._connection:
+            if path != ":memory:":
+                self._connection.execute("PRAGMA journal_mode=WAL")
+            self._connection.execute(
+                """
+                CREATE TABLE IF NOT EXISTS responses (
+                    url TEXT PRIMARY KEY,
+                    status_code INTEGER NOT NULL,
+                    body BLOB NOT NULL,
+                    encoding TEXT,
+                    etag TEXT,
+                    last_modified TEXT,
+                    stored_at REAL NOT NULL
+                )
+                """
+            )
+
+    def get(self, url: str) -> Optional[CachedResponse]:
+        with self._lock:
+            row = self._connection.execute(
+                "SELECT url, status_code, body, encoding, etag, last_modified, stored_at"
+                " FROM responses WHERE url = ?",
+                (url,),
+            ).fetchone()
+        if row is None:
+            return None
+        return CachedResponse(*row)
+
+    def is_fresh(self, entry: CachedResponse) -> bool:
+        ttl = self.ttl.get(get_url_endpoint(entry.url), 0)
+        return time.time() - entry.stored_at < ttl
+
+    def set(self, url: str, response: "Response") -> None:
+        """Store a response. Its body is read if it was streamed"""
+        with self._lock, self._connection:
+            self._connection.execute(
+                "INSERT OR REPLACE INTO responses VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (
+                    url,
+                    response.status_code,
+                    response.content,
+                    response.encoding,
+                    response.headers.get("ETag"),
+                    response.headers.get("Last-Modified"),
+                    time.time(),
+                ),
+            )
+
+    def touch(self, url: str) -> None:
+        """The server said that the entry did not change: make it fresh again"""
+        with self._lock, self._connection:
+            self._connection.execute(
+                "UPDATE responses SET stored_at = ? WHERE url = ?", (time.time(), url)
+            )
+
+    def delete(self, url: str) -> None:
+        with self._lock, self._connection:
+            self._connection.execute("DELETE FROM responses WHERE url = ?", (url,))
+
+    def clear(self) -> None:
+        with self._lock, self._connection:
+            self._connection.execute("DELETE FROM responses")
+
+    def close(self) -> None:
+        with self._lock:
+            self._connection.close()
+
+
+class ForecastCache:
+    """In-process LRU cache with TTL of the parsed forecasts. Thread safe.
+
+    The keys are (prediction_type, station) with the station normalized, so
+    "Córdoba" and "cordoba" share their entries.
+
+    Args:
+        maxsize (int, optional): Maximum number of entries. The least recently
+            used one is dropped when it is full.
+        ttl (float, optional): Seconds an entry is used after it was stored.
+    """
+
+    def __init__(
+        self,
+        maxsize: int = DEFAULT_FORECAST_CACHE_SIZE,
+        ttl: float = DEFAULT_FORECAST_CACHE_TTL,
+    ):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+        self._entries: "OrderedDict[Tuple[str, str], Tuple[float, object]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def key(prediction_type: str, station_name: str) -> Tuple[str, str]:
+        return prediction_type, normalize_station_name(station_name)
+
+    def get(self, key: Hashable) -> Optional[object]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and time.monotonic() - entry[0] < self.ttl:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return entry[1]
+            if entry is not None:
+                del self._entries[key]
+            self.misses += 1
+            return None
+
+    def set(self, key: Hashable, value: object) -> None:
+        with self._lock:
+            self._entries[key] = (time.monotonic(), value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+
+    def invalidate(self, station_name: Optional[str] = None) -> None:
+        """Drop the entries of a station, or all the entries
+
+        Args:
+            station_name (Optional[str], optional): Station name. Defaults to all.
+        """
+        with self._lock:
+            if station_name is None:
+                self._entries.clear()
+                return
+            station = normalize_station_name(station_name)
+            for key in [key for key in self._entries if key[1] == station]:
+                del self._entries[key]
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "size": len(self._entries),
+                "maxsize": self.maxsize,
+            }
@@ -0,0 +1,218 @@
+import heapq
+import json
+import string
+from itertools import product
+from typing import Dict, Iterable, Iterator, List, Optional, Set
+
+from .utils.batch import run_concurrently
+
+Station = Dict[str, object]
+
+# Every query of two letters: "aa", "ab" ... "zz"
+DEFAULT_CATALOG_QUERIES = tuple(
+    "".join(letters) for letters in product(string.ascii_lowercase, repeat=2)
+)
+FUZZY_MIN_RATIO = 0.6
+# Names with most trigrams in common with the query compared with SequenceMatcher
+FUZZY_CANDIDATES = 50
+
+
+def fold_name(name: str) -> str:
+    """Name without accents, in lowercase and with single spaces
+
+    Args:
+        name (str): Any name. For example: "Córdoba  "
+
+    Returns:
+        str: Folded name. For example: "cordoba"
+    """
+    from unidecode import unidecode
+
+    return " ".join(unidecode(name).lower().split())
+
+
+def _trigrams(text: str) -> Set[str]:
+    padded = f"  {text} "
+    return {padded[index : index + 3] for index in range(len(padded) - 2)}
+
+
+class _TrieNode:
+    __slots__ = ("children", "stations")
+
+    def __init__(self):
+        self.children: Dict[str, "_TrieNode"] = {}
+        self.stations: Set[int] = set()
+
+
+class StationCatalog:
+    """Local catalog of the stations returned by the search API.
+
+    Lookups do not need the network: the names are folded with unidecode and
+    indexed in a prefix trie (every word of a name is a prefix too) and in a
+    trigram index for fuzzy matching.
+
+    Args:
+        stations (Iterable[Station], optional): Station items of the search API.
+    """
+
+    def __init__(self, stations: Iterable[Station] = ()):
+        self.stations: List[Station] = []
+        self._folded_names: List[str] = []
+        self._positions: Dict[str, int] = {}
+        self._trie = _TrieNode()
+        self._trigrams: Dict[str, Set[int]] = {}
+        self.add(stations)
+
+    def __len__(self) -> int:
+        return len(self._positions)
+
+    def __iter__(self) -> Iterator[Station]:
+        return (self.stations[position] for position in self._positions.values())
+
+    def get(self, station_id: object) -> Optional[Station]:
+        """Station with the id of the search API, or None"""
+        position = self._positions.get(str(station_id))
+        return None if position is None else self.stations[position]
+
+    def add(self, stations: Iterable[Station]) -> None:
+        """Add or replace stations. A station is identified by its id"""
+        for station in stations:
+            station_id = str(station["id"])
+            if station_id in self._positions:
+                position = self._positions[station_id]
+                if fold_name(str(station["name"])) == self._folded_names[position]:
+                    self.stations[position] = station
+                    continue
+                # Renamed: the old name stays in the index but points to the new one
+            position = len(self.stations)
+            self._positions[station_id] = position
+            self.stations.append(station)
+            self._index(position, fold_name(str(station["name"])))
+
+    def _index(self, position: int, folded_name: str) -> None:
+        self._folded_names.append(folded_name)
+        words = folded_name.split(" ")
+        for index in range(len(words)):
+            node = self._trie
+            for character in " ".join(words[index:]):
+                node = node.children.setdefault(character, _TrieNode())
+                node.stations.add(position)
+        for trigram in _trigrams(folded_name):
+            self._trigrams.setdefault(trigram, set()).add(position)
+
+    def _is_current(self, position: int) -> bool:
+        return self._positions.get(str(self.stations[position]["id"])) == position
+
+    def _prefix_matches(self, folded_query: str) -> Set[int]:
+        node = self._trie
+        for character in folded_query:
+            node = node.children.get(character)
+            if node is None:
+                return set()
+        return node.stations
+
+    def _fuzzy_matches(self, folded_query: str) -> List[int]:
+        from difflib import SequenceMatcher
+
+        shared_trigrams: Dict[int, int] = {}
+        for trigram in _trigrams(folded_query):
+            for position in self._trigrams.get(trigram, ()):
+                shared_trigrams[position] = shared_trigrams.get(position, 0) + 1
+        candidates = heapq.nlargest(
+            FUZZY_CANDIDATES, shared_trigrams, key=shared_trigrams.__getitem__
+        )
+        ratios = []
+        for position in candidates:
+            ratio = SequenceMatcher(None, folded_query, self._folded_names[position]).ratio()
+            if ratio >= FUZZY_MIN_RATIO:
+                ratios.append((-ratio, self._folded_names[position], position))
+        return [position for _, _, position in sorted(ratios)]
+
+    def search(
+        self, location_name: str, limit: int = 100, fuzzy: bool = True
+    ) -> List[Station]:
+        """Search the stations without network access. Same output as
+        ElTiempoEs.search_location: stations whose name (or a word of it) starts
+        with the name, or the most similar names when nothing starts with it.
+
+        Args:
+            location_name (str): Any name of a location. For example: "Córdoba"
+            limit (int, optional): Maximum number of results returned. Defaults to 100.
+            fuzzy (bool, optional): Return the most similar names when nothing starts
+                with the name. Defaults to True.
+
+        Returns:
+            List[Station]: Results with stations data
+        """
+        folded_query = fold_name(location_name)
+        if not folded_query:
+            return []
+        positions = self._prefix_matches(folded_query)
+        if positions:
+            # Exact names first, then the shortest ones
+            ordered = sorted(
+                positions,
+                key=lambda position: (
+                    self._folded_names[position] != folded_query,
+                    len(self._folded_names[position]),
+                    self._folded_names[position],
+                ),
+            )
+        elif fuzzy:
+            ordered = self._fuzzy_matches(folded_query)
+        else:
+            return []
+        return [
+            self.stations[position] for position in ordered if self._is_current(position)
+        ][:limit]
+
+    def refresh(
+        self,
+        client,
+        queries: Iterable[str] = DEFAULT_CATALOG_QUERIES,
+        limit: int = 100,
+        max_workers: Optional[int] = None,
+    ) -> None:
+        """Add the stations returned by the search API for every query
+
+        Args:
+            client (ElTiempoEs): Client used to call the search API
+            queries (Iterable[str], optional): Search queries. Defaults to every
+                two letters query.
+            limit (int, optional): Maximum results per query. Defaults to 100.
+            max_workers (Optional[int], optional): Queries sent at once.
+                Defaults to the pool_maxsize of the client.
+
+        Raises:
+            Exception: The first error of the search API, after every query ran
+        """
+        first_error = None
+        for _, stations, error in run_concurrently(
+            lambda query: client.search_location(query, limit=limit),
+            queries,
+            max_workers=max_workers or client.pool_maxsize,
+        ):
+            if error is not None:
+                first_error = first_error or error
+                continue
+            self.add(stations)
+        if first_error is not None:
+            raise first_error
+
+    @classmethod
+    def build(
+        cls, client, queries: Iterable[str] = DEFAULT_CATALOG_QUERIES, limit: int = 100
+    ) -> "StationCatalog":
+        """New catalog filled from the search API (see refresh)"""
+        catalog = cls()
+        catalog.refresh(client, queries=queries, limit=limit)
+        return catalog
+
+    def save(self, path: str) -> None:
+        with open(path, "w", encoding="utf-8") as catalog_file:
+            json.dump(list(self), catalog_file, ensure_ascii=False)
+
+    @classmethod
+    def load(cls, path: str) -> "StationCatalog":
+        with open(path, encoding="utf-8") as catalog_file:
+            return cls(json.load(catalog_file))
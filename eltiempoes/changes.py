@@ -0,0 +1,63 @@
+from typing import Dict, List, NamedTuple, Optional, Tuple
+
+
+class ForecastChange(NamedTuple):
+    """A field of one day whose value moved between two fetches. old is None for a
+    day that entered the forecast and new is None for a day that left it"""
+
+    date: Tuple[int, str]
+    field: str
+    old: Optional[object]
+    new: Optional[object]
+
+
+class ForecastUpdate(NamedTuple):
+    """Result of ElTiempoEs.refresh_forecast"""
+
+    station_name: str
+    changed: bool
+    forecast: List[Dict[str, object]]
+    changes: List[ForecastChange]
+
+    @property
+    def changed_dates(self) -> List[Tuple[int, str]]:
+        """Days with at least one change, in the forecast order"""
+        return list(dict.fromkeys(change.date for change in self.changes))
+
+
+def diff_forecasts(
+    previous: List[Dict[str, object]], forecast: List[Dict[str, object]]
+) -> List[ForecastChange]:
+    """Compare two outputs of get_all_data_in_json day by day and field by field.
+    The days are matched by date, so the window moving one day is seen as a day
+    leaving and another one entering the forecast.
+
+    Args:
+        previous (List[Dict[str, object]]): Forecast of the previous fetch
+        forecast (List[Dict[str, object]]): Forecast of the last fetch
+
+    Returns:
+        List[ForecastChange]: Days that left first, then the changes of the days of
+            forecast in its order
+    """
+    previous_by_date = {tuple(item["date"]): item for item in previous}
+    dates = {tuple(item["date"]) for item in forecast}
+
+    changes = []
+    for day, item in previous_by_date.items():
+        if day not in dates:
+            changes.extend(
+                ForecastChange(day, field, value, None)
+                for field, value in item.items()
+                if field != "date"
+            )
+    for item in forecast:
+        day = tuple(item["date"])
+        previous_item = previous_by_date.get(day, {})
+        for field, value in item.items():
+            if field == "date":
+                continue
+            old = previous_item.get(field)
+            if day not in previous_by_date or old != value:
+                changes.append(ForecastChange(day, field, old, value))
+    return changes
@@ -0,0 +1,214 @@
+import math
+from datetime import date
+from typing import TYPE_CHECKING, Dict, Iterator, List, Optional, Sequence
+
+from .predictions import DailyPrediction, DetalladaPrediction
+from .utils.dates import resolve_forecast_date
+
+if TYPE_CHECKING:
+    import numpy as np
+
+# One row per station and day
+FORECAST_DTYPE = [
+    ("station_index", "i4"),
+    ("date", "datetime64[D]"),
+    ("max_temperature", "i2"),
+    ("min_temperature", "i2"),
+    ("precipitation", "f4"),
+    ("wind_speed", "i2"),
+    ("sunrise", "U5"),
+    ("sunset", "U5"),
+    ("precipitation_probability", "f4"),
+    ("cloud_percentage", "f4"),
+    ("ultraviolet_radiation", "U12"),
+]
+FORECAST_FIELDS = tuple(name for name, _ in FORECAST_DTYPE if name != "station_index")
+
+
+def _numpy():
+    try:
+        import numpy
+    except ImportError:
+        raise ImportError(
+            "ForecastTable needs numpy. Install it with: pip install python-eltiempoes[columnar]"
+        ) from None
+    return numpy
+
+
+class ForecastRecord:
+    """One day of a ForecastTable"""
+
+    __slots__ = ("station",) + FORECAST_FIELDS
+
+    def __init__(self, station: str, **fields):
+        self.station = station
+        for name in FORECAST_FIELDS:
+            setattr(self, name, fields[name])
+
+    def __repr__(self) -> str:
+        return f"ForecastRecord(station={self.station!r}, date={self.date!r})"
+
+    def _key(self) -> tuple:
+        # NaN is the missing detallada value, so two NaN are the same value here
+        return tuple(
+            None if isinstance(value, float) and math.isnan(value) else value
+            for value in (getattr(self, name) for name in self.__slots__)
+        )
+
+    def __eq__(self, other: object) -> bool:
+        if not isinstance(other, ForecastRecord):
+            return NotImplemented
+        return self._key() == other._key()
+
+    def __hash__(self) -> int:
+        return hash(self._key())
+
+
+class ForecastTable:
+    """Columnar forecast of one or many stations, backed by a NumPy structured array.
+
+    Every column is a typed array (see FORECAST_DTYPE). The station names are
+    stored once and every row points to its name with station_index. The
+    detallada fields are NaN / "" when the detallada page had fewer days.
+
+    Args:
+        data (np.ndarray): Structured array with FORECAST_DTYPE
+        stations (Sequence[str]): Station names, indexed by the station_index column
+    """
+
+    def __init__(self, data: "np.ndarray", stations: Sequence[str]):
+        self.data = data
+        self.stations = list(stations)
+
+    @classmethod
+    def from_predictions(
+        cls,
+        station_name: str,
+        daily_prediction: DailyPrediction,
+        detallada_prediction: DetalladaPrediction,
+        reference_date: Optional[date] = None,
+    ) -> "ForecastTable":
+        """Table of one station built straight from the parsed pages
+
+        Args:
+            station_name (str): Station name
+            daily_prediction (DailyPrediction): Parsed daily page
+            detallada_prediction (DetalladaPrediction): Parsed detallada page
+            reference_date (Optional[date], optional): Date the forecast was
+                fetched, used to get the year of the dates. Defaults to today.
+
+        Returns:
+            ForecastTable: One row per day
+        """
+        np = _numpy()
+        (
+            dates,
+            max_temperature,
+            min_temperature,
+            precipitation,
+            wind_speed,
+            sunrise,
+            sunset,
+        ) = daily_prediction
+        (
+            _,
+            precipitation_probability,
+            cloud_percentage,
+            ultraviolet_radiation,
+        ) = detallada_prediction
+        num_days = len(dates)
+        num_detallada_days = min(num_days, len(precipitation_probability))
+        reference_date = reference_date or date.today()
+
+        data = np.zeros(num_days, dtype=FORECAST_DTYPE)
+        data["date"] = [resolve_forecast_date(day, month, reference_date) for day, month in dates]
+        data["max_temperature"] = max_temperature
+        data["min_temperature"] = min_temperature
+        data["precipitation"] = precipitation
+        data["wind_speed"] = wind_speed
+        data["sunrise"] = sunrise
+        data["sunset"] = sunset
+        data["precipitation_probability"] = np.nan
+        data["cloud_percentage"] = np.nan
+        data["precipitation_probability"][:num_detallada_days] = precipitation_probability[:num_detallada_days]
+        data["cloud_percentage"][:num_detallada_days] = cloud_percentage[:num_detallada_days]
+        data["ultraviolet_radiation"][:num_detallada_days] = ultraviolet_radiation[:num_detallada_days]
+        return cls(data, [station_name])
+
+    @classmethod
+    def concat(cls, tables: Sequence["ForecastTable"]) -> "ForecastTable":
+        """Join the tables of many stations in one table
+
+        Args:
+            tables (Sequence[ForecastTable]): Tables to join
+
+        Returns:
+            ForecastTable: All the rows, in the same order
+        """
+        np = _numpy()
+        stations: List[str] = []
+        positions: Dict[str, int] = {}
+        arrays = []
+        for table in tables:
+            remap = np.empty(len(table.stations), dtype="i4")
+            for index, station in enumerate(table.stations):
+                if station not in positions:
+                    positions[station] = len(stations)
+                    stations.append(station)
+                remap[index] = positions[station]
+            array = table.data.copy()
+            array["station_index"] = remap[table.data["station_index"]]
+            arrays.append(array)
+        data = np.concatenate(arrays) if arrays else np.zeros(0, dtype=FORECAST_DTYPE)
+        return cls(data, stations)
+
+    def __len__(self) -> int:
+        return len(self.data)
+
+    def __getitem__(self, column: str) -> "np.ndarray":
+        return self.data[column]
+
+    def __iter__(self) -> Iterator[ForecastRecord]:
+        for row in self.data:
+            fields = {name: row[name].item() for name in FORECAST_FIELDS}
+            yield ForecastRecord(self.stations[row["station_index"]], **fields)
+
+    @property
+    def station(self) -> "np.ndarray":
+        """Station name of every row"""
+        return _numpy().asarray(self.stations, dtype=object)[self.data["station_index"]]
+
+    @property
+    def dates(self) -> "np.ndarray":
+        return self.data["date"]
+
+    @property
+    def max_temperature(self) -> "np.ndarray":
+        return self.data["max_temperature"]
+
+    @property
+    def min_temperature(self) -> "np.ndarray":
+        return self.data["min_temperature"]
+
+    @property
+    def precipitation(self) -> "np.ndarray":
+        return self.data["precipitation"]
+
+    @property
+    def wind_speed(self) -> "np.ndarray":
+        return self.data["wind_speed"]
+
+    @property
+    def precipitation_probability(self) -> "np.ndarray":
+        return self.data["precipitation_probability"]
+
+    @property
+    def cloud_percentage(self) -> "np.ndarray":
+        return self.data["cloud_percentage"]
+
+    def select(self, station_name: str) -> "ForecastTable":
+        """Rows of one station"""
+        index = self.stations.index(station_name)
+        data = self.data[self.data["station_index"] == index].copy()
+        data["station_index"] = 0
+        return ForecastTable(data, [station_name])
@@ -3,7 +3,10 @@ DETALLADA_FLAG = "detallada"
 LONG_DETALLADA_FLAG = DETALLADA_FLAG + "~ROW_NUMBER_5~~TEMP_UNIT_c~~WIND_UNIT_kmh~"
 POR_HORA_FLAG = "por_hora~ROW_NUMBER_6~~TEMP_UNIT_c~~WIND_UNIT_kmh~"
 SEARCH_URL = "https://www.eltiempo.es/api/weatherapi/search"
+CURRENT_CONDITIONS_URL = "https://www.eltiempo.es/api/v1/get_current_conditions_by_pelmorex_id/"
+MAPS_URL = "https://www.eltiempo.es/ajax-maps-v2"
 DIAS_FLAG = "~ROW_NUMBER_5~~TEMP_UNIT_c~~WIND_UNIT_kmh~"
+NUM_FORECAST_DAYS = 14
 
 
 # WEB SCRAPING POSITION
@@ -19,3 +22,47 @@ PRECIPITATION_TAG = {"type":"div", "class_name":"m_table_weather_day_child m_tab
 WIND_SPEED_TAG = {"type":"div", "class_name":"m_table_weather_day_child m_table_weather_day_wind"}
 SUNRISE_TAG = {"type":"div", "class_name":"m_table_weather_day_child m_table_weather_day_dawn"}
 SUNSET_TAG = {"type":"div", "class_name":"m_table_weather_day_child m_table_weather_day_nightfall"}
+
+# POR HORA PAGE. One row per hour, same row attribute as the daily table
+HOURLY_DATE_TAG = {"type":"span", "class_name":"m_table_weather_hour_detail_date"}
+HOURLY_HOUR_TAG = {"type":"span", "class_name":"m_table_weather_hour_detail_hour"}
+HOURLY_TEMP_TAG = {"type":"span", "class_name":"m_table_weather_hour_detail_temp"}
+HOURLY_PRECIPITATION_TAG = {"type":"div", "class_name":"m_table_weather_hour_detail_child m_table_weather_hour_detail_rain"}
+HOURLY_PRECIPITATION_PROBABILITY_TAG = {"type":"div", "class_name":"m_table_weather_hour_detail_child m_table_weather_hour_detail_rain_probability"}
+HOURLY_WIND_SPEED_TAG = {"type":"div", "class_name":"m_table_weather_hour_detail_child m_table_weather_hour_detail_wind"}
+
+
+# HTTP SESSION
+DEFAULT_POOL_CONNECTIONS = 10
+DEFAULT_POOL_MAXSIZE = 10
+DEFAULT_TIMEOUT = (5, 30)  # (connect, read) in seconds
+DEFAULT_MAX_RETRIES = 0
+DEFAULT_STREAM_CHUNK_SIZE = 16 * 1024  # bytes
+
+# HTTP CACHE
+# Seconds that a cached response is used without asking the server
+DEFAULT_CACHE_TTL = {
+    "search": 7 * 24 * 3600,
+    "dias": 3600,
+    "detallada": 3600,
+    "por_hora": 1800,
+    "current_conditions": 600,
+    "maps": 1800,
+}
+
+# PARSED FORECAST CACHE
+DEFAULT_FORECAST_CACHE_SIZE = 1024  # stations and prediction types
+DEFAULT_FORECAST_CACHE_TTL = 600  # seconds
+
+# DETALLADA WARM-UP
+# The long detallada url answers 404 until the short one has been visited
+DEFAULT_DETALLADA_RETRIES = 2
+DEFAULT_DETALLADA_BACKOFF = 0.5  # seconds, doubled on every retry
+DEFAULT_DETALLADA_WARMUP_TTL = 3600  # seconds a station visits the short page first
+
+# FORECAST HISTORY
+DEFAULT_HISTORY_BATCH_SIZE = 512  # days written in one transaction
+
+# REFRESHER
+DEFAULT_REFRESH_INTERVAL = 1800  # seconds between two refreshes of a station
+DEFAULT_REFRESH_JITTER = 0.1  # fraction of the interval added or removed at random
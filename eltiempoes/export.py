@@ -0,0 +1,95 @@
+from typing import TYPE_CHECKING, Iterable, Union
+
+from .columnar import FORECAST_FIELDS, ForecastTable
+
+if TYPE_CHECKING:
+    import pandas
+    import pyarrow
+
+Tables = Union[ForecastTable, Iterable[ForecastTable]]
+
+
+def _as_table(tables: Tables) -> ForecastTable:
+    if isinstance(tables, ForecastTable):
+        return tables
+    return ForecastTable.concat(list(tables))
+
+
+def _import(module_name: str, extra: str):
+    try:
+        return __import__(module_name, fromlist=["_"])
+    except ImportError:
+        raise ImportError(
+            f"{module_name} is not installed. Install it with: pip install python-eltiempoes[{extra}]"
+        ) from None
+
+
+def _missing_detallada(table: ForecastTable):
+    """Mask of the days without detallada data. Their numbers are NaN already,
+    their ultraviolet radiation is an empty string in the typed array"""
+    import numpy
+
+    return numpy.isnan(table.data["precipitation_probability"])
+
+
+def to_arrow(tables: Tables) -> "pyarrow.Table":
+    """Arrow table of the forecast of one or many stations. The columns are built
+    from the typed arrays, without Python objects per day.
+
+    Args:
+        tables (Tables): A ForecastTable or many of them (one per station, for example)
+
+    Returns:
+        pyarrow.Table: station (dictionary encoded) and the FORECAST_FIELDS columns.
+            The missing detallada values are nulls.
+    """
+    pa = _import("pyarrow", "arrow")
+    table = _as_table(tables)
+    station = pa.DictionaryArray.from_arrays(
+        pa.array(table.data["station_index"]), pa.array(table.stations, type=pa.string())
+    )
+    columns = [station]
+    missing = _missing_detallada(table)
+    for name in FORECAST_FIELDS:
+        if name == "ultraviolet_radiation":
+            columns.append(pa.array(table.data[name], mask=missing))
+        else:
+            columns.append(pa.array(table.data[name], from_pandas=True))
+    return pa.Table.from_arrays(columns, names=["station", *FORECAST_FIELDS])
+
+
+def to_pandas(tables: Tables) -> "pandas.DataFrame":
+    """DataFrame of the forecast of one or many stations, built from the typed arrays
+
+    Args:
+        tables (Tables): A ForecastTable or many of them
+
+    Returns:
+        pandas.DataFrame: station (categorical) and the FORECAST_FIELDS columns.
+            The missing detallada values are NaN, and None for the ultraviolet radiation.
+    """
+    pd = _import("pandas", "pandas")
+    table = _as_table(tables)
+    columns = {
+        "station": pd.Categorical.from_codes(table.data["station_index"], table.stations)
+    }
+    missing = _missing_detallada(table)
+    for name in FORECAST_FIELDS:
+        columns[name] = table.data[name]
+    columns["ultraviolet_radiation"] = [
+        None if is_missing else value
+        for value, is_missing in zip(table.data["ultraviolet_radiation"].tolist(), missing)
+    ]
+    return pd.DataFrame(columns)
+
+
+def write_parquet(tables: Tables, path: str, **kwargs) -> None:
+    """Write the forecast of one or many stations in a Parquet file
+
+    Args:
+        tables (Tables): A ForecastTable or many of them
+        path (str): Parquet file
+        kwargs: Passed to pyarrow.parquet.write_table, like compression
+    """
+    pq = _import("pyarrow.parquet", "arrow")
+    pq.write_table(to_arrow(tables), path, **kwargs)
@@ -0,0 +1,253 @@
+"""
+Fast path for the daily and detallada pages. The values are taken straight from
+the HTML text with precompiled patterns, without building any tree, and every
+field is converted for all the days with a single regex call.
+
+It only understands the markup described by the tags in constants.py. When the
+output does not validate, FastPathError is raised and the caller falls back to
+the DOM path (see predictions.parse_daily_prediction).
+"""
+
+import hashlib
+import re
+from html import unescape
+from typing import Dict, List, Pattern, Tuple
+
+from .constants import (
+    DETALLADA_DATES_TAG,
+    PRECIPITATION_PROBABILITY_SPAM_POSITION,
+    CLOUD_PERCENTAGE_SPAM_POSITION,
+    ULTRAVIOLET_SPAM_POSITION,
+    DAILY_DATES_TAG,
+    MAX_TEMP_TAG,
+    MIN_TEMP_TAG,
+    PRECIPITATION_TAG,
+    WIND_SPEED_TAG,
+    SUNRISE_TAG,
+    SUNSET_TAG,
+)
+
+ROW_MARKER = "data-expand-tablechild-item"
+# Texts of all the days are joined with this character and converted at once
+SEPARATOR = "\x00"
+
+
+class FastPathError(ValueError):
+    """The page does not have the expected markup"""
+
+
+def element_pattern(tag: Dict[str, str]) -> Pattern[str]:
+    """Pattern of an element with the tag and the class name. The first group is
+    its inner HTML. Same class rule as BeautifulSoup: the class attribute is the
+    class name or contains it as one of its classes.
+
+    The pattern starts with the class name, so the regex engine looks for that
+    literal instead of trying every tag. The lookbehind checks that it is the
+    start of a class.
+
+    Args:
+        tag (Dict[str, str]): Tag of constants.py, like {"type": "span", "class_name": "..."}
+
+    Returns:
+        Pattern[str]: Compiled pattern
+    """
+    class_name = re.escape(tag["class_name"])
+    return re.compile(
+        r'{class_name}(?<=[\s"]{class_name})(?:\s[^"]*)?"[^>]*>(.*?)</{type}>'.format(
+            class_name=class_name, type=tag["type"]
+        ),
+        re.S,
+    )
+
+
+_TAGS = re.compile(r"<[^>]*>")
+_SPANS = re.compile(r"<span\b[^>]*>(.*?)</span>", re.S)
+
+_DAILY_DATE = element_pattern(DAILY_DATES_TAG)
+_MAX_TEMPERATURE = element_pattern(MAX_TEMP_TAG)
+_MIN_TEMPERATURE = element_pattern(MIN_TEMP_TAG)
+_PRECIPITATION = element_pattern(PRECIPITATION_TAG)
+_WIND_SPEED = element_pattern(WIND_SPEED_TAG)
+_SUNRISE = element_pattern(SUNRISE_TAG)
+_SUNSET = element_pattern(SUNSET_TAG)
+_DETALLADA_DATE = element_pattern(DETALLADA_DATES_TAG)
+
+# One match per text. The rest of the text is consumed up to the next separator.
+# Same tokens as the per item parsers of web_scraping.py
+_TOKEN = r"[^\s\x00]+"
+_REST = r"(?=\s|\x00)[^\x00]*"
+_DAILY_DATE_VALUES = re.compile(r"\x00\s*(\d+)\s+(" + _TOKEN + ")" + _REST)
+_DETALLADA_DATE_VALUES = re.compile(
+    r"\x00\s*" + _TOKEN + r"\s+(\d+)\s+(" + _TOKEN + ")" + _REST
+)
+_TEMPERATURE_VALUES = re.compile(r"\x00\s*(-?\d+)º" + _REST)
+_SECOND_NUMBER_VALUES = re.compile(
+    r"\x00\s*" + _TOKEN + r"\s+(-?\d+(?:\.\d+)?)" + _REST
+)
+_HOUR_VALUES = re.compile(r"\x00\s*(" + _TOKEN + ")" + _REST)
+_PERCENTAGE_VALUES = re.compile(r"\x00\s*(\d+(?:\.\d+)?)%" + _REST)
+
+
+def _table_bounds(html_text: str) -> Tuple[int, int]:
+    """Start and end of the text from the first table row to the end of the last one"""
+    start = html_text.find(ROW_MARKER)
+    if start == -1:
+        return -1, -1
+    last_row = html_text.rfind(ROW_MARKER)
+    end = html_text.find("</section>", last_row)
+    return start, end if end != -1 else len(html_text)
+
+
+def _table_region(html_text: str) -> Tuple[str, int]:
+    start, end = _table_bounds(html_text)
+    if start == -1:
+        raise FastPathError("The page has no table rows.")
+    region = html_text[start:end]
+    return region, region.count(ROW_MARKER)
+
+
+def table_fingerprint(html_text: str) -> str:
+    """Hash of the table rows of a page. The rest of the page (ads, scripts, the
+    time of the last update) changes on every request, so it is not hashed. A page
+    without rows is hashed whole.
+
+    Args:
+        html_text (str): HTML of the "dias" or "long_detallada" page
+
+    Returns:
+        str: Hexadecimal digest, equal for pages with the same forecast table
+    """
+    start, end = _table_bounds(html_text)
+    region = html_text[start:end] if start != -1 else html_text
+    return hashlib.blake2b(region.encode("utf-8"), digest_size=16).hexdigest()
+
+
+def _texts(inner_htmls: List[str], num_rows: int, field: str) -> str:
+    """Texts of the field, as element.text, joined with the separator"""
+    if len(inner_htmls) != num_rows:
+        raise FastPathError(
+            f"{len(inner_htmls)} values of {field} in {num_rows} rows."
+        )
+    joined = _TAGS.sub("", SEPARATOR + SEPARATOR.join(inner_htmls) + SEPARATOR)
+    return unescape(joined) if "&" in joined else joined
+
+
+def _values(pattern: Pattern[str], texts: str, num_rows: int, field: str) -> list:
+    values = pattern.findall(texts)
+    if len(values) != num_rows:
+        raise FastPathError(
+            f"Only {len(values)} of {num_rows} values of {field} are valid."
+        )
+    return values
+
+
+def _dates(values: List[Tuple[str, str]]) -> List[Tuple[int, str]]:
+    return [(int(day), month) for day, month in values]
+
+
+def extract_daily_prediction(html_text: str):
+    """Same output as predictions.parse_daily_prediction, without a parser
+
+    Args:
+        html_text (str): HTML of the "dias" page
+
+    Raises:
+        FastPathError: The page does not have the expected markup
+
+    Returns:
+        DailyPrediction: (dates, max_temperature, min_temperature, precipitation,
+            wind_speed, sunrise, sunset)
+    """
+    region, num_rows = _table_region(html_text)
+
+    def values(element: Pattern[str], value: Pattern[str], field: str) -> list:
+        texts = _texts(element.findall(region), num_rows, field)
+        return _values(value, texts, num_rows, field)
+
+    dates = _dates(values(_DAILY_DATE, _DAILY_DATE_VALUES, "date"))
+    max_temperature = list(
+        map(int, values(_MAX_TEMPERATURE, _TEMPERATURE_VALUES, "max_temperature"))
+    )
+    min_temperature = list(
+        map(int, values(_MIN_TEMPERATURE, _TEMPERATURE_VALUES, "min_temperature"))
+    )
+    precipitation = list(
+        map(float, values(_PRECIPITATION, _SECOND_NUMBER_VALUES, "precipitation"))
+    )
+    wind_speed = list(
+        map(int, values(_WIND_SPEED, _SECOND_NUMBER_VALUES, "wind_speed"))
+    )
+    sunrise = values(_SUNRISE, _HOUR_VALUES, "sunrise")
+    sunset = values(_SUNSET, _HOUR_VALUES, "sunset")
+    return (
+        dates,
+        max_temperature,
+        min_temperature,
+        precipitation,
+        wind_speed,
+        sunrise,
+        sunset,
+    )
+
+
+def extract_detallada_prediction(html_text: str):
+    """Same output as predictions.parse_detallada_prediction, without a parser
+
+    Args:
+        html_text (str): HTML of the "long_detallada" page
+
+    Raises:
+        FastPathError: The page does not have the expected markup
+
+    Returns:
+        DetalladaPrediction: (dates, precipitation_probability, cloud_percentage,
+            ultraviolet_radiation)
+    """
+    region, num_rows = _table_region(html_text)
+    dates_texts = _texts(_DETALLADA_DATE.findall(region), num_rows, "date")
+    dates = _dates(_values(_DETALLADA_DATE_VALUES, dates_texts, num_rows, "date"))
+
+    spams_by_position: Dict[int, List[str]] = {
+        PRECIPITATION_PROBABILITY_SPAM_POSITION: [],
+        CLOUD_PERCENTAGE_SPAM_POSITION: [],
+        ULTRAVIOLET_SPAM_POSITION: [],
+    }
+    for row in region.split(ROW_MARKER)[1:]:
+        spams = _SPANS.findall(row)
+        for position, inner_htmls in spams_by_position.items():
+            if position >= len(spams):
+                raise FastPathError("A row has fewer spans than expected.")
+            inner_htmls.append(spams[position])
+
+    precipitation_probability_texts = _texts(
+        spams_by_position[PRECIPITATION_PROBABILITY_SPAM_POSITION],
+        num_rows,
+        "precipitation_probability",
+    )
+    cloud_percentage_texts = _texts(
+        spams_by_position[CLOUD_PERCENTAGE_SPAM_POSITION], num_rows, "cloud_percentage"
+    )
+    precipitation_probability = [
+        float(value) / 100
+        for value in _values(
+            _PERCENTAGE_VALUES,
+            precipitation_probability_texts,
+            num_rows,
+            "precipitation_probability",
+        )
+    ]
+    cloud_percentage = [
+        float(value) / 100
+        for value in _values(
+            _PERCENTAGE_VALUES, cloud_percentage_texts, num_rows, "cloud_percentage"
+        )
+    ]
+    ultraviolet_radiation = _texts(
+        spams_by_position[ULTRAVIOLET_SPAM_POSITION], num_rows, "ultraviolet_radiation"
+    ).split(SEPARATOR)[1:-1]
+    return (
+        dates,
+        precipitation_probability,
+        cloud_percentage,
+        ultraviolet_radiation,
+    )
@@ -0,0 +1,233 @@
+import threading
+import time
+from datetime import date
+from typing import Dict, Iterable, List, NamedTuple, Optional, Tuple
+
+from .constants import DEFAULT_HISTORY_BATCH_SIZE
+from .predictions import normalize_station_name
+from .utils.dates import resolve_forecast_date
+
+# Fields of get_all_data_in_json stored for every day, in the column order
+HISTORY_FIELDS = (
+    "max_temperature",
+    "min_temperature",
+    "precipitation",
+    "wind_speed",
+    "sunrise",
+    "sunset",
+    "precipitation_probability",
+    "cloud_percentage",
+    "ultraviolet_radiation",
+    "detallada_available",
+)
+
+
+class ForecastSnapshot(NamedTuple):
+    """Forecast of one day issued at one fetch"""
+
+    station: str
+    fetched_at: float
+    target_date: date
+    max_temperature: Optional[int]
+    min_temperature: Optional[int]
+    precipitation: Optional[float]
+    wind_speed: Optional[int]
+    sunrise: Optional[str]
+    sunset: Optional[str]
+    precipitation_probability: Optional[float]
+    cloud_percentage: Optional[float]
+    ultraviolet_radiation: Optional[str]
+    detallada_available: bool
+
+    @property
+    def lead_days(self) -> int:
+        """Days between the fetch and the forecast date"""
+        return (self.target_date - date.fromtimestamp(self.fetched_at)).days
+
+
+class ForecastHistory:
+    """Time series of every forecast fetched, stored in sqlite.
+
+    One row per station, forecast date and fetch time, so all the forecasts
+    issued for a day can be compared with each other. The rows are written in
+    batches, each one in a single transaction.
+
+    Args:
+        path (str): sqlite file. ":memory:" keeps the history in this process only.
+        batch_size (int, optional): Days kept in memory before they are written.
+            They are also written by flush, query and close.
+    """
+
+    def __init__(self, path: str, batch_size: int = DEFAULT_HISTORY_BATCH_SIZE):
+        self.path = path
+        self.batch_size = batch_size
+        self._pending: List[tuple] = []
+        self._lock = threading.Lock()
+        import sqlite3
+
+        self._connection = sqlite3.connect(path, timeout=30, check_same_thread=False)
+        with self._lock, self._connection:
+            if path != ":memory:":
+                self._connection.execute("PRAGMA journal_mode=WAL")
+            # The primary key is the index of the queries by station and date
+            self._connection.execute(
+                """
+                CREATE TABLE IF NOT EXISTS forecasts (
+                    station TEXT NOT NULL,
+                    target_date TEXT NOT NULL,
+                    fetched_at REAL NOT NULL,
+                    max_temperature INTEGER,
+                    min_temperature INTEGER,
+                    precipitation REAL,
+                    wind_speed INTEGER,
+                    sunrise TEXT,
+                    sunset TEXT,
+                    precipitation_probability REAL,
+                    cloud_percentage REAL,
+                    ultraviolet_radiation TEXT,
+                    detallada_available INTEGER NOT NULL,
+                    PRIMARY KEY (station, target_date, fetched_at)
+                ) WITHOUT ROWID
+                """
+            )
+            self._connection.execute(
+                "CREATE INDEX IF NOT EXISTS forecasts_by_fetch"
+                " ON forecasts (station, fetched_at)"
+            )
+
+    def __enter__(self) -> "ForecastHistory":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    @staticmethod
+    def _rows(
+        station_name: str, forecast: Iterable[Dict[str, object]], fetched_at: float
+    ) -> List[tuple]:
+        station = normalize_station_name(station_name)
+        reference_date = date.fromtimestamp(fetched_at)
+        rows = []
+        for item in forecast:
+            day, month = item["date"]
+            target_date = resolve_forecast_date(day, month, reference_date)
+            values = [item.get(field) for field in HISTORY_FIELDS]
+            values[-1] = bool(item.get("detallada_available", True))
+            rows.append((station, target_date.isoformat(), fetched_at, *values))
+        return rows
+
+    def add(
+        self,
+        station_name: str,
+        forecast: Iterable[Dict[str, object]],
+        fetched_at: Optional[float] = None,
+    ) -> None:
+        """Add a forecast of get_all_data_in_json. It is written with the next batch.
+
+        Args:
+            station_name (str): Station name
+            forecast (Iterable[Dict[str, object]]): Days of the forecast
+            fetched_at (Optional[float], optional): Unix time of the fetch. Defaults to now.
+        """
+        rows = self._rows(station_name, forecast, fetched_at or time.time())
+        with self._lock:
+            self._pending.extend(rows)
+            if len(self._pending) >= self.batch_size:
+                self._write_pending()
+
+    def add_many(
+        self,
+        forecasts: Iterable[Tuple[str, Iterable[Dict[str, object]]]],
+        fetched_at: Optional[float] = None,
+    ) -> None:
+        """Add many forecasts, for example the results of get_many
+
+        Args:
+            forecasts (Iterable[Tuple[str, Iterable[Dict[str, object]]]]): (station_name, forecast)
+                pairs. StationResults with an error are skipped.
+            fetched_at (Optional[float], optional): Unix time of the fetch. Defaults to now.
+        """
+        fetched_at = fetched_at or time.time()
+        for station_name, forecast, *error in forecasts:
+            if error and error[0] is not None:
+                continue
+            self.add(station_name, forecast, fetched_at)
+
+    def _write_pending(self) -> None:
+        if not self._pending:
+            return
+        with self._connection:
+            self._connection.executemany(
+                "INSERT OR REPLACE INTO forecasts VALUES"
+                " (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                self._pending,
+            )
+        self._pending = []
+
+    def flush(self) -> None:
+        """Write the pending days"""
+        with self._lock:
+            self._write_pending()
+
+    def query(
+        self,
+        station_name: str,
+        target_date: Optional[date] = None,
+        fetched_after: Optional[float] = None,
+        fetched_before: Optional[float] = None,
+    ) -> List[ForecastSnapshot]:
+        """Forecasts issued for a station, oldest fetch first
+
+        Args:
+            station_name (str): Station name
+            target_date (Optional[date], optional): Only the forecasts of this day.
+                Defaults to all the days.
+            fetched_after (Optional[float], optional): Only fetches at or after this unix time.
+            fetched_before (Optional[float], optional): Only fetches before this unix time.
+
+        Returns:
+            List[ForecastSnapshot]: One item per day and fetch
+        """
+        conditions = ["station = ?"]
+        parameters: List[object] = [normalize_station_name(station_name)]
+        if target_date is not None:
+            conditions.append("target_date = ?")
+            parameters.append(target_date.isoformat())
+        if fetched_after is not None:
+            conditions.append("fetched_at >= ?")
+            parameters.append(fetched_after)
+        if fetched_before is not None:
+            conditions.append("fetched_at < ?")
+            parameters.append(fetched_before)
+
+        with self._lock:
+            self._write_pending()
+            rows = self._connection.execute(
+                "SELECT * FROM forecasts WHERE "
+                + " AND ".join(conditions)
+                + " ORDER BY fetched_at, target_date",
+                parameters,
+            ).fetchall()
+        return [
+            ForecastSnapshot(
+                station,
+                fetched_at,
+                date.fromisoformat(target_date),
+                *values[:-1],
+                bool(values[-1]),
+            )
+            for station, target_date, fetched_at, *values in rows
+        ]
+
+    def stations(self) -> List[str]:
+        with self._lock:
+            self._write_pending()
+            rows = self._connection.execute(
+                "SELECT DISTINCT station FROM forecasts ORDER BY station"
+            ).fetchall()
+        return [station for (station,) in rows]
+
+    def close(self) -> None:
+        with self._lock:
+            self._write_pending()
+            self._connection.close()
@@ -1,33 +1,344 @@
+import copy
 import json
-from unidecode import unidecode
-from typing import Dict, Tuple, List, Union
-from requests import get
-from bs4 import BeautifulSoup, ResultSet
+import threading
+import time
+from datetime import date
+from typing import (
+    TYPE_CHECKING,
+    Callable,
+    Dict,
+    Tuple,
+    List,
+    Union,
+    Optional,
+    Iterable,
+    Iterator,
+    NamedTuple,
+)
+
+from .constants import (
+    DEFAULT_POOL_CONNECTIONS,
+    DEFAULT_POOL_MAXSIZE,
+    DEFAULT_TIMEOUT,
+    DEFAULT_MAX_RETRIES,
+    DEFAULT_STREAM_CHUNK_SIZE,
+    DEFAULT_DETALLADA_RETRIES,
+    DEFAULT_DETALLADA_BACKOFF,
+    DEFAULT_DETALLADA_WARMUP_TTL,
+    NUM_FORECAST_DAYS,
+)
+from .cache import ForecastCache, HttpCache
+from .catalog import StationCatalog
+from .changes import ForecastUpdate, diff_forecasts
+from .columnar import ForecastTable
+from .export import to_arrow, to_pandas
+from .fast_extract import table_fingerprint
+from .history import ForecastHistory
+from .maps import MapStation, align_with_stations, parse_map_snapshot
+from .metrics import Metrics, MetricsSink
+from .parsers import resolve_parser
+from .utils.create_urls import (
+    create_current_conditions_url,
+    create_maps_url,
+    create_prediction_url,
+    create_search_url,
+    get_pelmorex_id,
+)
+from .utils.session import create_session
+from .utils.rate_limit import HostRateLimiter
+from .utils.batch import run_concurrently
+from .utils.single_flight import SingleFlight
+from .predictions import (
+    DailyPrediction,
+    DetalladaPrediction,
+    normalize_station_name,
+    parse_daily_prediction,
+    parse_detallada_prediction,
+    daily_prediction_to_json,
+    detallada_prediction_to_json,
+    all_data_to_json,
+    daily_row_to_json,
+    detallada_row_to_json,
+    hourly_row_to_json,
+)
 
-from .utils.create_urls import create_prediction_url, create_search_url
+from .streaming import iter_table_rows
 from .web_scraping import (
-    get_precipitation_probabilities,
-    get_cloud_percentages,
-    get_ultraviolet_radiations,
-    get_detallada_dates,
-    get_daily_dates,
-    get_max_temperatures,
-    get_min_temperatures,
-    get_precipitations,
-    get_winds_speed,
-    get_sunrise_hours,
-    get_sunset_hours,
+    CLASS_NAME_FIELDS,
+    HOURLY_CLASS_NAME_FIELDS,
+    SPAM_POSITION_FIELDS,
 )
 
+if TYPE_CHECKING:
+    from concurrent.futures import Executor
+
+    import pandas
+    import pyarrow
+    from requests import Response, Session
+
+
+class StationResult(NamedTuple):
+    """Result of one station in ElTiempoEs.get_many"""
+
+    station_name: str
+    data: Optional[Union[List[Dict[str, object]], ForecastTable]]
+    error: Optional[Exception]
+
+    @property
+    def ok(self) -> bool:
+        return self.error is None
+
+
+def parse_station_pages(
+    station_name: str,
+    daily_html: str,
+    detallada_html: str,
+    parser: str,
+    partial: bool,
+    fast_path: bool,
+    output: str,
+) -> Union[List[Dict[str, object]], ForecastTable]:
+    """Parse the daily and detallada pages of one station. It runs in the parser
+    processes of ElTiempoEs.get_many, so it only takes and returns picklable values.
+
+    Returns:
+        Union[List[Dict[str, object]], ForecastTable]: Output of get_all_data_in_json
+            or of get_all_data_in_table
+    """
+    detallada_prediction = parse_detallada_prediction(
+        detallada_html, parser, partial, fast_path=fast_path
+    )
+    daily_prediction = parse_daily_prediction(
+        daily_html, parser, partial, fast_path=fast_path
+    )
+    if output == "table":
+        return ForecastTable.from_predictions(
+            station_name, daily_prediction, detallada_prediction
+        )
+    return all_data_to_json(daily_prediction, detallada_prediction)
+
 
 class ElTiempoEs:
-    def __init__(self):
-        pass
+    def __init__(
+        self,
+        pool_connections: int = DEFAULT_POOL_CONNECTIONS,
+        pool_maxsize: int = DEFAULT_POOL_MAXSIZE,
+        timeout: Union[float, Tuple[float, float]] = DEFAULT_TIMEOUT,
+        max_retries: int = DEFAULT_MAX_RETRIES,
+        keep_alive: bool = True,
+        session: Optional["Session"] = None,
+        rate_limit: Optional[float] = None,
+        parser: str = "auto",
+        partial_parsing: bool = True,
+        http_cache: Optional[HttpCache] = None,
+        forecast_cache: Optional[ForecastCache] = None,
+        station_catalog: Optional[StationCatalog] = None,
+        metrics: Optional[MetricsSink] = None,
+        detallada_retries: int = DEFAULT_DETALLADA_RETRIES,
+        detallada_backoff: float = DEFAULT_DETALLADA_BACKOFF,
+        detallada_warmup_ttl: float = DEFAULT_DETALLADA_WARMUP_TTL,
+        fast_extraction: bool = False,
+        forecast_history: Optional[ForecastHistory] = None,
+    ):
+        """Client for eltiempo.es. All the calls share one connection-pooled session.
+
+        Args:
+            pool_connections (int, optional): Number of host pools to cache.
+            pool_maxsize (int, optional): Maximum connections kept open per host.
+            timeout (Union[float, Tuple[float, float]], optional): Seconds to wait
+                for the server, or a (connect, read) tuple.
+            max_retries (int, optional): Retries on connection errors.
+            keep_alive (bool, optional): Keep the connections open between requests.
+            session (Optional[Session], optional): Use this session instead of creating one.
+                The pool options are ignored when it is given.
+            rate_limit (Optional[float], optional): Maximum requests per second to
+                the same host. Not limited by default.
+            parser (str, optional): HTML parser backend: "selectolax", "lxml",
+                "html.parser" or "auto" for the fastest one installed.
+            partial_parsing (bool, optional): Build only the forecast table rows
+                of the pages instead of the whole document.
+            http_cache (Optional[HttpCache], optional): Disk cache of the responses.
+                Not cached by default.
+            forecast_cache (Optional[ForecastCache], optional): In-process cache of the
+                parsed forecasts. Not cached by default.
+            station_catalog (Optional[StationCatalog], optional): Local catalog used by
+                search_location before calling the search API.
+            metrics (Optional[MetricsSink], optional): Called with a MetricEvent for
+                every connect, request, download, parse and field conversion, tagged
+                with the station and the prediction type. Not measured by default.
+            detallada_retries (int, optional): Times the long detallada page is asked
+                again after a 404, visiting the short page before every retry.
+            detallada_backoff (float, optional): Seconds to wait before the second
+                retry, doubled on every following one.
+            detallada_warmup_ttl (float, optional): Seconds a station that needed the
+                short page keeps visiting it first. Then the long page is tried
+                directly again.
+            fast_extraction (bool, optional): Read the daily and detallada pages with
+                precompiled patterns instead of a parser. Pages with unexpected
+                markup are still parsed with the parser.
+            forecast_history (Optional[ForecastHistory], optional): Every forecast
+                fetched by get_all_data_in_json is added to it. Not stored by default.
+        """
+        if session is None:
+            session = create_session(
+                pool_connections=pool_connections,
+                pool_maxsize=pool_maxsize,
+                max_retries=max_retries,
+                keep_alive=keep_alive,
+            )
+        self.session = session
+        self.timeout = timeout
+        self.pool_maxsize = pool_maxsize
+        self.rate_limiter = HostRateLimiter(rate_limit) if rate_limit else None
+        self.parser = resolve_parser(parser)
+        self.partial_parsing = partial_parsing
+        self.fast_extraction = fast_extraction
+        self.http_cache = http_cache
+        self.forecast_cache = forecast_cache
+        self._single_flight = SingleFlight()
+        self.station_catalog = station_catalog
+        self.forecast_history = forecast_history
+        self.detallada_retries = detallada_retries
+        self.detallada_backoff = detallada_backoff
+        self.detallada_warmup_ttl = detallada_warmup_ttl
+        # Stations whose long detallada page needs a visit to the short one first,
+        # until the monotonic time of the value. Then the long page is tried directly
+        self._detallada_warmup_stations: Dict[str, float] = {}
+        # Table fingerprints and forecast of the last refresh_forecast of every station
+        self._refreshed_forecasts: Dict[
+            str, Tuple[Tuple[str, str], List[Dict[str, object]]]
+        ] = {}
+        self._refreshed_forecasts_lock = threading.Lock()
+        self.metrics = Metrics(metrics)
+        if self.metrics.enabled:
+            self.metrics.instrument_session(self.session)
+
+    def __enter__(self) -> "ElTiempoEs":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    def close(self) -> None:
+        """Close the pooled connections and write the pending forecast history"""
+        self.session.close()
+        if self.forecast_history is not None:
+            self.forecast_history.flush()
+
+    def _get(self, url: str, stream: bool = False) -> "Response":
+        if self.http_cache is None:
+            return self._request(url, stream=stream)
+
+        # A cached page is complete, so it is never streamed from the server
+        cached_response = self.http_cache.get(url)
+        if cached_response is None:
+            response_data = self._request(url)
+        elif self.http_cache.is_fresh(cached_response):
+            self.metrics.emit("cache.hit", 1, "count", url=url)
+            return cached_response.to_response()
+        else:
+            headers = {}
+            if cached_response.etag:
+                headers["If-None-Match"] = cached_response.etag
+            if cached_response.last_modified:
+                headers["If-Modified-Since"] = cached_response.last_modified
+            response_data = self._request(url, headers=headers)
+            if response_data.status_code == 304:
+                self.http_cache.touch(url)
+                self.metrics.emit("cache.revalidated", 1, "count", url=url)
+                return cached_response.to_response()
+
+        if response_data.status_code == 200:
+            self.http_cache.set(url, response_data)
+        return response_data
+
+    def _request(
+        self, url: str, stream: bool = False, headers: Optional[Dict[str, str]] = None
+    ) -> "Response":
+        if self.rate_limiter is not None:
+            self.rate_limiter.acquire(url)
+        if not self.metrics.enabled:
+            return self.session.get(
+                url, timeout=self.timeout, stream=stream, headers=headers
+            )
+
+        # The body is read apart from the headers to measure the download
+        response_data = self.session.get(
+            url, timeout=self.timeout, stream=True, headers=headers
+        )
+        status_code = response_data.status_code
+        self.metrics.emit(
+            "http.request",
+            response_data.elapsed.total_seconds(),
+            url=url,
+            status_code=status_code,
+        )
+        self.metrics.emit("http.status", status_code, "code", url=url)
+        if not stream:
+            with self.metrics.timer("http.download", url=url):
+                content = response_data.content
+            self.metrics.emit("http.bytes", len(content), "bytes", url=url)
+        return response_data
+
+    def _stream_rows(
+        self,
+        response_data: "Response",
+        chunk_size: int,
+        max_rows: Optional[int] = NUM_FORECAST_DAYS,
+        class_name_fields: Dict[str, Dict[str, str]] = CLASS_NAME_FIELDS,
+        spam_position_fields: Dict[str, int] = SPAM_POSITION_FIELDS,
+    ) -> Iterator[Dict[str, str]]:
+        """Yield the table rows while the body is read. The connection is closed
+        once max_rows have been read, without downloading the rest"""
+        try:
+            if response_data.encoding is None:
+                response_data.encoding = "utf-8"
+            chunks = response_data.iter_content(chunk_size, decode_unicode=True)
+            yield from iter_table_rows(
+                chunks, max_rows, class_name_fields, spam_position_fields
+            )
+        finally:
+            response_data.close()
+
+    def _cached_forecast(
+        self,
+        prediction_type: str,
+        station_name: str,
+        get_forecast: Callable[[], List[Dict[str, object]]],
+        refresh: bool = False,
+    ) -> List[Dict[str, object]]:
+        """Forecast from the forecast cache or from get_forecast. Concurrent calls for
+        the same station share one call of get_forecast instead of stampeding the site"""
+        key = ForecastCache.key(prediction_type, station_name)
+        if self.forecast_cache is not None and not refresh:
+            forecast = self.forecast_cache.get(key)
+            if forecast is not None:
+                # Copies, so the callers can not change the cached items
+                return [dict(item) for item in forecast]
+
+        def fetch_forecast() -> List[Dict[str, object]]:
+            forecast = get_forecast()
+            # Days without detallada data are fetched again on the next call
+            if self.forecast_cache is not None and all(
+                item.get("detallada_available", True) for item in forecast
+            ):
+                self.forecast_cache.set(key, forecast)
+            return forecast
+
+        forecast, shared = self._single_flight.do(key, fetch_forecast)
+        if isinstance(forecast, ForecastUpdate):
+            # Shared with a refresh_forecast of the station
+            forecast = forecast.forecast
+        if self.forecast_cache is None and not shared:
+            return forecast
+        return [dict(item) for item in forecast]
 
     def search_location(
         self, location_name: str, limit: int = 100
     ) -> List[Dict[str, Union[str, int, float]]]:
-        """Search for all stations of the given name
+        """Search for all stations of the given name. With a station catalog the
+        search API is only called when no name of the catalog starts with the name.
+        The similar names of the catalog are not used: the station may be missing.
 
         Args:
             location_name (str): Any name of a location. For example: "Córdoba"
@@ -36,23 +347,123 @@ class ElTiempoEs:
         Returns:
             List[Dict[str, Union[str, int, float]]]: Results with stations data
         """
+        if self.station_catalog is not None:
+            stations = self.station_catalog.search(location_name, limit=limit, fuzzy=False)
+            if stations:
+                return stations
+
         search_url = create_search_url(name=location_name, lim=limit)
-        response_data = get(search_url)
+        with self.metrics.tags(station=location_name, prediction_type="search"):
+            response_data = self._get(search_url)
         response_text_data = response_data.text
         response_text_data_in_json = json.loads(response_text_data)
         return response_text_data_in_json
 
-    def _get_daily_prediction(
-        self, station_name: str
-    ) -> Tuple[
-        List[Tuple[int, str]],
-        List[int],
-        List[int],
-        List[float],
-        List[int],
-        List[str],
-        List[str],
-    ]:
+    def get_current_conditions(
+        self, station: Union[str, Dict[str, object]]
+    ) -> Dict[str, object]:
+        """Gets the weather now from the current conditions API. It is a small json,
+        so it is much lighter than a forecast page.
+
+        Args:
+            station (Union[str, Dict[str, object]]): pelmorex_id of the station, like
+                "ESXX0007", or a station returned by search_location
+
+        Raises:
+            Exception: The API did not answer 200
+
+        Returns:
+            Dict[str, object]: Current conditions, as returned by the API
+        """
+        pelmorex_id = get_pelmorex_id(station)
+        current_conditions_url = create_current_conditions_url(pelmorex_id)
+        with self.metrics.tags(station=pelmorex_id, prediction_type="current_conditions"):
+            response_data = self._get(current_conditions_url)
+        if response_data.status_code != 200:
+            raise Exception(
+                f"The current conditions of '{pelmorex_id}' are not available"
+                f" (status {response_data.status_code})."
+            )
+        return json.loads(response_data.text)
+
+    def get_many_current_conditions(
+        self,
+        stations: Iterable[Union[str, Dict[str, object]]],
+        max_workers: Optional[int] = None,
+    ) -> Iterator[StationResult]:
+        """Gets the current conditions of many stations in parallel, as get_many
+
+        Args:
+            stations (Iterable[Union[str, Dict[str, object]]]): pelmorex_ids or stations
+                returned by search_location. It is consumed lazily.
+            max_workers (Optional[int], optional): Stations fetched at once.
+                Defaults to the pool_maxsize of the client.
+
+        Yields:
+            Iterator[StationResult]: (pelmorex_id, data, error) of every station. A
+                station without pelmorex_id is yielded with its id and the error.
+        """
+
+        def get_current_conditions(station):
+            # Resolved in the worker, so a malformed station fails alone
+            pelmorex_id = get_pelmorex_id(station)
+            return pelmorex_id, self.get_current_conditions(pelmorex_id)
+
+        for station, result, error in run_concurrently(
+            get_current_conditions,
+            stations,
+            max_workers=max_workers or self.pool_maxsize,
+        ):
+            if error is None:
+                pelmorex_id, data = result
+                yield StationResult(pelmorex_id, data, None)
+            elif isinstance(station, dict):
+                station_key = station.get("pelmorex_id") or station.get("id")
+                yield StationResult(str(station_key), None, error)
+            else:
+                yield StationResult(station, None, error)
+
+    def get_map_snapshot(
+        self,
+        day: Optional[Union[date, str]] = None,
+        hour: int = 1,
+        principal: str = "es",
+        stations: Optional[Iterable[Dict[str, object]]] = None,
+    ) -> Union[List[MapStation], Dict[str, MapStation]]:
+        """Gets the headline values of every station of a country map in a single
+        request to the ajax-maps-v2 endpoint (see maps.parse_map_snapshot).
+
+        Args:
+            day (Optional[Union[date, str]], optional): Day of the map, as a date or
+                "YYYYMMDD". Defaults to today.
+            hour (int, optional): Hour of the map, as the site numbers it. Defaults to 1.
+            principal (str, optional): Country of the map. Defaults to "es".
+            stations (Optional[Iterable[Dict[str, object]]], optional): Stations of
+                search_location to match with the points of the map.
+
+        Raises:
+            Exception: The endpoint did not answer 200
+            MapSnapshotError: The payload does not have the expected shape
+
+        Returns:
+            Union[List[MapStation], Dict[str, MapStation]]: Every point of the map or,
+                with stations, the point of every station found, by station id
+        """
+        maps_url = create_maps_url(day=day, hour=hour, principal=principal)
+        with self.metrics.tags(station=principal, prediction_type="maps"):
+            response_data = self._get(maps_url)
+            if response_data.status_code != 200:
+                raise Exception(
+                    f"The map of '{principal}' is not available"
+                    f" (status {response_data.status_code})."
+                )
+            with self.metrics.timer("parse"):
+                map_stations = parse_map_snapshot(response_data.text)
+        if stations is None:
+            return map_stations
+        return align_with_stations(map_stations, stations)
+
+    def _get_daily_prediction(self, station_name: str) -> DailyPrediction:
         """Gets the daily forecast over a 14-day period.
 
         Args:
@@ -69,32 +480,43 @@ class ElTiempoEs:
                     sunset: List[str]
                 ]
         """
-        station_name = unidecode(station_name)
-        station_name_lowercase = station_name.lower()
+        station_name_lowercase = normalize_station_name(station_name)
 
         daily_url = create_prediction_url(
             station=station_name_lowercase, prediction_type="dias"
         )
-        response_data = get(daily_url)
-        response_data_text = response_data.text
-        soup = BeautifulSoup(response_data_text, "html.parser")
-
-        dates = get_daily_dates(soup)
-        max_temperature = get_max_temperatures(soup)
-        min_temperature = get_min_temperatures(soup)
-        precipitation = get_precipitations(soup)
-        wind_speed = get_winds_speed(soup)
-        sunrise = get_sunrise_hours(soup)
-        sunset = get_sunset_hours(soup)
-        return (
-            dates,
-            max_temperature,
-            min_temperature,
-            precipitation,
-            wind_speed,
-            sunrise,
-            sunset,
+        with self.metrics.tags(station=station_name_lowercase, prediction_type="dias"):
+            response_data = self._get(daily_url)
+            return parse_daily_prediction(
+                response_data.text,
+                self.parser,
+                self.partial_parsing,
+                self.metrics,
+                self.fast_extraction,
+            )
+
+    def stream_daily_prediction_json(
+        self, station_name: str, chunk_size: int = DEFAULT_STREAM_CHUNK_SIZE
+    ) -> Iterator[Dict[str, object]]:
+        """Streams the daily forecast over a 14-day period. Every day is yielded as
+        soon as its row has been downloaded and the rest of the page is not read.
+
+        Args:
+            station_name (str): Station name (must be the same as the urlize fiel in the station json data)
+            chunk_size (int, optional): Bytes read from the connection at once.
+
+        Yields:
+            Iterator[Dict[str, object]]: Same items as _get_daily_prediction_json
+        """
+        station_name_lowercase = normalize_station_name(station_name)
+
+        daily_url = create_prediction_url(
+            station=station_name_lowercase, prediction_type="dias"
         )
+        with self.metrics.tags(station=station_name_lowercase, prediction_type="dias"):
+            response_data = self._get(daily_url, stream=True)
+        for row_texts in self._stream_rows(response_data, chunk_size):
+            yield daily_row_to_json(row_texts)
 
     def _get_daily_prediction_json(self, station_name: str) -> List[Dict[str, object]]:
         """Gets the daily forecast over a 14-day period in json format.
@@ -115,34 +537,121 @@ class ElTiempoEs:
                 ]
             ]
         """
-        (
-            dates,
-            max_temperature,
-            min_temperature,
-            precipitation,
-            wind_speed,
-            sunrise,
-            sunset,
-        ) = self._get_daily_prediction(station_name=station_name)
-
-        daily_items_json = []
-        for index, item in enumerate(dates):
-            item_dict = {
-                "date": item,
-                "max_temperature": max_temperature[index],
-                "min_temperature": min_temperature[index],
-                "precipitation": precipitation[index],
-                "wind_speed": wind_speed[index],
-                "sunrise": sunrise[index],
-                "sunset": sunset[index],
-            }
-            daily_items_json.append(item_dict)
+        return self._cached_forecast(
+            "dias",
+            station_name,
+            lambda: daily_prediction_to_json(
+                self._get_daily_prediction(station_name=station_name)
+            ),
+        )
 
-        return daily_items_json
+    def stream_hourly_prediction_json(
+        self, station_name: str, chunk_size: int = DEFAULT_STREAM_CHUNK_SIZE
+    ) -> Iterator[Dict[str, object]]:
+        """Streams the hour by hour forecast. Every hour is yielded as soon as its
+        row has been downloaded, so the whole page is never held in memory.
 
-    def _get_detallada_prediction(
-        self, station_name: str
-    ) -> Tuple[List[Tuple[int, str]], List[float], List[float], List[str]]:
+        Args:
+            station_name (str): Station name (must be the same as the urlize fiel in the station json data)
+            chunk_size (int, optional): Bytes read from the connection at once.
+
+        Yields:
+            Iterator[
+                Dict[
+                    "date": Tuple[int, str]
+                    "hour": str; in the format (%hh:%mm)
+                    "temperature": int; degrees Celsius
+                    "precipitation": float; mm
+                    "precipitation_probability": float; in percentage of one
+                    "wind_speed": int; km/h
+                ]
+            ]
+        """
+        station_name_lowercase = normalize_station_name(station_name)
+
+        por_hora_url = create_prediction_url(
+            station=station_name_lowercase, prediction_type="por_hora"
+        )
+        with self.metrics.tags(
+            station=station_name_lowercase, prediction_type="por_hora"
+        ):
+            response_data = self._get(por_hora_url, stream=True)
+        rows = self._stream_rows(
+            response_data,
+            chunk_size,
+            max_rows=None,
+            class_name_fields=HOURLY_CLASS_NAME_FIELDS,
+            spam_position_fields={},
+        )
+        for row_texts in rows:
+            # Rows without hour are day headers or ads inside the table
+            if "hour" in row_texts:
+                yield hourly_row_to_json(row_texts)
+
+    def _is_cached(self, url: str) -> bool:
+        if self.http_cache is None:
+            return False
+        cached_response = self.http_cache.get(url)
+        return cached_response is not None and self.http_cache.is_fresh(cached_response)
+
+    def _needs_detallada_warmup(self, station: str) -> bool:
+        expires_at = self._detallada_warmup_stations.get(station)
+        if expires_at is None:
+            return False
+        if expires_at <= time.monotonic():
+            # Added back if the long page still answers 404
+            self._detallada_warmup_stations.pop(station, None)
+            return False
+        return True
+
+    def _get_long_detallada(self, station: str, stream: bool = False) -> "Response":
+        """Long detallada page of the station. The long url answers 404 until the
+        short detallada page of the station has been visited, so the stations that
+        needed it are remembered and the short page is visited first next time.
+
+        Args:
+            station (str): Station name as it is used in the urls
+            stream (bool, optional): Do not read the body of the long page
+
+        Returns:
+            Response: Long page or, if it still answers 404 after detallada_retries,
+                the short page, which has fewer days
+        """
+        long_detallada_url = create_prediction_url(
+            station=station, prediction_type="long_detallada"
+        )
+        detallada_url = create_prediction_url(
+            station=station, prediction_type="detallada"
+        )
+        short_response_data = None
+        if self._needs_detallada_warmup(station) and not self._is_cached(
+            long_detallada_url
+        ):
+            short_response_data = self._request(detallada_url)
+        response_data = self._get(long_detallada_url, stream=stream)
+
+        attempt = 0
+        while response_data.status_code == 404 and attempt < self.detallada_retries:
+            response_data.close()
+            self._detallada_warmup_stations[station] = (
+                time.monotonic() + self.detallada_warmup_ttl
+            )
+            if attempt > 0:
+                time.sleep(self.detallada_backoff * 2 ** (attempt - 1))
+            attempt += 1
+            with self.metrics.timer("detallada.retry", attempt=attempt):
+                short_response_data = self._request(detallada_url)
+                if short_response_data.status_code == 404:
+                    # The station does not exist
+                    break
+                response_data = self._get(long_detallada_url, stream=stream)
+
+        if response_data.status_code == 404 and short_response_data is not None:
+            response_data.close()
+            return short_response_data
+        return response_data
+
+    def _get_detallada_prediction(self, station_name: str) -> DetalladaPrediction:
         """Gets the detallada daily forecast over a 14-day period.
 
         Args:
@@ -156,36 +665,44 @@ class ElTiempoEs:
                     ultraviolet_radiation: List[str]
                 ]
         """
-        station_name = unidecode(station_name)
-        station_name_lowercase = station_name.lower()
+        station_name_lowercase = normalize_station_name(station_name)
 
-        long_detallada_url = create_prediction_url(
-            station=station_name_lowercase, prediction_type="long_detallada"
-        )
-        response_data = get(long_detallada_url)
+        with self.metrics.tags(
+            station=station_name_lowercase, prediction_type="detallada"
+        ):
+            response_data = self._get_long_detallada(station_name_lowercase)
+            return parse_detallada_prediction(
+                response_data.text,
+                self.parser,
+                self.partial_parsing,
+                self.metrics,
+                self.fast_extraction,
+            )
+
+    def stream_detallada_prediction_json(
+        self, station_name: str, chunk_size: int = DEFAULT_STREAM_CHUNK_SIZE
+    ) -> Iterator[Dict[str, object]]:
+        """Streams the detallada daily forecast over a 14-day period. Every day is
+        yielded as soon as its row has been downloaded and the rest of the page is not read.
+
+        Args:
+            station_name (str): Station name (must be the same as the urlize fiel in the station json data)
+            chunk_size (int, optional): Bytes read from the connection at once.
 
-        if response_data.status_code == 404:
-            # If the page returns 404 it is necessary to call the detailed URL
-            # TODO: Check this solution
-            detallada_url = create_prediction_url(
-                station=station_name_lowercase, prediction_type="detallada"
+        Yields:
+            Iterator[Dict[str, object]]: Same items as _get_detallada_prediction_json
+        """
+        station_name_lowercase = normalize_station_name(station_name)
+
+        with self.metrics.tags(
+            station=station_name_lowercase, prediction_type="detallada"
+        ):
+            response_data = self._get_long_detallada(
+                station_name_lowercase, stream=True
             )
-            get(detallada_url)
-            response_data = get(long_detallada_url)
-
-        response_data_text = response_data.text
-        soup = BeautifulSoup(response_data_text, "html.parser")
-
-        dates = get_detallada_dates(soup)
-        precipitation_probability = get_precipitation_probabilities(soup)
-        cloud_percentage = get_cloud_percentages(soup)
-        ultraviolet_radiation = get_ultraviolet_radiations(soup)
-        return (
-            dates,
-            precipitation_probability,
-            cloud_percentage,
-            ultraviolet_radiation,
-        )
+
+        for row_texts in self._stream_rows(response_data, chunk_size):
+            yield detallada_row_to_json(row_texts)
 
     def _get_detallada_prediction_json(
         self, station_name: str
@@ -205,24 +722,13 @@ class ElTiempoEs:
                 ]
             ]
         """
-        (
-            dates,
-            precipitation_probability,
-            cloud_percentage,
-            ultraviolet_radiation,
-        ) = self._get_detallada_prediction(station_name=station_name)
-
-        detallada_items_json = []
-        for index, item in enumerate(dates):
-            item_dict = {
-                "date": item,
-                "precipitation_probability": precipitation_probability[index],
-                "cloud_percentage": cloud_percentage[index],
-                "ultraviolet_radiation": ultraviolet_radiation[index],
-            }
-            detallada_items_json.append(item_dict)
-
-        return detallada_items_json
+        return self._cached_forecast(
+            "detallada",
+            station_name,
+            lambda: detallada_prediction_to_json(
+                self._get_detallada_prediction(station_name=station_name)
+            ),
+        )
 
     def get_all_data_in_json(self, station_name: str) -> List[Dict[str, object]]:
         """Gets all daily forecast data over a 14-day period in json format.
@@ -243,43 +749,280 @@ class ElTiempoEs:
                     "precipitation_probability": float; in percentage of one
                     "cloud_percentage": float; in percentage of one
                     "ultraviolet_radiation": str; List of texts with differents radiation types, like ('Muy alta' ...)
+                    "detallada_available": bool; False when the detallada page had no data
+                        for the day. Then its three fields are None
             }
                 ]
             ]
         """
-        (
-            dates_detallada,
-            precipitation_probability,
-            cloud_percentage,
-            ultraviolet_radiation,
-        ) = self._get_detallada_prediction(station_name=station_name)
-
-        (
-            dates_daily,
-            max_temperature,
-            min_temperature,
-            precipitation,
-            wind_speed,
-            sunrise,
-            sunset,
-        ) = self._get_daily_prediction(station_name=station_name)
-        all_json_items = []
-        if len(precipitation_probability) < 14:
-            # TODO: This sometimes happens. Have a look
-            raise Exception("It is not possible to connect with eltiempo.es/detallada.")
-        for index, item in enumerate(dates_daily):
-            item_dict = {
-                "date": item,
-                "max_temperature": max_temperature[index],
-                "min_temperature": min_temperature[index],
-                "precipitation": precipitation[index],
-                "wind_speed": wind_speed[index],
-                "sunrise": sunrise[index],
-                "sunset": sunset[index],
-                "precipitation_probability": precipitation_probability[index],
-                "cloud_percentage": cloud_percentage[index],
-                "ultraviolet_radiation": ultraviolet_radiation[index],
-            }
-            all_json_items.append(item_dict)
+        return self._cached_forecast(
+            "all", station_name, lambda: self._get_all_data_in_json(station_name)
+        )
+
+    def refresh_forecast(self, station_name: str) -> ForecastUpdate:
+        """Fetch the pages of the station again and compare them with the ones of the
+        previous refresh_forecast. Only the table rows are compared, by their hash, and
+        the pages are not parsed when they did not change.
+
+        The first refresh of a station has every field of every day as a change.
+        The forecast is put in the forecast cache also when it did not change, so
+        its entry is renewed. Forecasts that changed are added to the history.
+        A get_all_data_in_json fetch of the station already in flight is shared, and
+        the other way around.
+
+        Args:
+            station_name (str): Station name (must be the same as the urlize fiel in the station json data)
+
+        Returns:
+            ForecastUpdate: (station_name, changed, forecast, changes). forecast has the
+                same items as get_all_data_in_json, changes one item per day and field
+                whose value moved.
+        """
+        station = normalize_station_name(station_name)
+
+        def refresh() -> ForecastUpdate:
+            daily_html, detallada_html = self._get_all_pages(station_name)
+            fingerprints = (
+                table_fingerprint(daily_html),
+                table_fingerprint(detallada_html),
+            )
+            with self._refreshed_forecasts_lock:
+                previous_fingerprints, previous = self._refreshed_forecasts.get(
+                    station, (None, [])
+                )
+            if fingerprints == previous_fingerprints:
+                self.metrics.emit("refresh.unchanged", 1, "count", station=station)
+                self._cache_refreshed_forecast(station, previous)
+                return ForecastUpdate(station_name, False, previous, [])
+
+            with self.metrics.tags(station=station, prediction_type="all"):
+                forecast = all_data_to_json(
+                    parse_daily_prediction(
+                        daily_html,
+                        self.parser,
+                        self.partial_parsing,
+                        self.metrics,
+                        self.fast_extraction,
+                    ),
+                    parse_detallada_prediction(
+                        detallada_html,
+                        self.parser,
+                        self.partial_parsing,
+                        self.metrics,
+                        self.fast_extraction,
+                    ),
+                )
+            with self._refreshed_forecasts_lock:
+                self._refreshed_forecasts[station] = (fingerprints, forecast)
+            self._cache_refreshed_forecast(station, forecast)
+            self._add_to_history(station_name, forecast)
+            return ForecastUpdate(
+                station_name, True, forecast, diff_forecasts(previous, forecast)
+            )
+
+        result, _ = self._single_flight.do(ForecastCache.key("all", station), refresh)
+        # Copies, so the callers can not change the forecast of the next comparison
+        if isinstance(result, ForecastUpdate):
+            return result._replace(
+                station_name=station_name,
+                forecast=[dict(item) for item in result.forecast],
+            )
+
+        # Shared with a get_all_data_in_json fetch. Its pages were not hashed, so
+        # the forecast is compared by value and the next refresh parses the pages
+        forecast = [dict(item) for item in result]
+        with self._refreshed_forecasts_lock:
+            _, previous = self._refreshed_forecasts.get(station, (None, []))
+            self._refreshed_forecasts[station] = (None, forecast)
+        changes = diff_forecasts(previous, forecast)
+        return ForecastUpdate(
+            station_name, bool(changes), [dict(item) for item in forecast], changes
+        )
+
+    def _cache_refreshed_forecast(
+        self, station: str, forecast: List[Dict[str, object]]
+    ) -> None:
+        # Days without detallada data are fetched again by get_all_data_in_json
+        if self.forecast_cache is not None and all(
+            item.get("detallada_available", True) for item in forecast
+        ):
+            self.forecast_cache.set(ForecastCache.key("all", station), forecast)
+
+    def _get_all_data_in_json(self, station_name: str) -> List[Dict[str, object]]:
+        detallada_prediction = self._get_detallada_prediction(
+            station_name=station_name
+        )
+        daily_prediction = self._get_daily_prediction(station_name=station_name)
+        forecast = all_data_to_json(daily_prediction, detallada_prediction)
+        self._add_to_history(station_name, forecast)
+        return forecast
+
+    def _add_to_history(self, station_name: str, forecast: List[Dict[str, object]]) -> None:
+        if self.forecast_history is not None:
+            self.forecast_history.add(station_name, forecast)
+
+    def _get_all_pages(self, station_name: str) -> Tuple[str, str]:
+        """HTML of the daily and the detallada pages, fetched without parsing them"""
+        station_name_lowercase = normalize_station_name(station_name)
+
+        with self.metrics.tags(
+            station=station_name_lowercase, prediction_type="detallada"
+        ):
+            detallada_html = self._get_long_detallada(station_name_lowercase).text
+        daily_url = create_prediction_url(
+            station=station_name_lowercase, prediction_type="dias"
+        )
+        with self.metrics.tags(station=station_name_lowercase, prediction_type="dias"):
+            daily_html = self._get(daily_url).text
+        return daily_html, detallada_html
+
+    def _get_all_data_in_processes(
+        self, station_name: str, executor: "Executor", output: str
+    ) -> Union[List[Dict[str, object]], ForecastTable]:
+        def get_forecast():
+            daily_html, detallada_html = self._get_all_pages(station_name)
+            future = executor.submit(
+                parse_station_pages,
+                station_name,
+                daily_html,
+                detallada_html,
+                self.parser,
+                self.partial_parsing,
+                self.fast_extraction,
+                output,
+            )
+            with self.metrics.tags(
+                station=normalize_station_name(station_name), prediction_type="all"
+            ):
+                # Includes the time to send the pages to the process and back
+                with self.metrics.timer("parse", processes=True):
+                    forecast = future.result()
+            if output == "json":
+                self._add_to_history(station_name, forecast)
+            return forecast
+
+        if output == "table":
+            return get_forecast()
+        return self._cached_forecast("all", station_name, get_forecast)
+
+    def get_all_data_in_table(
+        self, station_name: str, reference_date: Optional[date] = None
+    ) -> ForecastTable:
+        """Gets all daily forecast data over a 14-day period as a columnar table.
+        Same data as get_all_data_in_json, without building a dict per day.
+
+        Args:
+            station_name (str): Station name (must be the same as the urlize fiel in the station json data)
+            reference_date (Optional[date], optional): Date used to get the year of
+                the dates. Defaults to today.
+
+        Returns:
+            ForecastTable: One row per day, with typed columns and datetime64 dates
+        """
+        detallada_prediction = self._get_detallada_prediction(
+            station_name=station_name
+        )
+        daily_prediction = self._get_daily_prediction(station_name=station_name)
+        return ForecastTable.from_predictions(
+            station_name, daily_prediction, detallada_prediction, reference_date
+        )
+
+    def get_all_data_in_arrow(self, station_name: str) -> "pyarrow.Table":
+        """Gets all daily forecast data over a 14-day period as an Arrow table.
+        It is built from get_all_data_in_table (see export.to_arrow).
+
+        Args:
+            station_name (str): Station name (must be the same as the urlize fiel in the station json data)
+
+        Returns:
+            pyarrow.Table: One row per day
+        """
+        return to_arrow(self.get_all_data_in_table(station_name))
+
+    def get_all_data_in_pandas(self, station_name: str) -> "pandas.DataFrame":
+        """Gets all daily forecast data over a 14-day period as a pandas DataFrame.
+        It is built from get_all_data_in_table (see export.to_pandas).
+
+        Args:
+            station_name (str): Station name (must be the same as the urlize fiel in the station json data)
+
+        Returns:
+            pandas.DataFrame: One row per day
+        """
+        return to_pandas(self.get_all_data_in_table(station_name))
+
+    def get_many(
+        self,
+        station_names: Iterable[str],
+        max_workers: Optional[int] = None,
+        rate_limit: Optional[float] = None,
+        output: str = "json",
+        parser_processes: Optional[int] = None,
+        max_pending: Optional[int] = None,
+    ) -> Iterator[StationResult]:
+        """Gets all daily forecast data of many stations in parallel.
+
+        The results are yielded as they complete, not in the input order. A station
+        that fails is yielded with the error instead of raising it.
+
+        Args:
+            station_names (Iterable[str]): Station names. It is consumed lazily.
+            max_workers (Optional[int], optional): Stations fetched at once by the I/O
+                threads. Defaults to the pool_maxsize of the client.
+            rate_limit (Optional[float], optional): Maximum requests per second to
+                the same host for this batch. Defaults to the rate_limit of the client.
+            output (str, optional): "json" for the output of get_all_data_in_json or
+                "table" for the output of get_all_data_in_table. Defaults to "json".
+            parser_processes (Optional[int], optional): Parse the pages in a pool of
+                this many processes instead of in the I/O threads, so the parsing
+                is not limited by the GIL. The threads only download the pages.
+                The processes are spawned, so the main script of the program must
+                be importable (guarded by if __name__ == "__main__").
+                Parsed in the threads by default.
+            max_pending (Optional[int], optional): Stations submitted but not yielded
+                yet. Bounds the memory used with endless inputs. Defaults to twice
+                max_workers.
+
+        Yields:
+            Iterator[StationResult]: (station_name, data, error) of every station.
+        """
+        if output not in ("json", "table"):
+            raise ValueError(f"output '{output}' is not supported.")
+        client = self
+        if rate_limit:
+            # Shallow copy: same session, new limiter only for this batch
+            client = copy.copy(self)
+            client.rate_limiter = HostRateLimiter(rate_limit)
+
+        executor = None
+        if parser_processes:
+            import multiprocessing
+            from concurrent.futures import ProcessPoolExecutor
+
+            # The workers start on the first submit, from an I/O thread. Forking
+            # there would copy the locks held by the other threads (urllib3 pools,
+            # logging, the rate limiter), so they are spawned instead
+            executor = ProcessPoolExecutor(
+                max_workers=parser_processes,
+                mp_context=multiprocessing.get_context("spawn"),
+            )
+
+            def get_data(station_name):
+                return client._get_all_data_in_processes(station_name, executor, output)
+
+        elif output == "json":
+            get_data = client.get_all_data_in_json
+        else:
+            get_data = client.get_all_data_in_table
 
-        return all_json_items
+        try:
+            for station_name, data, error in run_concurrently(
+                get_data,
+                station_names,
+                max_workers=max_workers or self.pool_maxsize,
+                max_pending=max_pending,
+            ):
+                yield StationResult(station_name, data, error)
+        finally:
+            if executor is not None:
+                executor.shutdown(wait=True)
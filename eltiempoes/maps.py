@@ -0,0 +1,148 @@
+"""
+Snapshot of many stations at once from the ajax-maps-v2 endpoint of the maps
+of eltiempo.es.
+
+The parser only reads the payload shape it knows: a json object with the list
+of points under "cities", each point with the keys of POINT_KEYS. Anything else
+raises MapSnapshotError instead of being guessed, so a change of the endpoint
+fails loudly and no value is attached to the wrong station.
+"""
+
+import json
+import re
+from typing import Dict, Iterable, List, NamedTuple, Optional
+
+from .catalog import Station
+
+# Key of the payload with the list of points
+POINTS_KEY = "cities"
+# Key of every field of MapStation in a point. The other keys are kept in raw only
+POINT_KEYS = {
+    "id": "id",
+    "pelmorex_id": "pelmorex_id",
+    "name": "name",
+    "lat": "lat",
+    "lon": "lon",
+    "temperature": "temp",
+    "max_temperature": "max",
+    "min_temperature": "min",
+    "condition": "description",
+}
+REQUIRED_FIELDS = ("id", "name")
+
+_NUMBER = re.compile(r"(-?\d+(?:[.,]\d+)?)\s*[º°]?")
+
+
+class MapSnapshotError(ValueError):
+    """The payload of ajax-maps-v2 does not have the expected shape"""
+
+
+class MapStation(NamedTuple):
+    """One point of the map. Optional fields missing in the payload are None"""
+
+    id: str
+    pelmorex_id: Optional[str]
+    name: str
+    lat: Optional[float]
+    lon: Optional[float]
+    temperature: Optional[float]
+    max_temperature: Optional[float]
+    min_temperature: Optional[float]
+    condition: Optional[str]
+    raw: Dict[str, object]
+
+
+def _number(point: Dict[str, object], field: str) -> Optional[float]:
+    value = point.get(POINT_KEYS[field])
+    if value is None or value == "":
+        return None
+    if isinstance(value, (int, float)) and not isinstance(value, bool):
+        return float(value)
+    match = _NUMBER.fullmatch(str(value).strip())
+    if match is None:
+        raise MapSnapshotError(
+            f"{POINT_KEYS[field]} of the point {point.get('id')!r} is not a number: {value!r}."
+        )
+    return float(match.group(1).replace(",", "."))
+
+
+def _text(point: Dict[str, object], field: str) -> Optional[str]:
+    value = point.get(POINT_KEYS[field])
+    return None if value is None or value == "" else str(value)
+
+
+def parse_map_snapshot(text: str) -> List[MapStation]:
+    """Parse the ajax-maps-v2 payload
+
+    Args:
+        text (str): Body of the response
+
+    Raises:
+        MapSnapshotError: The payload is not a json object with a list of points
+            under "cities", or a point has no id or name or a value is not a number
+
+    Returns:
+        List[MapStation]: One item per point of the map, in the payload order
+    """
+    try:
+        payload = json.loads(text)
+    except ValueError as error:
+        raise MapSnapshotError(f"The map payload is not json: {error}") from None
+    points = payload.get(POINTS_KEY) if isinstance(payload, dict) else None
+    if not isinstance(points, list):
+        raise MapSnapshotError(f"The map payload has no {POINTS_KEY!r} list.")
+
+    map_stations = []
+    for point in points:
+        if not isinstance(point, dict):
+            raise MapSnapshotError(f"A point of the map is not an object: {point!r}.")
+        for field in REQUIRED_FIELDS:
+            if _text(point, field) is None:
+                raise MapSnapshotError(f"A point of the map has no {POINT_KEYS[field]!r}.")
+        map_stations.append(
+            MapStation(
+                id=_text(point, "id"),
+                pelmorex_id=_text(point, "pelmorex_id"),
+                name=_text(point, "name"),
+                lat=_number(point, "lat"),
+                lon=_number(point, "lon"),
+                temperature=_number(point, "temperature"),
+                max_temperature=_number(point, "max_temperature"),
+                min_temperature=_number(point, "min_temperature"),
+                condition=_text(point, "condition"),
+                raw=point,
+            )
+        )
+    return map_stations
+
+
+def align_with_stations(
+    map_stations: Iterable[MapStation], stations: Iterable[Station]
+) -> Dict[str, MapStation]:
+    """Match the points of the map with stations of search_location, by id and
+    then by pelmorex_id. Stations without a point of the same id are left out,
+    they are never matched by name.
+
+    Args:
+        map_stations (Iterable[MapStation]): Output of parse_map_snapshot
+        stations (Iterable[Station]): Stations returned by search_location
+
+    Returns:
+        Dict[str, MapStation]: Point of every station found in the map, by station id
+    """
+    by_id: Dict[str, MapStation] = {}
+    by_pelmorex_id: Dict[str, MapStation] = {}
+    for map_station in map_stations:
+        by_id.setdefault(map_station.id, map_station)
+        if map_station.pelmorex_id is not None:
+            by_pelmorex_id.setdefault(map_station.pelmorex_id, map_station)
+
+    aligned = {}
+    for station in stations:
+        station_id = str(station["id"])
+        map_station = by_id.get(station_id)
+        if map_station is None and station.get("pelmorex_id"):
+            map_station = by_pelmorex_id.get(str(station["pelmorex_id"]))
+        if map_station is not None:
+            aligned[station_id] = map_station
+    return aligned
@@ -0,0 +1,127 @@
+import threading
+import time
+from contextlib import contextmanager
+from typing import TYPE_CHECKING, Callable, Dict, Iterator, NamedTuple, Optional
+
+if TYPE_CHECKING:
+    from requests import Session
+
+
+class MetricEvent(NamedTuple):
+    """One measure sent to the metrics sink
+
+    name is one of:
+        "http.connect": seconds to resolve the host and open a new connection
+        "http.request": seconds until the response headers were received
+        "http.download": seconds to read the response body
+        "http.bytes": bytes of the response body
+        "http.status": HTTP status code of the response
+        "cache.hit" / "cache.revalidated": responses served from the HTTP cache
+        "parse": seconds to parse the page and extract the texts of its table
+        "fast_path.fallback": pages that the regex extractor could not read
+        "convert": seconds to convert the texts of one field into values, with the
+            field in the tags. The texts are extracted by "parse"
+        "detallada.retry": seconds spent retrying after a 404 of the long detallada page
+        "refresh.unchanged": refreshes whose table rows had not changed, not parsed
+    """
+
+    name: str
+    value: float
+    unit: str
+    tags: Dict[str, object]
+
+
+MetricsSink = Callable[[MetricEvent], None]
+
+
+class Metrics:
+    def __init__(self, sink: Optional[MetricsSink] = None):
+        """Sends MetricEvents to a sink with the tags of the current call. The tags
+        are kept per thread, so the calls of get_many are not mixed up.
+
+        Args:
+            sink (Optional[MetricsSink], optional): Called with every event.
+                Nothing is measured without it.
+        """
+        self.sink = sink
+        self._local = threading.local()
+
+    @property
+    def enabled(self) -> bool:
+        return self.sink is not None
+
+    def current_tags(self) -> Dict[str, object]:
+        return getattr(self._local, "tags", {})
+
+    @contextmanager
+    def tags(self, **tags: object) -> Iterator[None]:
+        """Add tags to the events sent inside the block"""
+        previous_tags = self.current_tags()
+        self._local.tags = {**previous_tags, **tags}
+        try:
+            yield
+        finally:
+            self._local.tags = previous_tags
+
+    def emit(self, name: str, value: float, unit: str = "s", **tags: object) -> None:
+        if self.sink is None:
+            return
+        self.sink(MetricEvent(name, value, unit, {**self.current_tags(), **tags}))
+
+    @contextmanager
+    def timer(self, name: str, **tags: object) -> Iterator[None]:
+        """Send the seconds spent inside the block"""
+        if self.sink is None:
+            yield
+            return
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.emit(name, time.perf_counter() - start, "s", **tags)
+
+    def instrument_session(self, session: "Session") -> None:
+        """Measure the new connections opened by the adapters of the session.
+        The connect time includes the DNS lookup and the TLS handshake.
+
+        It replaces the pool classes of the urllib3 pool managers, so only the
+        pools created afterwards are measured: connections of hosts already used
+        by the session are not. Pool managers without pool_classes_by_scheme (a
+        urllib3 detail) are left as they are and their connects are not measured.
+
+        Args:
+            session (Session): Session whose pools have not been used yet
+        """
+        instrumented_adapters = set()
+        for adapter in session.adapters.values():
+            pool_manager = getattr(adapter, "poolmanager", None)
+            pool_classes = getattr(pool_manager, "pool_classes_by_scheme", None)
+            if not isinstance(pool_classes, dict) or id(adapter) in instrumented_adapters:
+                continue
+            instrumented_adapters.add(id(adapter))
+            pool_manager.pool_classes_by_scheme = {
+                scheme: _timed_pool_class(pool_class, self)
+                for scheme, pool_class in pool_classes.items()
+            }
+
+
+def _timed_pool_class(pool_class: type, metrics: Metrics) -> type:
+    connection_class = getattr(pool_class, "ConnectionCls", None)
+    if connection_class is None or not hasattr(connection_class, "connect"):
+        return pool_class
+
+    def connect(connection) -> None:
+        with metrics.timer("http.connect", host=connection.host):
+            connection_class.connect(connection)
+
+    timed_connection_class = type(
+        "Timed" + connection_class.__name__, (connection_class,), {"connect": connect}
+    )
+    return type(
+        "Timed" + pool_class.__name__,
+        (pool_class,),
+        {"ConnectionCls": timed_connection_class},
+    )
+
+
+NO_METRICS = Metrics()
@@ -0,0 +1,129 @@
+from importlib.util import find_spec
+from typing import Dict, List
+
+from .web_scraping import (
+    ALL_FIELDS,
+    SPAM_POSITION_FIELDS,
+    TableTexts,
+    _CLASS_NAME_FIELDS_BY_TAG,
+    _class_matches,
+    extract_table,
+)
+
+PARSER_BACKENDS = ("auto", "selectolax", "lxml", "html.parser")
+# Only the table rows (and everything inside them) are turned into Python objects
+ROWS_STRAINER_ATTRS = {"data-expand-tablechild-item": True}
+# Fastest first. html.parser is in the standard library, so it is always there
+_AUTO_PREFERENCE = ("selectolax", "lxml", "html.parser")
+
+
+def is_parser_available(parser: str) -> bool:
+    """Check if the parser backend can be used
+
+    Args:
+        parser (str): One of "selectolax", "lxml" or "html.parser"
+
+    Returns:
+        bool: True if its library is installed
+    """
+    if parser == "html.parser":
+        return True
+    return find_spec(parser) is not None
+
+
+def resolve_parser(parser: str = "auto") -> str:
+    """Choose the parser backend
+
+    Args:
+        parser (str, optional): One of PARSER_BACKENDS. "auto" picks the fastest
+            one installed. Defaults to "auto".
+
+    Raises:
+        ValueError: The parser is not supported
+        ImportError: The library of the parser is not installed
+
+    Returns:
+        str: The parser backend that is going to be used
+    """
+    if parser not in PARSER_BACKENDS:
+        raise ValueError(
+            f"parser '{parser}' is not supported. Use one of {PARSER_BACKENDS}."
+        )
+    if parser == "auto":
+        for candidate in _AUTO_PREFERENCE:
+            if is_parser_available(candidate):
+                return candidate
+    if not is_parser_available(parser):
+        raise ImportError(f"parser '{parser}' is not installed.")
+    return parser
+
+
+def _selectolax_tree(html_text: str):
+    try:
+        from selectolax.lexbor import LexborHTMLParser as HTMLParser
+    except ImportError:  # pragma: no cover - selectolax < 0.3
+        from selectolax.parser import HTMLParser
+    return HTMLParser(html_text)
+
+
+def extract_table_selectolax(html_text: str) -> TableTexts:
+    """Same output as web_scraping.extract_table, built with selectolax
+
+    Args:
+        html_text (str): HTML page
+
+    Returns:
+        TableTexts: Texts of every field defined in constants.py
+    """
+    table: Dict[str, List[str]] = {field: [] for field in ALL_FIELDS}
+    tree = _selectolax_tree(html_text)
+    for row in tree.css("[data-expand-tablechild-item]"):
+        row_texts = {}
+        spams = []
+        elements = row.traverse()
+        next(elements)  # The row itself
+        for element in elements:
+            if element.tag == "span":
+                spams.append(element)
+
+            candidates = _CLASS_NAME_FIELDS_BY_TAG.get(element.tag)
+            if not candidates:
+                continue
+            class_attribute = element.attributes.get("class")
+            if not class_attribute:
+                continue
+            classes = class_attribute.split()
+            for field, class_name in candidates:
+                if field not in row_texts and _class_matches(classes, class_name):
+                    row_texts[field] = element.text(deep=True)
+
+        for field, spam_position in SPAM_POSITION_FIELDS.items():
+            row_texts[field] = spams[spam_position].text(deep=True)
+
+        for field, text in row_texts.items():
+            table[field].append(text)
+
+    return table
+
+
+def parse_table(
+    html_text: str, parser: str = "html.parser", partial: bool = True
+) -> TableTexts:
+    """Parse the page with the parser backend and extract the table
+
+    Args:
+        html_text (str): HTML page
+        parser (str, optional): A resolved parser backend. Defaults to "html.parser".
+        partial (bool, optional): Build only the table rows subtrees. Headers, ads,
+            scripts and maps are skipped while parsing. selectolax always builds
+            the whole tree, but it does it in C. Defaults to True.
+
+    Returns:
+        TableTexts: Texts of every field defined in constants.py
+    """
+    if parser == "selectolax":
+        return extract_table_selectolax(html_text)
+    from bs4 import BeautifulSoup, SoupStrainer
+
+    parse_only = SoupStrainer(attrs=ROWS_STRAINER_ATTRS) if partial else None
+    return extract_table(BeautifulSoup(html_text, parser, parse_only=parse_only))
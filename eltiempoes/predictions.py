@@ -0,0 +1,336 @@
+from typing import Dict, List, Optional, Tuple
+
+from .fast_extract import (
+    FastPathError,
+    extract_daily_prediction,
+    extract_detallada_prediction,
+)
+from .metrics import NO_METRICS, Metrics
+from .parsers import parse_table
+from .web_scraping import (
+    parse_daily_date,
+    parse_detallada_date,
+    parse_hour,
+    parse_percentage,
+    parse_precipitation,
+    parse_temperature,
+    parse_wind_speed,
+    get_precipitation_probabilities,
+    get_cloud_percentages,
+    get_ultraviolet_radiations,
+    get_detallada_dates,
+    get_daily_dates,
+    get_max_temperatures,
+    get_min_temperatures,
+    get_precipitations,
+    get_winds_speed,
+    get_sunrise_hours,
+    get_sunset_hours,
+)
+
+DailyPrediction = Tuple[
+    List[Tuple[int, str]],
+    List[int],
+    List[int],
+    List[float],
+    List[int],
+    List[str],
+    List[str],
+]
+DetalladaPrediction = Tuple[List[Tuple[int, str]], List[float], List[float], List[str]]
+
+
+def normalize_station_name(station_name: str) -> str:
+    """Station name as it is used in the eltiempo.es urls
+
+    Args:
+        station_name (str): Station name. For example: "Córdoba"
+
+    Returns:
+        str: Station name without accents and in lowercase. For example: "cordoba"
+    """
+    from unidecode import unidecode
+
+    return unidecode(station_name).lower()
+
+
+def parse_daily_prediction(
+    html_text: str,
+    parser: str = "html.parser",
+    partial: bool = True,
+    metrics: Optional[Metrics] = None,
+    fast_path: bool = False,
+) -> DailyPrediction:
+    """Parse the daily page
+
+    Args:
+        html_text (str): HTML of the "dias" page
+        parser (str, optional): Parser backend (see parsers.resolve_parser)
+        partial (bool, optional): Parse only the table rows (see parsers.parse_table)
+        metrics (Optional[Metrics], optional): Receives the parse and extract times
+        fast_path (bool, optional): Try the regex extractor first (see fast_extract).
+            The page is parsed with the parser when the fast path fails.
+
+    Returns:
+        DailyPrediction: (dates, max_temperature, min_temperature, precipitation,
+            wind_speed, sunrise, sunset)
+    """
+    metrics = metrics or NO_METRICS
+    if fast_path:
+        try:
+            with metrics.timer("parse", fast_path=True):
+                return extract_daily_prediction(html_text)
+        except FastPathError:
+            metrics.emit("fast_path.fallback", 1, "count")
+
+    with metrics.timer("parse"):
+        table = parse_table(html_text, parser, partial)
+
+    with metrics.timer("convert", field="date"):
+        dates = get_daily_dates(table)
+    with metrics.timer("convert", field="max_temperature"):
+        max_temperature = get_max_temperatures(table)
+    with metrics.timer("convert", field="min_temperature"):
+        min_temperature = get_min_temperatures(table)
+    with metrics.timer("convert", field="precipitation"):
+        precipitation = get_precipitations(table)
+    with metrics.timer("convert", field="wind_speed"):
+        wind_speed = get_winds_speed(table)
+    with metrics.timer("convert", field="sunrise"):
+        sunrise = get_sunrise_hours(table)
+    with metrics.timer("convert", field="sunset"):
+        sunset = get_sunset_hours(table)
+    return (
+        dates,
+        max_temperature,
+        min_temperature,
+        precipitation,
+        wind_speed,
+        sunrise,
+        sunset,
+    )
+
+
+def parse_detallada_prediction(
+    html_text: str,
+    parser: str = "html.parser",
+    partial: bool = True,
+    metrics: Optional[Metrics] = None,
+    fast_path: bool = False,
+) -> DetalladaPrediction:
+    """Parse the detallada page
+
+    Args:
+        html_text (str): HTML of the "long_detallada" page
+        parser (str, optional): Parser backend (see parsers.resolve_parser)
+        partial (bool, optional): Parse only the table rows (see parsers.parse_table)
+        metrics (Optional[Metrics], optional): Receives the parse and extract times
+        fast_path (bool, optional): Try the regex extractor first (see fast_extract).
+            The page is parsed with the parser when the fast path fails.
+
+    Returns:
+        DetalladaPrediction: (dates, precipitation_probability, cloud_percentage,
+            ultraviolet_radiation)
+    """
+    metrics = metrics or NO_METRICS
+    if fast_path:
+        try:
+            with metrics.timer("parse", fast_path=True):
+                return extract_detallada_prediction(html_text)
+        except FastPathError:
+            metrics.emit("fast_path.fallback", 1, "count")
+
+    with metrics.timer("parse"):
+        table = parse_table(html_text, parser, partial)
+
+    with metrics.timer("convert", field="date"):
+        dates = get_detallada_dates(table)
+    with metrics.timer("convert", field="precipitation_probability"):
+        precipitation_probability = get_precipitation_probabilities(table)
+    with metrics.timer("convert", field="cloud_percentage"):
+        cloud_percentage = get_cloud_percentages(table)
+    with metrics.timer("convert", field="ultraviolet_radiation"):
+        ultraviolet_radiation = get_ultraviolet_radiations(table)
+    return (
+        dates,
+        precipitation_probability,
+        cloud_percentage,
+        ultraviolet_radiation,
+    )
+
+
+def daily_prediction_to_json(prediction: DailyPrediction) -> List[Dict[str, object]]:
+    (
+        dates,
+        max_temperature,
+        min_temperature,
+        precipitation,
+        wind_speed,
+        sunrise,
+        sunset,
+    ) = prediction
+
+    daily_items_json = []
+    for index, item in enumerate(dates):
+        item_dict = {
+            "date": item,
+            "max_temperature": max_temperature[index],
+            "min_temperature": min_temperature[index],
+            "precipitation": precipitation[index],
+            "wind_speed": wind_speed[index],
+            "sunrise": sunrise[index],
+            "sunset": sunset[index],
+        }
+        daily_items_json.append(item_dict)
+
+    return daily_items_json
+
+
+def detallada_prediction_to_json(
+    prediction: DetalladaPrediction,
+) -> List[Dict[str, object]]:
+    (
+        dates,
+        precipitation_probability,
+        cloud_percentage,
+        ultraviolet_radiation,
+    ) = prediction
+
+    detallada_items_json = []
+    for index, item in enumerate(dates):
+        item_dict = {
+            "date": item,
+            "precipitation_probability": precipitation_probability[index],
+            "cloud_percentage": cloud_percentage[index],
+            "ultraviolet_radiation": ultraviolet_radiation[index],
+        }
+        detallada_items_json.append(item_dict)
+
+    return detallada_items_json
+
+
+def daily_row_to_json(row_texts: Dict[str, str]) -> Dict[str, object]:
+    """One day of the daily page from the texts of its row
+
+    Args:
+        row_texts (Dict[str, str]): Texts of the row (see web_scraping.extract_row_texts)
+
+    Returns:
+        Dict[str, object]: Same item as daily_prediction_to_json
+    """
+    return {
+        "date": parse_daily_date(row_texts["daily_date"]),
+        "max_temperature": parse_temperature(row_texts["max_temperature"]),
+        "min_temperature": parse_temperature(row_texts["min_temperature"]),
+        "precipitation": parse_precipitation(row_texts["precipitation"]),
+        "wind_speed": parse_wind_speed(row_texts["wind_speed"]),
+        "sunrise": parse_hour(row_texts["sunrise"]),
+        "sunset": parse_hour(row_texts["sunset"]),
+    }
+
+
+def detallada_row_to_json(row_texts: Dict[str, str]) -> Dict[str, object]:
+    """One day of the detallada page from the texts of its row
+
+    Args:
+        row_texts (Dict[str, str]): Texts of the row (see web_scraping.extract_row_texts)
+
+    Returns:
+        Dict[str, object]: Same item as detallada_prediction_to_json
+    """
+    return {
+        "date": parse_detallada_date(row_texts["detallada_date"]),
+        "precipitation_probability": parse_percentage(
+            row_texts["precipitation_probability"]
+        ),
+        "cloud_percentage": parse_percentage(row_texts["cloud_percentage"]),
+        "ultraviolet_radiation": row_texts["ultraviolet_radiation"],
+    }
+
+
+def hourly_row_to_json(row_texts: Dict[str, str]) -> Dict[str, object]:
+    """One hour of the por hora page from the texts of its row
+
+    Args:
+        row_texts (Dict[str, str]): Texts of the row (see web_scraping.HOURLY_CLASS_NAME_FIELDS)
+
+    Returns:
+        Dict[str, object]:
+            Dict[
+                "date": Tuple[int, str]
+                "hour": str; in the format (%hh:%mm)
+                "temperature": int; degrees Celsius
+                "precipitation": float; mm
+                "precipitation_probability": float; in percentage of one
+                "wind_speed": int; km/h
+            ]
+    """
+    return {
+        "date": parse_detallada_date(row_texts["hourly_date"]),
+        "hour": parse_hour(row_texts["hour"]),
+        "temperature": parse_temperature(row_texts["temperature"]),
+        "precipitation": parse_precipitation(row_texts["precipitation"]),
+        "precipitation_probability": parse_percentage(
+            row_texts["precipitation_probability"]
+        ),
+        "wind_speed": parse_wind_speed(row_texts["wind_speed"]),
+    }
+
+
+def all_data_to_json(
+    daily_prediction: DailyPrediction, detallada_prediction: DetalladaPrediction
+) -> List[Dict[str, object]]:
+    """Join the daily and the detallada predictions. The detallada page sometimes
+    has fewer days: the detallada fields of the missing days are None and their
+    "detallada_available" flag is False.
+
+    Args:
+        daily_prediction (DailyPrediction): Parsed daily page
+        detallada_prediction (DetalladaPrediction): Parsed detallada page
+
+    Returns:
+        List[Dict[str, object]]: One item per day with the fields of both pages
+    """
+    (
+        dates_daily,
+        max_temperature,
+        min_temperature,
+        precipitation,
+        wind_speed,
+        sunrise,
+        sunset,
+    ) = daily_prediction
+    (
+        dates_detallada,
+        precipitation_probability,
+        cloud_percentage,
+        ultraviolet_radiation,
+    ) = detallada_prediction
+
+    if not dates_daily:
+        raise Exception("It is not possible to connect with eltiempo.es.")
+
+    all_json_items = []
+    num_detallada_days = len(precipitation_probability)
+    for index, item in enumerate(dates_daily):
+        detallada_available = index < num_detallada_days
+        item_dict = {
+            "date": item,
+            "max_temperature": max_temperature[index],
+            "min_temperature": min_temperature[index],
+            "precipitation": precipitation[index],
+            "wind_speed": wind_speed[index],
+            "sunrise": sunrise[index],
+            "sunset": sunset[index],
+            "precipitation_probability": (
+                precipitation_probability[index] if detallada_available else None
+            ),
+            "cloud_percentage": cloud_percentage[index] if detallada_available else None,
+            "ultraviolet_radiation": (
+                ultraviolet_radiation[index] if detallada_available else None
+            ),
+            "detallada_available": detallada_available,
+        }
+        all_json_items.append(item_dict)
+
+    return all_json_items
@@ -0,0 +1,254 @@
+import heapq
+import itertools
+import random
+import threading
+import time
+import warnings
+from typing import (
+    TYPE_CHECKING,
+    Callable,
+    Dict,
+    Iterable,
+    List,
+    NamedTuple,
+    Optional,
+    Tuple,
+)
+
+from .changes import ForecastChange, ForecastUpdate
+from .constants import DEFAULT_REFRESH_INTERVAL, DEFAULT_REFRESH_JITTER
+from .predictions import normalize_station_name
+
+if TYPE_CHECKING:
+    from .main import ElTiempoEs
+
+
+class RefreshedForecast(NamedTuple):
+    """Last refresh of a station. update is the ForecastUpdate of refresh_forecast,
+    None when the refresh failed"""
+
+    station_name: str
+    update: Optional[ForecastUpdate]
+    error: Optional[Exception]
+    refreshed_at: float
+
+    @property
+    def ok(self) -> bool:
+        return self.error is None
+
+    @property
+    def data(self) -> Optional[List[Dict[str, object]]]:
+        return None if self.update is None else self.update.forecast
+
+    @property
+    def changed(self) -> bool:
+        return self.update is not None and self.update.changed
+
+    @property
+    def changes(self) -> List[ForecastChange]:
+        return [] if self.update is None else self.update.changes
+
+
+class ForecastRefresher:
+    """Keeps the forecasts of a set of stations fresh in the background.
+
+    Every station is refreshed once per interval. The first refreshes are spread
+    evenly over the first interval and every delay gets a random jitter, so the
+    stations (and several refreshers) do not hit the site at the same instant.
+    The refreshes go through ElTiempoEs.refresh_forecast: the pages of a station
+    are only parsed when their table rows changed, and every refresh comes with
+    the days and fields that moved. When the ttl of the forecast cache of the
+    client is longer than the interval (plus the jitter), the refreshes keep the
+    cache warm and get_all_data_in_json does not fetch the refreshed stations.
+    A shorter ttl gives a warning: the entries expire between two refreshes.
+
+    Args:
+        client (ElTiempoEs): Client used for the fetches
+        station_names (Iterable[str], optional): Stations to keep fresh
+        interval (float, optional): Seconds between two refreshes of a station
+        jitter (float, optional): Fraction of the interval added or removed at random
+        max_workers (Optional[int], optional): Stations refreshed at once.
+            Defaults to the pool_maxsize of the client.
+        on_refresh (Optional[Callable[[RefreshedForecast], None]], optional): Called
+            after every refresh, from the worker threads. Its update has the
+            ForecastUpdate with the changes.
+    """
+
+    def __init__(
+        self,
+        client: "ElTiempoEs",
+        station_names: Iterable[str] = (),
+        interval: float = DEFAULT_REFRESH_INTERVAL,
+        jitter: float = DEFAULT_REFRESH_JITTER,
+        max_workers: Optional[int] = None,
+        on_refresh: Optional[Callable[[RefreshedForecast], None]] = None,
+    ):
+        if interval <= 0:
+            raise ValueError("interval must be greater than 0.")
+        self.client = client
+        self.interval = interval
+        self.jitter = jitter
+        self.max_workers = max_workers or client.pool_maxsize
+        self.on_refresh = on_refresh
+        forecast_cache = client.forecast_cache
+        if forecast_cache is not None and forecast_cache.ttl < interval * (1 + jitter):
+            warnings.warn(
+                f"The forecast cache ttl ({forecast_cache.ttl} s) is shorter than the refresh "
+                f"interval ({interval} s), so its entries expire between two refreshes.",
+                stacklevel=2,
+            )
+        # Station name and generation of every station. An entry of the schedule
+        # is only run if it has the generation of its station, so the entries left
+        # by remove are skipped after the station is added back
+        self._stations: Dict[str, Tuple[str, int]] = {}
+        self._generations = itertools.count()
+        self._forecasts: Dict[str, RefreshedForecast] = {}
+        self._schedule: List[Tuple[float, str, int]] = []
+        self._random = random.Random()
+        self._lock = threading.Lock()
+        self._wakeup = threading.Event()
+        self._stopped = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        for station_name in station_names:
+            self.add(station_name)
+
+    def __enter__(self) -> "ForecastRefresher":
+        self.start()
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.stop()
+
+    def _delay(self) -> float:
+        return self.interval * (1 + self._random.uniform(-self.jitter, self.jitter))
+
+    def add(self, station_name: str) -> None:
+        """Keep a station fresh. It is refreshed at a random instant of the next interval"""
+        station = normalize_station_name(station_name)
+        with self._lock:
+            if station in self._stations:
+                return
+            generation = next(self._generations)
+            self._stations[station] = (station_name, generation)
+            first_refresh = time.monotonic() + self._random.uniform(0, self.interval)
+            heapq.heappush(self._schedule, (first_refresh, station, generation))
+        self._wakeup.set()
+
+    def remove(self, station_name: str) -> None:
+        station = normalize_station_name(station_name)
+        with self._lock:
+            self._stations.pop(station, None)
+            self._forecasts.pop(station, None)
+            self._schedule = [entry for entry in self._schedule if entry[1] != station]
+            heapq.heapify(self._schedule)
+
+    def stations(self) -> List[str]:
+        with self._lock:
+            return [station_name for station_name, _ in self._stations.values()]
+
+    def _is_current(self, station: str, generation: int) -> bool:
+        current = self._stations.get(station)
+        return current is not None and current[1] == generation
+
+    def _stagger(self) -> None:
+        """Spread the first refreshes evenly over the first interval"""
+        with self._lock:
+            start = time.monotonic()
+            entries = [entry[1:] for entry in sorted(self._schedule)]
+            step = self.interval / max(1, len(entries))
+            self._schedule = [
+                (
+                    start + index * step + self._random.uniform(0, step * self.jitter),
+                    station,
+                    generation,
+                )
+                for index, (station, generation) in enumerate(entries)
+            ]
+            heapq.heapify(self._schedule)
+
+    def start(self) -> None:
+        """Start the refreshes in a background thread"""
+        if self._thread is not None:
+            return
+        self._stopped.clear()
+        self._stagger()
+        self._thread = threading.Thread(
+            target=self._run, name="ForecastRefresher", daemon=True
+        )
+        self._thread.start()
+
+    def stop(self, wait: bool = True) -> None:
+        """Stop the refreshes. The ones in progress are finished if wait"""
+        self._stopped.set()
+        self._wakeup.set()
+        if self._thread is not None and wait:
+            self._thread.join()
+        self._thread = None
+
+    def _run(self) -> None:
+        from concurrent.futures import ThreadPoolExecutor
+
+        executor = ThreadPoolExecutor(
+            max_workers=self.max_workers, thread_name_prefix="ForecastRefresher"
+        )
+        try:
+            while not self._stopped.is_set():
+                with self._lock:
+                    next_refresh = self._schedule[0][0] if self._schedule else None
+                    due = next_refresh is not None and next_refresh <= time.monotonic()
+                    entry = heapq.heappop(self._schedule) if due else None
+                    self._wakeup.clear()
+                if entry is None:
+                    timeout = None if next_refresh is None else next_refresh - time.monotonic()
+                    self._wakeup.wait(timeout)
+                elif self._is_current(*entry[1:]):
+                    executor.submit(self._refresh, *entry[1:])
+        finally:
+            executor.shutdown(wait=True)
+
+    def _refresh(self, station: str, generation: int) -> RefreshedForecast:
+        station_name = self._stations.get(station, (station, generation))[0]
+        try:
+            update, error = self.client.refresh_forecast(station_name), None
+        except Exception as exception:
+            update, error = None, exception
+        refreshed = RefreshedForecast(station_name, update, error, time.time())
+
+        with self._lock:
+            if self._is_current(station, generation):
+                # The next refresh is scheduled once this one is finished,
+                # so a slow station is never refreshed twice at once
+                self._forecasts[station] = refreshed
+                heapq.heappush(
+                    self._schedule,
+                    (time.monotonic() + self._delay(), station, generation),
+                )
+        self._wakeup.set()
+        if self.on_refresh is not None:
+            self.on_refresh(refreshed)
+        return refreshed
+
+    def get(self, station_name: str) -> List[Dict[str, object]]:
+        """Last forecast of the station. It is fetched now if it was never refreshed
+
+        Args:
+            station_name (str): Station name
+
+        Raises:
+            Exception: The last refresh of the station failed
+
+        Returns:
+            List[Dict[str, object]]: Same items as ElTiempoEs.get_all_data_in_json
+        """
+        station = normalize_station_name(station_name)
+        with self._lock:
+            refreshed = self._forecasts.get(station)
+        if refreshed is None:
+            return self.client.get_all_data_in_json(station_name)
+        if refreshed.error is not None:
+            raise refreshed.error
+        return [dict(item) for item in refreshed.data]
+
+    def last_refresh(self, station_name: str) -> Optional[RefreshedForecast]:
+        with self._lock:
+            return self._forecasts.get(normalize_station_name(station_name))
@@ -0,0 +1,148 @@
+from collections import deque
+from html.parser import HTMLParser
+from typing import Deque, Dict, Iterable, Iterator, List, Optional, Tuple
+
+from .web_scraping import (
+    CLASS_NAME_FIELDS,
+    SPAM_POSITION_FIELDS,
+    _class_matches,
+    class_name_fields_by_tag,
+)
+
+ROW_ATTRIBUTE = "data-expand-tablechild-item"
+# Elements without end tag. They are never pushed to the stack of open tags
+VOID_ELEMENTS = {
+    "area", "base", "br", "col", "embed", "hr", "img", "input",
+    "link", "meta", "param", "source", "track", "wbr",
+}
+
+
+class RowStreamParser(HTMLParser):
+    """Incremental event based parser of the forecast table.
+
+    Feed it the page in chunks. Every time a row closes, the texts of its fields
+    (same keys and values as web_scraping.extract_row_texts) are queued in rows.
+
+    Args:
+        class_name_fields (Dict[str, Dict[str, str]], optional): Fields found with the
+            tag and the class name. Defaults to the daily and detallada fields.
+        spam_position_fields (Dict[str, int], optional): Fields found with the position
+            of the spam tag. Defaults to the detallada fields.
+    """
+
+    def __init__(
+        self,
+        class_name_fields: Dict[str, Dict[str, str]] = CLASS_NAME_FIELDS,
+        spam_position_fields: Dict[str, int] = SPAM_POSITION_FIELDS,
+    ):
+        super().__init__(convert_charrefs=True)
+        self._fields_by_tag = class_name_fields_by_tag(class_name_fields)
+        self._fields_by_spam_position = {
+            spam_position: field for field, spam_position in spam_position_fields.items()
+        }
+        self.rows: Deque[Dict[str, str]] = deque()
+        # Open tags inside the current row with the fields captured by each one
+        self._open_tags: List[Tuple[str, List[str]]] = []
+        self._row_texts: Dict[str, str] = {}
+        self._captures: Dict[str, List[str]] = {}
+        self._num_spams = 0
+
+    @property
+    def in_row(self) -> bool:
+        return bool(self._open_tags)
+
+    def handle_starttag(self, tag: str, attrs: List[Tuple[str, Optional[str]]]) -> None:
+        if not self.in_row:
+            if any(name == ROW_ATTRIBUTE for name, _ in attrs):
+                self._open_tags.append((tag, []))
+                self._row_texts = {}
+                self._captures = {}
+                self._num_spams = 0
+            return
+        if tag in VOID_ELEMENTS:
+            return
+
+        captured_fields = []
+        if tag == "span":
+            field = self._fields_by_spam_position.get(self._num_spams)
+            if field is not None:
+                captured_fields.append(field)
+            self._num_spams += 1
+
+        candidates = self._fields_by_tag.get(tag)
+        if candidates:
+            class_attribute = dict(attrs).get("class")
+            if class_attribute:
+                classes = class_attribute.split()
+                for field, class_name in candidates:
+                    if (
+                        field not in self._row_texts
+                        and field not in self._captures
+                        and _class_matches(classes, class_name)
+                    ):
+                        captured_fields.append(field)
+
+        for field in captured_fields:
+            self._captures[field] = []
+        self._open_tags.append((tag, captured_fields))
+
+    def handle_startendtag(self, tag: str, attrs: List[Tuple[str, Optional[str]]]) -> None:
+        # <tag/> has no content: nothing to capture and nothing to close
+        if self.in_row and tag == "span":
+            self._num_spams += 1
+
+    def handle_endtag(self, tag: str) -> None:
+        if not self.in_row or tag in VOID_ELEMENTS:
+            return
+        if all(open_tag != tag for open_tag, _ in self._open_tags):
+            # Stray end tag
+            return
+        while self._open_tags:
+            open_tag, captured_fields = self._open_tags.pop()
+            for field in captured_fields:
+                self._row_texts[field] = "".join(self._captures.pop(field))
+            if open_tag == tag:
+                break
+
+        if not self._open_tags:
+            self.rows.append(self._row_texts)
+
+    def handle_data(self, data: str) -> None:
+        for capture in self._captures.values():
+            capture.append(data)
+
+
+def iter_table_rows(
+    chunks: Iterable[str],
+    max_rows: Optional[int] = None,
+    class_name_fields: Dict[str, Dict[str, str]] = CLASS_NAME_FIELDS,
+    spam_position_fields: Dict[str, int] = SPAM_POSITION_FIELDS,
+) -> Iterator[Dict[str, str]]:
+    """Parse the page while it is read and yield every row as soon as it closes
+
+    Args:
+        chunks (Iterable[str]): Text of the page in chunks, for example
+            response.iter_content(decode_unicode=True)
+        max_rows (Optional[int], optional): Stop reading the chunks after this
+            number of rows. Defaults to all the rows.
+        class_name_fields (Dict[str, Dict[str, str]], optional): See RowStreamParser
+        spam_position_fields (Dict[str, int], optional): See RowStreamParser
+
+    Yields:
+        Iterator[Dict[str, str]]: Texts of the fields of every row
+    """
+    parser = RowStreamParser(class_name_fields, spam_position_fields)
+    num_rows = 0
+    for chunk in chunks:
+        parser.feed(chunk)
+        while parser.rows:
+            yield parser.rows.popleft()
+            num_rows += 1
+            if max_rows is not None and num_rows >= max_rows:
+                return
+    parser.close()
+    while parser.rows:
+        yield parser.rows.popleft()
+        num_rows += 1
+        if max_rows is not None and num_rows >= max_rows:
+            return
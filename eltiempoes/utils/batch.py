@@ -0,0 +1,68 @@
+# -*- coding: utf-8 -*-
+
+from itertools import islice
+from typing import TYPE_CHECKING, Callable, Dict, Iterable, Iterator, Optional, Tuple, TypeVar
+
+if TYPE_CHECKING:
+    from concurrent.futures import Future
+
+Item = TypeVar("Item")
+Result = TypeVar("Result")
+
+
+def run_concurrently(
+    function: Callable[[Item], Result],
+    items: Iterable[Item],
+    max_workers: int,
+    max_pending: Optional[int] = None,
+) -> Iterator[Tuple[Item, Optional[Result], Optional[Exception]]]:
+    """Run the function over the items in a thread pool and yield as they complete.
+
+    The items are consumed lazily, so no more than max_pending calls are
+    submitted at once and the input can be an endless iterator.
+
+    Args:
+        function (Callable[[Item], Result]): Function called with every item
+        items (Iterable[Item]): Items to process
+        max_workers (int): Number of threads
+        max_pending (Optional[int], optional): Calls submitted but not yielded yet.
+            Defaults to twice max_workers.
+
+    Yields:
+        Iterator[Tuple[Item, Optional[Result], Optional[Exception]]]: (item, result, error)
+            error is None when the call succeeded
+
+    Raises:
+        ValueError: max_workers or max_pending is lower than 1
+    """
+    from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+
+    if max_workers < 1:
+        raise ValueError("max_workers must be greater than 0.")
+    if max_pending is None:
+        max_pending = 2 * max_workers
+    elif max_pending < 1:
+        raise ValueError("max_pending must be greater than 0.")
+    items_iterator = iter(items)
+    executor = ThreadPoolExecutor(max_workers=max_workers)
+    pending: Dict["Future", Item] = {}
+    try:
+        for item in islice(items_iterator, max_pending):
+            pending[executor.submit(function, item)] = item
+
+        while pending:
+            done, _ = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                item = pending.pop(future)
+                error = future.exception()
+                if error is None:
+                    yield item, future.result(), None
+                else:
+                    yield item, None, error
+
+            for item in islice(items_iterator, max_pending - len(pending)):
+                pending[executor.submit(function, item)] = item
+    finally:
+        for future in pending:
+            future.cancel()
+        executor.shutdown(wait=True)
@@ -1,8 +1,9 @@
 # -*- coding: utf-8 -*-
 
-from typing import Literal
+from datetime import date
+from typing import Dict, Literal, Optional, Union
 
-from eltiempoes.constants import MAIN_URL, DIAS_FLAG, DETALLADA_FLAG, LONG_DETALLADA_FLAG, POR_HORA_FLAG, SEARCH_URL
+from eltiempoes.constants import MAIN_URL, DIAS_FLAG, DETALLADA_FLAG, LONG_DETALLADA_FLAG, POR_HORA_FLAG, SEARCH_URL, CURRENT_CONDITIONS_URL, MAPS_URL
 
 # https://www.eltiempo.es/api/weatherapi/search?q=cordoba&lim=100&country=es
 # https://www.eltiempo.es/cordoba.html
@@ -31,3 +32,69 @@ def create_prediction_url(
 def create_search_url(name: str, lim: int = 100, country: str = "es") -> str:
     url = f"{SEARCH_URL}?q={name}&lim={lim}&contry={country}"
     return url
+
+
+def get_pelmorex_id(station: Union[str, Dict[str, object]]) -> str:
+    """pelmorex_id of a station returned by search_location, or the id itself
+
+    Raises:
+        ValueError: The station has no pelmorex_id
+    """
+    if isinstance(station, dict):
+        pelmorex_id = station.get("pelmorex_id")
+        if not pelmorex_id:
+            raise ValueError(f"The station {station.get('id')!r} has no pelmorex_id.")
+        return str(pelmorex_id)
+    return station
+
+
+def create_current_conditions_url(pelmorex_id: str) -> str:
+    return f"{CURRENT_CONDITIONS_URL}{pelmorex_id}"
+
+
+def create_maps_url(
+    day: Optional[Union[date, str]] = None,
+    hour: int = 1,
+    principal: str = "es",
+    navigator: str = "desktop",
+) -> str:
+    """Url of the map data of a whole country at a day and hour
+
+    Args:
+        day (Optional[Union[date, str]], optional): Day, as a date or "YYYYMMDD".
+            Defaults to today.
+        hour (int, optional): Hour of the map, as the site numbers it. Defaults to 1.
+        principal (str, optional): Country of the map. Defaults to "es".
+        navigator (str, optional): Version of the site. Defaults to "desktop".
+
+    Returns:
+        str: ajax-maps-v2 url
+    """
+    if day is None:
+        day = date.today()
+    if isinstance(day, date):
+        day = day.strftime("%Y%m%d")
+    return f"{MAPS_URL}?principal={principal}&navigator={navigator}&day={day}&hour={hour}"
+
+
+def get_url_endpoint(url: str) -> str:
+    """Endpoint of an eltiempo.es url: "search", "current_conditions", "maps",
+    "detallada", "por_hora" or "dias"
+
+    Args:
+        url (str): Url created with one of the functions of this module
+
+    Returns:
+        str: Endpoint name, used for example to choose the cache TTL
+    """
+    if url.startswith(SEARCH_URL):
+        return "search"
+    elif url.startswith(CURRENT_CONDITIONS_URL):
+        return "current_conditions"
+    elif url.startswith(MAPS_URL):
+        return "maps"
+    elif f"?v={DETALLADA_FLAG}" in url:
+        return "detallada"
+    elif f"?v={POR_HORA_FLAG}" in url:
+        return "por_hora"
+    return "dias"
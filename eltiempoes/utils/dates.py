@@ -0,0 +1,64 @@
+# -*- coding: utf-8 -*-
+
+from datetime import date
+from typing import Optional
+
+# First three letters of the month in Spanish and English
+MONTHS = {
+    "ene": 1, "jan": 1,
+    "feb": 2,
+    "mar": 3,
+    "abr": 4, "apr": 4,
+    "may": 5,
+    "jun": 6,
+    "jul": 7,
+    "ago": 8, "aug": 8,
+    "sep": 9, "set": 9,
+    "oct": 10,
+    "nov": 11,
+    "dic": 12, "dec": 12,
+}
+
+
+def month_number(month: str) -> int:
+    """Number of a month name like "Oct", "oct." or "Octubre"
+
+    Args:
+        month (str): Month name or abbreviation
+
+    Raises:
+        ValueError: It is not a month
+
+    Returns:
+        int: Month number, from 1 to 12
+    """
+    from unidecode import unidecode
+
+    key = unidecode(month).strip(" .").lower()[:3]
+    if key not in MONTHS:
+        raise ValueError(f"'{month}' is not a month.")
+    return MONTHS[key]
+
+
+def resolve_forecast_date(day: int, month: str, reference: Optional[date] = None) -> date:
+    """Full date of a (day, month) forecast date. The year is the one that puts the
+    date closest to the reference, so forecasts across new year get the right one.
+
+    Args:
+        day (int): Day of the month
+        month (str): Month name or abbreviation, like "Oct"
+        reference (Optional[date], optional): Date the forecast was fetched. Defaults to today.
+
+    Returns:
+        date: Date of the forecast
+    """
+    reference = reference or date.today()
+    number = month_number(month)
+    candidates = []
+    for year in (reference.year - 1, reference.year, reference.year + 1):
+        try:
+            candidates.append(date(year, number, day))
+        except ValueError:
+            # 29 Feb of a non leap year
+            continue
+    return min(candidates, key=lambda candidate: abs(candidate - reference))
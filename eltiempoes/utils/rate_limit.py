@@ -0,0 +1,45 @@
+# -*- coding: utf-8 -*-
+
+import threading
+import time
+from typing import Dict, Tuple
+from urllib.parse import urlsplit
+
+
+class HostRateLimiter:
+    """Token bucket per host. Thread safe.
+
+    Args:
+        rate (float): Maximum requests per second to the same host.
+        burst (int, optional): Requests allowed at once before throttling. Defaults to 1.
+    """
+
+    def __init__(self, rate: float, burst: int = 1):
+        if rate <= 0:
+            raise ValueError("rate must be greater than 0.")
+        self.rate = rate
+        self.burst = max(1, burst)
+        self._buckets: Dict[str, Tuple[float, float]] = {}
+        self._lock = threading.Lock()
+
+    def _reserve(self, host: str) -> float:
+        """Take a token for the host and return the seconds to wait for it"""
+        with self._lock:
+            now = time.monotonic()
+            tokens, updated_at = self._buckets.get(host, (self.burst, now))
+            tokens = min(self.burst, tokens + (now - updated_at) * self.rate)
+            tokens -= 1
+            self._buckets[host] = (tokens, now)
+        if tokens >= 0:
+            return 0.0
+        return -tokens / self.rate
+
+    def acquire(self, url: str) -> None:
+        """Block until a request to the host of the url is allowed
+
+        Args:
+            url (str): Url that is going to be requested
+        """
+        wait = self._reserve(urlsplit(url).netloc)
+        if wait > 0:
+            time.sleep(wait)
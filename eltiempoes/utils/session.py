@@ -0,0 +1,44 @@
+# -*- coding: utf-8 -*-
+
+from typing import TYPE_CHECKING
+
+from eltiempoes.constants import (
+    DEFAULT_POOL_CONNECTIONS,
+    DEFAULT_POOL_MAXSIZE,
+    DEFAULT_MAX_RETRIES,
+)
+
+if TYPE_CHECKING:
+    from requests import Session
+
+
+def create_session(
+    pool_connections: int = DEFAULT_POOL_CONNECTIONS,
+    pool_maxsize: int = DEFAULT_POOL_MAXSIZE,
+    max_retries: int = DEFAULT_MAX_RETRIES,
+    keep_alive: bool = True,
+) -> "Session":
+    """Create a connection-pooled session for eltiempo.es
+
+    Args:
+        pool_connections (int, optional): Number of host pools to cache.
+        pool_maxsize (int, optional): Maximum connections kept open per host.
+        max_retries (int, optional): Retries on connection errors.
+        keep_alive (bool, optional): Keep the connections open between requests.
+
+    Returns:
+        Session: Session with an HTTPAdapter mounted for http and https
+    """
+    from requests import Session
+    from requests.adapters import HTTPAdapter
+
+    session = Session()
+    adapter = HTTPAdapter(
+        pool_connections=pool_connections,
+        pool_maxsize=pool_maxsize,
+        max_retries=max_retries,
+    )
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    session.headers["Connection"] = "keep-alive" if keep_alive else "close"
+    return session
@@ -0,0 +1,65 @@
+# -*- coding: utf-8 -*-
+
+import threading
+from typing import Callable, Dict, Hashable, Optional, Tuple, TypeVar
+
+Result = TypeVar("Result")
+
+
+class _Call:
+    __slots__ = ("done", "result", "error")
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.result: object = None
+        self.error: Optional[BaseException] = None
+
+
+class SingleFlight:
+    """Run a function only once per key at a time. Thread safe.
+
+    Callers asking for a key while its call is in flight wait for it and get
+    the same result, or the same error, instead of calling the function again.
+    """
+
+    def __init__(self):
+        self._calls: Dict[Hashable, _Call] = {}
+        self._lock = threading.Lock()
+
+    def do(self, key: Hashable, function: Callable[[], Result]) -> Tuple[Result, bool]:
+        """Call the function, or wait for the call in flight of the key
+
+        Args:
+            key (Hashable): Calls with the same key are shared
+            function (Callable[[], Result]): Function called if the key is not in flight
+
+        Returns:
+            Tuple[Result, bool]: (result, shared). shared is True when the result
+                comes from the call of another caller
+        """
+        with self._lock:
+            call = self._calls.get(key)
+            is_leader = call is None
+            if is_leader:
+                call = self._calls[key] = _Call()
+
+        if not is_leader:
+            call.done.wait()
+            if call.error is not None:
+                raise call.error
+            return call.result, True
+
+        try:
+            call.result = function()
+        except BaseException as error:
+            call.error = error
+            raise
+        finally:
+            with self._lock:
+                del self._calls[key]
+            call.done.set()
+        return call.result, False
+
+    def in_flight(self) -> int:
+        with self._lock:
+            return len(self._calls)
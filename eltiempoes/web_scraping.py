@@ -1,5 +1,4 @@
-from sqlite3 import DataError
-from typing import List, Tuple 
+from typing import TYPE_CHECKING, Dict, List, Tuple, Union
 
 from .constants import (
     DETALLADA_DATES_TAG,
@@ -13,12 +12,71 @@ from .constants import (
     WIND_SPEED_TAG,
     SUNRISE_TAG,
     SUNSET_TAG,
+    HOURLY_DATE_TAG,
+    HOURLY_HOUR_TAG,
+    HOURLY_TEMP_TAG,
+    HOURLY_PRECIPITATION_TAG,
+    HOURLY_PRECIPITATION_PROBABILITY_TAG,
+    HOURLY_WIND_SPEED_TAG,
 )
 
-from bs4 import BeautifulSoup, ResultSet
+if TYPE_CHECKING:
+    from bs4 import BeautifulSoup, Tag
+
+# Fields found with the tag and the class name inside every row
+CLASS_NAME_FIELDS = {
+    "detallada_date": DETALLADA_DATES_TAG,
+    "daily_date": DAILY_DATES_TAG,
+    "max_temperature": MAX_TEMP_TAG,
+    "min_temperature": MIN_TEMP_TAG,
+    "precipitation": PRECIPITATION_TAG,
+    "wind_speed": WIND_SPEED_TAG,
+    "sunrise": SUNRISE_TAG,
+    "sunset": SUNSET_TAG,
+}
+# Fields found with the position of the spam tag inside every row
+SPAM_POSITION_FIELDS = {
+    "precipitation_probability": PRECIPITATION_PROBABILITY_SPAM_POSITION,
+    "cloud_percentage": CLOUD_PERCENTAGE_SPAM_POSITION,
+    "ultraviolet_radiation": ULTRAVIOLET_SPAM_POSITION,
+}
+ALL_FIELDS = list(CLASS_NAME_FIELDS) + list(SPAM_POSITION_FIELDS)
+
+# Fields of the por hora page
+HOURLY_CLASS_NAME_FIELDS = {
+    "hourly_date": HOURLY_DATE_TAG,
+    "hour": HOURLY_HOUR_TAG,
+    "temperature": HOURLY_TEMP_TAG,
+    "precipitation": HOURLY_PRECIPITATION_TAG,
+    "precipitation_probability": HOURLY_PRECIPITATION_PROBABILITY_TAG,
+    "wind_speed": HOURLY_WIND_SPEED_TAG,
+}
+
+# Raw texts of every field, one item per row
+TableTexts = Dict[str, List[str]]
+
+
+def class_name_fields_by_tag(
+    class_name_fields: Dict[str, Dict[str, str]]
+) -> Dict[str, List[Tuple[str, str]]]:
+    """GROUP THE FIELDS BY TAG NAME, SO EVERY ELEMENT IS ONLY COMPARED WITH ITS CANDIDATES
+
+    Args:
+        class_name_fields (Dict[str, Dict[str, str]]): FIELD NAME AND ITS TAG
+
+    Returns:
+        Dict[str, List[Tuple[str, str]]]: TAG NAME AND ITS (FIELD NAME, CLASS NAME)
+    """
+    fields_by_tag: Dict[str, List[Tuple[str, str]]] = {}
+    for field, tag in class_name_fields.items():
+        fields_by_tag.setdefault(tag["type"], []).append((field, tag["class_name"]))
+    return fields_by_tag
+
+
+_CLASS_NAME_FIELDS_BY_TAG = class_name_fields_by_tag(CLASS_NAME_FIELDS)
 
 
-def get_all_rows_table(html_text: BeautifulSoup):
+def get_all_rows_table(html_text: "BeautifulSoup"):
     """GET ALL THE TABLE ROWS IN THE WEB PAGE
 
     Args:
@@ -31,8 +89,72 @@ def get_all_rows_table(html_text: BeautifulSoup):
     return rows_table_soup
 
 
+def _class_matches(classes: List[str], class_name: str) -> bool:
+    # Same rule as BeautifulSoup: one of the classes or the whole class attribute
+    return class_name in classes or class_name == " ".join(classes)
+
+
+def extract_row_texts(row: "Tag") -> Dict[str, str]:
+    """EXTRACT THE TEXT OF EVERY FIELD OF A ROW WALKING IT ONLY ONCE
+
+    Args:
+        row (Tag): TABLE ROW
+
+    Raises:
+        IndexError: THE ROW HAS FEWER SPAM TAGS THAN THE SPAM POSITION FIELDS NEED
+
+    Returns:
+        Dict[str, str]: TEXT OF EVERY FIELD FOUND IN THE ROW
+    """
+    row_texts = {}
+    spams = []
+    for element in row.find_all(True):
+        if element.name == "span":
+            spams.append(element)
+
+        candidates = _CLASS_NAME_FIELDS_BY_TAG.get(element.name)
+        if not candidates:
+            continue
+        classes = element.get("class")
+        if not classes:
+            continue
+        for field, class_name in candidates:
+            if field not in row_texts and _class_matches(classes, class_name):
+                row_texts[field] = element.text
+
+    # A missing spam would move the values of the next rows, so it raises
+    # like find_text_with_spam_position
+    for field, spam_position in SPAM_POSITION_FIELDS.items():
+        row_texts[field] = spams[spam_position].text
+
+    return row_texts
+
+
+def extract_table(html_text: "BeautifulSoup") -> TableTexts:
+    """EXTRACT ALL THE FIELDS OF THE TABLE IN ONE PASS OVER THE ROWS
+
+    Args:
+        html_text (BeautifulSoup): HTML PAGE
+
+    Returns:
+        TableTexts: TEXTS OF EVERY FIELD DEFINED IN constants.py
+    """
+    table = {field: [] for field in ALL_FIELDS}
+    for row in get_all_rows_table(html_text):
+        for field, text in extract_row_texts(row).items():
+            table[field].append(text)
+
+    return table
+
+
+def _table_texts(html_text: Union["BeautifulSoup", TableTexts]) -> TableTexts:
+    if isinstance(html_text, dict):
+        return html_text
+    return extract_table(html_text)
+
+
 def find_text_with_class_name(
-    html_text: BeautifulSoup,
+    html_text: "BeautifulSoup",
     tag: str,
     class_name: str,
 ):
@@ -57,7 +179,7 @@ def find_text_with_class_name(
 
 
 def find_text_with_spam_position(
-    html_text: BeautifulSoup,
+    html_text: "BeautifulSoup",
     spam_position: int,
 ):
     """FIND TEXT USING THE SPAM POSITION INSIDE THE ROW
@@ -79,184 +201,177 @@ def find_text_with_spam_position(
 
     return items
 
-def get_detallada_dates(html_text: BeautifulSoup) ->List[Tuple[int, str]]:
+
+def parse_detallada_date(date: str) -> Tuple[int, str]:
+    date_split = date.split()
+    return int(date_split[1]), date_split[2]
+
+
+def parse_daily_date(date: str) -> Tuple[int, str]:
+    date_split = date.split()
+    return int(date_split[0]), date_split[1]
+
+
+def parse_percentage(percentage: str) -> float:
+    return float(percentage.split()[0][:-1]) / 100
+
+
+def parse_temperature(temperature: str) -> int:
+    return int(temperature.split()[0][:-1])
+
+
+def parse_precipitation(precipitation: str) -> float:
+    return float(precipitation.split()[1])
+
+
+def parse_wind_speed(wind_speed: str) -> int:
+    return int(wind_speed.split()[1])
+
+
+def parse_hour(hour: str) -> str:
+    return hour.split()[0]
+
+
+def get_detallada_dates(html_text: Union["BeautifulSoup", TableTexts]) -> List[Tuple[int, str]]:
     """DATES FROM THE DETALLADA PAGE
 
     Args:
-        html_text (BeautifulSoup): HTML PAGE
+        html_text (Union["BeautifulSoup", TableTexts]): HTML PAGE OR ITS EXTRACTED TABLE
 
     Returns:
         List[Tuple[int, str]]: DATES WITH THE FORMAT (%dd, %Month)
             %Month is an str like (Jan, Feb ...) 
     """
-    dates = find_text_with_class_name(
-        html_text, DETALLADA_DATES_TAG["type"], DETALLADA_DATES_TAG["class_name"]
-    )
-    dates_fixed = [(int(date.split()[1]), date.split()[2]) for date in dates]
+    dates = _table_texts(html_text)["detallada_date"]
+    return [parse_detallada_date(date) for date in dates]
 
-    return dates_fixed
 
-def get_precipitation_probabilities(html_text: BeautifulSoup) -> List[float]:
+def get_precipitation_probabilities(html_text: Union["BeautifulSoup", TableTexts]) -> List[float]:
     """Get the precipitation porbabilities in percentages of one
 
     Args:
-        html_text (BeautifulSoup): HTML page
+        html_text (Union["BeautifulSoup", TableTexts]): HTML page or its extracted table
 
     Returns:
         List[float]: List with all the precipitation porbabilities in percentages of one
     """
-    precipitation_probabilities = find_text_with_spam_position(
-        html_text, PRECIPITATION_PROBABILITY_SPAM_POSITION
-    )
-    
-    precipitation_probabilities_fixed = [float(precipitation_probability.split()[0][:-1])/100 for precipitation_probability in precipitation_probabilities]
-    return precipitation_probabilities_fixed
+    precipitation_probabilities = _table_texts(html_text)["precipitation_probability"]
+    return [parse_percentage(precipitation_probability) for precipitation_probability in precipitation_probabilities]
 
 
-def get_cloud_percentages(html_text: BeautifulSoup) -> List[float]:
+def get_cloud_percentages(html_text: Union["BeautifulSoup", TableTexts]) -> List[float]:
     """Get percentage of clouds in percentages of one
 
     Args:
-        html_text (BeautifulSoup): html page
+        html_text (Union["BeautifulSoup", TableTexts]): html page or its extracted table
 
     Returns:
         List[float]: Percentage of clouds in percentages of one
  
     """
-    cloud_percentages = find_text_with_spam_position(
-        html_text, CLOUD_PERCENTAGE_SPAM_POSITION
-    )
-    cloud_percentages_fixed = [float(cloud_percentage.split()[0][:-1])/100 for cloud_percentage in cloud_percentages]
-
-    return cloud_percentages_fixed
+    cloud_percentages = _table_texts(html_text)["cloud_percentage"]
+    return [parse_percentage(cloud_percentage) for cloud_percentage in cloud_percentages]
 
 
-def get_ultraviolet_radiations(html_text: BeautifulSoup) -> List[str]:
+def get_ultraviolet_radiations(html_text: Union["BeautifulSoup", TableTexts]) -> List[str]:
     """Get ultraviolet radiation 
 
     Args:
-        html_text (BeautifulSoup): html page
+        html_text (Union["BeautifulSoup", TableTexts]): html page or its extracted table
 
     Returns:
         List[str]: List of texts with differents radiation types, like ('Muy alta' ...)
     """
-    ultraviolet_radiation = find_text_with_spam_position(
-        html_text, ULTRAVIOLET_SPAM_POSITION
-    )
-
-    return ultraviolet_radiation
+    return list(_table_texts(html_text)["ultraviolet_radiation"])
 
 
-
-def get_daily_dates(html_text: BeautifulSoup) -> List[Tuple[int, str]]:
+def get_daily_dates(html_text: Union["BeautifulSoup", TableTexts]) -> List[Tuple[int, str]]:
     """DATES FROM THE DAILY PAGE
 
     Args:
-        html_text (BeautifulSoup): HTML PAGE
+        html_text (Union["BeautifulSoup", TableTexts]): HTML PAGE OR ITS EXTRACTED TABLE
 
     Returns:
         List[Tuple[int, str]]: DATES WITH THE FORMAT (%dd, %Month)
             %Month is an str like (Jan, Feb ...) 
     """
-    dates = find_text_with_class_name(
-        html_text, DAILY_DATES_TAG["type"], DAILY_DATES_TAG["class_name"]
-    )
-    
-    dates_fixed = [(int(date.split()[0]), date.split()[1]) for date in dates]
-        
-    return dates_fixed
+    dates = _table_texts(html_text)["daily_date"]
+    return [parse_daily_date(date) for date in dates]
 
 
-def get_max_temperatures(html_text: BeautifulSoup) -> List[int]:
+def get_max_temperatures(html_text: Union["BeautifulSoup", TableTexts]) -> List[int]:
     """Get max day temperature
 
     Args:
-        html_text (BeautifulSoup): html page
+        html_text (Union["BeautifulSoup", TableTexts]): html page or its extracted table
 
     Returns:
         List[int]: List of max day temperature in degree Celsius
     """
-    max_temperatures = find_text_with_class_name(
-        html_text, MAX_TEMP_TAG["type"], MAX_TEMP_TAG["class_name"]
-    )
-    
-    max_temperatures_fixed = [int(max_temperature.split()[0][:-1]) for max_temperature in max_temperatures]
-    return max_temperatures_fixed
+    max_temperatures = _table_texts(html_text)["max_temperature"]
+    return [parse_temperature(max_temperature) for max_temperature in max_temperatures]
 
 
-def get_min_temperatures(html_text: BeautifulSoup) -> List[int]:
+def get_min_temperatures(html_text: Union["BeautifulSoup", TableTexts]) -> List[int]:
     """Get min day temperature
 
     Args:
-        html_text (BeautifulSoup): html page
+        html_text (Union["BeautifulSoup", TableTexts]): html page or its extracted table
 
     Returns:
         List[int]: List of min day temperature in degree Celsius
     """
-    min_temperatures = find_text_with_class_name(
-        html_text, MIN_TEMP_TAG["type"], MIN_TEMP_TAG["class_name"]
-    )
-     
-    min_temperatures_fixed = [int(min_temperature.split()[0][:-1]) for min_temperature in min_temperatures]
-    return min_temperatures_fixed
+    min_temperatures = _table_texts(html_text)["min_temperature"]
+    return [parse_temperature(min_temperature) for min_temperature in min_temperatures]
 
 
-def get_precipitations(html_text: BeautifulSoup) -> List[float]:
+def get_precipitations(html_text: Union["BeautifulSoup", TableTexts]) -> List[float]:
     """Get the precipitiation 
 
     Args:
-        html_text (BeautifulSoup): html page
+        html_text (Union["BeautifulSoup", TableTexts]): html page or its extracted table
 
     Returns:
         List[float]: Water precipitation sheet in millimetres
     """
-
-    precipitations = find_text_with_class_name(
-        html_text, PRECIPITATION_TAG["type"], PRECIPITATION_TAG["class_name"]
-    )
-
-    precipitations_fixed = [float(precipitation.split()[1]) for precipitation in precipitations]
-    return precipitations_fixed
+    precipitations = _table_texts(html_text)["precipitation"]
+    return [parse_precipitation(precipitation) for precipitation in precipitations]
 
 
-def get_winds_speed(html_text: BeautifulSoup) -> List[int]:
+def get_winds_speed(html_text: Union["BeautifulSoup", TableTexts]) -> List[int]:
     """Get the wind speed
 
     Args:
-        html_text (BeautifulSoup): html page
+        html_text (Union["BeautifulSoup", TableTexts]): html page or its extracted table
 
     Returns:
         List[int]: Wind speed in km/h
     """
-    winds_speed = find_text_with_class_name(
-        html_text, WIND_SPEED_TAG["type"], WIND_SPEED_TAG["class_name"]
-    )
-    
-    wind_speed_fixed = [int(wind_speed.split()[1]) for wind_speed in winds_speed]
-    return wind_speed_fixed
+    winds_speed = _table_texts(html_text)["wind_speed"]
+    return [parse_wind_speed(wind_speed) for wind_speed in winds_speed]
 
 
-def get_sunrise_hours(html_text: BeautifulSoup) -> List[str]:
+def get_sunrise_hours(html_text: Union["BeautifulSoup", TableTexts]) -> List[str]:
     """Sunrise Hour
 
     Args:
-        html_text (BeautifulSoup): html page
+        html_text (Union["BeautifulSoup", TableTexts]): html page or its extracted table
 
     Returns:
         List[str]: sunride hour in the format (%hh/%mm)
     """
+    sunrise_hours = _table_texts(html_text)["sunrise"]
+    return [parse_hour(sunrise_hour) for sunrise_hour in sunrise_hours]
 
-    sunrise_hours = find_text_with_class_name(
-        html_text, SUNRISE_TAG["type"], SUNRISE_TAG["class_name"]
-    )
-    sunrise_hours_fixed = [sunrise_hour.split()[0] for sunrise_hour in sunrise_hours]
-    return sunrise_hours_fixed
 
+def get_sunset_hours(html_text: Union["BeautifulSoup", TableTexts]) -> List[str]:
+    """Sunset Hour
 
-def get_sunset_hours(html_text: BeautifulSoup) -> List[str]:
+    Args:
+        html_text (Union["BeautifulSoup", TableTexts]): html page or its extracted table
 
-    sunset_hours = find_text_with_class_name(
-        html_text, SUNSET_TAG["type"], SUNSET_TAG["class_name"]
-    )
-    sunset_hours_fixed = [sunset_hour.split()[0] for sunset_hour in sunset_hours]
-    return sunset_hours_fixed
+    Returns:
+        List[str]: sunset hour in the format (%hh/%mm)
+    """
+    sunset_hours = _table_texts(html_text)["sunset"]
+    return [parse_hour(sunset_hour) for sunset_hour in sunset_hours]
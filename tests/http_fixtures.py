@@ -0,0 +1,77 @@
+"""
+Offline HTTP helpers for the tests. Pages are served from tests/fixtures
+"""
+
+import io
+import os
+from typing import Dict, List
+
+from requests import PreparedRequest, Response
+from requests.adapters import BaseAdapter
+from requests.structures import CaseInsensitiveDict
+
+from eltiempoes.constants import MAIN_URL
+from eltiempoes.utils.create_urls import create_prediction_url
+
+FIXTURES_DIR = os.path.join(os.path.dirname(__file__), "fixtures")
+
+
+def read_fixture(file_name: str) -> bytes:
+    with open(os.path.join(FIXTURES_DIR, file_name), "rb") as fixture_file:
+        return fixture_file.read()
+
+
+def station_routes(station: str) -> Dict[str, tuple]:
+    """Routes of the daily and detallada pages of a station, with the Córdoba pages"""
+    return {
+        create_prediction_url(station, "dias"): (200, read_fixture("cordoba_dias.html")),
+        create_prediction_url(station, "long_detallada"): (
+            200,
+            read_fixture("cordoba_detallada.html"),
+        ),
+    }
+
+
+class FixtureAdapter(BaseAdapter):
+    """
+    Transport adapter answering every request from a dict of routes.
+    A route is (status_code, body) or (status_code, body, headers). Routes with
+    an ETag header answer 304 to a matching If-None-Match.
+    """
+
+    def __init__(self, routes: Dict[str, tuple]):
+        super().__init__()
+        self.routes = routes
+        self.requested_urls: List[str] = []
+
+    def send(self, request: PreparedRequest, **kwargs) -> Response:
+        self.requested_urls.append(request.url)
+        status_code, body, *extra_headers = self.routes.get(
+            request.url, (404, b"Not Found")
+        )
+        headers = CaseInsensitiveDict(
+            {"Content-Type": "text/html; charset=utf-8", "Content-Length": str(len(body))}
+        )
+        if extra_headers:
+            headers.update(extra_headers[0])
+        if "ETag" in headers and request.headers.get("If-None-Match") == headers["ETag"]:
+            status_code, body = 304, b""
+
+        response = Response()
+        response.status_code = status_code
+        response.raw = io.BytesIO(body)
+        response.headers = headers
+        response.encoding = "utf-8"
+        response.url = request.url
+        response.request = request
+        response.connection = self
+        return response
+
+    def close(self):
+        pass
+
+
+def mount_fixtures(session, routes: Dict[str, tuple]) -> FixtureAdapter:
+    adapter = FixtureAdapter(routes)
+    session.mount(MAIN_URL, adapter)
+    return adapter
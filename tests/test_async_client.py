@@ -0,0 +1,76 @@
+"""
+Test the asyncio client
+"""
+
+import asyncio
+import unittest
+
+from eltiempoes import AsyncElTiempoEs, ElTiempoEs
+from eltiempoes.utils.create_urls import create_prediction_url, create_search_url
+from tests.http_fixtures import mount_fixtures, read_fixture
+
+try:
+    import httpx
+except ImportError:
+    httpx = None
+
+ROUTES = {
+    create_search_url(name="cordoba"): (200, read_fixture("search_cordoba.json")),
+    create_prediction_url("cordoba", "dias"): (200, read_fixture("cordoba_dias.html")),
+    create_prediction_url("cordoba", "long_detallada"): (
+        200,
+        read_fixture("cordoba_detallada.html"),
+    ),
+}
+
+
+@unittest.skipIf(httpx is None, "httpx is not installed")
+class TestAsyncElTiempoClass(unittest.TestCase):
+    """
+    Class to test the asyncio client against the fixtures
+    """
+
+    def setUp(self):
+        self.in_flight = 0
+        self.max_in_flight = 0
+
+        async def handler(request):
+            self.in_flight += 1
+            self.max_in_flight = max(self.max_in_flight, self.in_flight)
+            await asyncio.sleep(0.01)
+            self.in_flight -= 1
+            status_code, body = ROUTES.get(str(request.url), (404, b"Not Found"))
+            return httpx.Response(status_code, content=body)
+
+        self.client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+
+    def test_same_output_as_sync_client(self):
+        async def fetch():
+            async with AsyncElTiempoEs(client=self.client) as tiempo:
+                return await tiempo.get_all_data_in_json(station_name="Córdoba")
+
+        all_json_data = asyncio.run(fetch())
+
+        sync_tiempo = ElTiempoEs()
+        mount_fixtures(sync_tiempo.session, ROUTES)
+        self.assertEqual(all_json_data, sync_tiempo.get_all_data_in_json("Córdoba"))
+
+    def test_pages_fetched_concurrently(self):
+        async def fetch():
+            async with AsyncElTiempoEs(client=self.client) as tiempo:
+                return await tiempo.get_all_data_in_json(station_name="cordoba")
+
+        asyncio.run(fetch())
+        self.assertEqual(self.max_in_flight, 2)
+
+    def test_search_location(self):
+        async def search():
+            async with AsyncElTiempoEs(client=self.client) as tiempo:
+                return await tiempo.search_location("cordoba")
+
+        stations = asyncio.run(search())
+        self.assertEqual(stations[0]["urlize"], "cordoba")
+
+
+if __name__ == "__main__":
+    unittest.main()
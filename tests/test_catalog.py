@@ -0,0 +1,80 @@
+"""
+Test the offline station catalog
+"""
+
+import json
+import os
+import tempfile
+import unittest
+
+from eltiempoes import ElTiempoEs, StationCatalog
+from eltiempoes.utils.create_urls import create_search_url
+from tests.http_fixtures import mount_fixtures, read_fixture
+
+STATIONS = json.loads(read_fixture("search_cordoba.json")) + [
+    {"id": "103117814", "name": "Madrid", "urlize": "madrid"},
+    {"id": "102510337", "name": "Alcalá de Henares", "urlize": "alcala-de-henares"},
+]
+
+
+class TestStationCatalog(unittest.TestCase):
+    """
+    Class to test StationCatalog
+    """
+
+    catalog = StationCatalog(STATIONS)
+
+    def names(self, location_name, limit=100):
+        return [station["urlize"] for station in self.catalog.search(location_name, limit)]
+
+    def test_prefix_search(self):
+        self.assertEqual(self.names("córdoba"), ["cordoba", "cordoba-veracruz"])
+        self.assertEqual(self.names("CORDOBI"), ["cordobilla-de-lacara"])
+        self.assertEqual(self.names("henares"), ["alcala-de-henares"])
+        self.assertEqual(self.names("cor", limit=1), ["cordoba"])
+
+    def test_fuzzy_search(self):
+        self.assertEqual(self.names("Madird"), ["madrid"])
+        self.assertEqual(self.names("xyzw"), [])
+        self.assertEqual(self.catalog.search("Madird", fuzzy=False), [])
+
+    def test_save_and_load(self):
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "catalog.json")
+            self.catalog.save(path)
+            catalog = StationCatalog.load(path)
+        self.assertEqual(len(catalog), len(STATIONS))
+        self.assertEqual(catalog.search("madrid"), self.catalog.search("madrid"))
+
+    def test_build_and_search_location(self):
+        tiempo = ElTiempoEs()
+        adapter = mount_fixtures(
+            tiempo.session,
+            {
+                create_search_url(name="cordoba"): (200, read_fixture("search_cordoba.json")),
+                create_search_url(name="sevilla"): (200, b"[]"),
+            },
+        )
+        tiempo.station_catalog = StationCatalog.build(tiempo, queries=["cordoba", "sevilla"])
+        self.assertEqual(len(tiempo.station_catalog), 3)
+        self.assertEqual(len(adapter.requested_urls), 2)
+
+        self.assertEqual(tiempo.search_location("Córdoba")[0]["id"], "102519240")
+        self.assertEqual(len(adapter.requested_urls), 2)
+
+    def test_search_location_asks_the_api_for_similar_names(self):
+        tiempo = ElTiempoEs(station_catalog=self.catalog)
+        madridejos = [{"id": "102514050", "name": "Madridejos", "urlize": "madridejos"}]
+        adapter = mount_fixtures(
+            tiempo.session,
+            {create_search_url(name="Madridejos"): (200, json.dumps(madridejos).encode())},
+        )
+        self.assertEqual(tiempo.search_location("Madridejos"), madridejos)
+        self.assertEqual(len(adapter.requested_urls), 1)
+
+        self.assertEqual(tiempo.search_location("Madrid")[0]["urlize"], "madrid")
+        self.assertEqual(len(adapter.requested_urls), 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,118 @@
+"""
+Test the change detection of refresh_forecast
+"""
+
+import time
+import unittest
+
+from eltiempoes import ElTiempoEs, ForecastCache
+from eltiempoes.changes import ForecastChange, diff_forecasts
+from eltiempoes.fast_extract import table_fingerprint
+from eltiempoes.utils.create_urls import create_prediction_url
+from tests.http_fixtures import mount_fixtures, read_fixture
+
+DAILY_URL = create_prediction_url("cordoba", "dias")
+DAILY_HTML = read_fixture("cordoba_dias.html")
+
+
+class TestChangeDetection(unittest.TestCase):
+    """
+    Class to test refresh_forecast and diff_forecasts
+    """
+
+    def setUp(self):
+        self.events = []
+        self.tiempo = ElTiempoEs(
+            forecast_cache=ForecastCache(), metrics=self.events.append
+        )
+        self.adapter = mount_fixtures(
+            self.tiempo.session,
+            {
+                DAILY_URL: (200, DAILY_HTML),
+                create_prediction_url("cordoba", "long_detallada"): (
+                    200,
+                    read_fixture("cordoba_detallada.html"),
+                ),
+            },
+        )
+
+    def tearDown(self):
+        self.tiempo.close()
+
+    def parse_events(self):
+        return [event for event in self.events if event.name == "parse"]
+
+    def test_fingerprint_ignores_the_rest_of_the_page(self):
+        html_text = DAILY_HTML.decode()
+        self.assertEqual(
+            table_fingerprint(html_text),
+            table_fingerprint(html_text.replace("&copy; eltiempo.es", "&copy; 2026")),
+        )
+        self.assertNotEqual(
+            table_fingerprint(html_text),
+            table_fingerprint(html_text.replace('max_temp">19º', 'max_temp">21º', 1)),
+        )
+
+    def test_unchanged_pages_are_not_parsed(self):
+        first = self.tiempo.refresh_forecast("Córdoba")
+        self.assertTrue(first.changed)
+        self.assertEqual(len(first.changes), 14 * 10)
+        self.assertEqual(first.forecast, self.tiempo.get_all_data_in_json("cordoba"))
+        parses = len(self.parse_events())
+
+        # Only the footer moved
+        self.adapter.routes[DAILY_URL] = (
+            200,
+            DAILY_HTML.replace(b"&copy; eltiempo.es", b"&copy; 2026 eltiempo.es"),
+        )
+        second = self.tiempo.refresh_forecast("cordoba")
+        self.assertFalse(second.changed)
+        self.assertEqual(second.changes, [])
+        self.assertEqual(second.forecast, first.forecast)
+        self.assertEqual(len(self.parse_events()), parses)
+        self.assertEqual(
+            [event.name for event in self.events].count("refresh.unchanged"), 1
+        )
+
+    def test_unchanged_refresh_renews_the_cache(self):
+        self.tiempo.forecast_cache = ForecastCache(ttl=0.2)
+        self.tiempo.refresh_forecast("cordoba")
+        time.sleep(0.15)
+        self.assertFalse(self.tiempo.refresh_forecast("cordoba").changed)
+        time.sleep(0.1)
+        requests_done = len(self.adapter.requested_urls)
+
+        self.tiempo.get_all_data_in_json("cordoba")
+        self.assertEqual(len(self.adapter.requested_urls), requests_done)
+
+    def test_changes_of_a_field(self):
+        first = self.tiempo.refresh_forecast("cordoba")
+        self.adapter.routes[DAILY_URL] = (
+            200,
+            DAILY_HTML.replace('max_temp">19º'.encode(), 'max_temp">21º'.encode(), 1),
+        )
+        update = self.tiempo.refresh_forecast("cordoba")
+
+        self.assertTrue(update.changed)
+        day = tuple(first.forecast[0]["date"])
+        self.assertEqual(
+            update.changes, [ForecastChange(day, "max_temperature", 19, 21)]
+        )
+        self.assertEqual(update.changed_dates, [day])
+        self.assertEqual(update.forecast[0]["max_temperature"], 21)
+        self.assertEqual(self.tiempo.get_all_data_in_json("cordoba")[0]["max_temperature"], 21)
+
+    def test_moving_window(self):
+        forecast = self.tiempo.refresh_forecast("cordoba").forecast
+        moved = forecast[1:] + [dict(forecast[0], date=(9, "Nov"))]
+        changes = diff_forecasts(forecast, moved)
+
+        left = [change for change in changes if change.new is None]
+        entered = [change for change in changes if change.old is None]
+        self.assertEqual({change.date for change in left}, {tuple(forecast[0]["date"])})
+        self.assertEqual({change.date for change in entered}, {(9, "Nov")})
+        self.assertEqual(len(changes), len(left) + len(entered))
+
+
+if __name__ == "__main__":
+    unittest.main()
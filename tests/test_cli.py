@@ -0,0 +1,99 @@
+"""
+Test the NDJSON command line of python -m eltiempoes
+"""
+
+import contextlib
+import io
+import json
+import unittest
+
+from eltiempoes import ElTiempoEs, StationCatalog
+from eltiempoes.__main__ import main, run
+from tests.http_fixtures import mount_fixtures, read_fixture, station_routes
+
+
+class RecordingOutput(io.StringIO):
+    """Keeps the number of input lines read when every line was written"""
+
+    def __init__(self):
+        super().__init__()
+        self.lines_read = 0
+        self.lines_read_at_write = []
+
+    def write(self, text):
+        self.lines_read_at_write.append(self.lines_read)
+        return super().write(text)
+
+
+class TestCommandLine(unittest.TestCase):
+    """
+    Class to test the command line
+    """
+
+    def setUp(self):
+        self.tiempo = ElTiempoEs(pool_maxsize=2)
+        routes = {}
+        for station in ("cordoba", "sevilla"):
+            routes.update(station_routes(station))
+        mount_fixtures(self.tiempo.session, routes)
+
+    def tearDown(self):
+        self.tiempo.close()
+
+    def test_ndjson_lines(self):
+        catalog = StationCatalog(json.loads(read_fixture("search_cordoba.json")))
+        output = io.StringIO()
+        lines = ["Sevilla\n", "\n", "# comment\n", "102519240\n", "999\n", "unknown\n"]
+
+        failed = run(self.tiempo, lines, output, catalog=catalog, max_workers=2)
+
+        records = {
+            record["station"]: record
+            for record in map(json.loads, output.getvalue().splitlines())
+        }
+        self.assertEqual(sorted(records), ["999", "Sevilla", "cordoba", "unknown"])
+        self.assertEqual(failed, 2)
+        self.assertTrue(records["cordoba"]["ok"])
+        self.assertEqual(len(records["cordoba"]["data"]), 14)
+        self.assertEqual(records["Sevilla"]["data"][0]["date"], [25, "Oct"])
+        self.assertIn("not in the catalog", records["999"]["error"])
+        self.assertFalse(records["unknown"]["ok"])
+
+    def test_input_is_read_lazily(self):
+        output = RecordingOutput()
+
+        def lines():
+            for _ in range(50):
+                output.lines_read += 1
+                yield "cordoba"
+
+        failed = run(self.tiempo, lines(), output, max_workers=1, max_pending=3)
+
+        self.assertEqual(failed, 0)
+        self.assertEqual(len(output.lines_read_at_write), 50)
+        # Never more than max_pending stations between the input and the output
+        for written, lines_read in enumerate(output.lines_read_at_write):
+            self.assertLessEqual(lines_read - written, 3)
+
+    def test_parser_processes(self):
+        output = io.StringIO()
+        failed = run(self.tiempo, ["cordoba", "sevilla"], output, parser_processes=1)
+
+        records = [json.loads(line) for line in output.getvalue().splitlines()]
+        self.assertEqual(failed, 0)
+        self.assertEqual(sorted(record["station"] for record in records), ["cordoba", "sevilla"])
+        self.assertTrue(all(len(record["data"]) == 14 for record in records))
+
+    def test_invalid_concurrency(self):
+        with self.assertRaises(ValueError):
+            run(self.tiempo, ["cordoba"], io.StringIO(), max_pending=0)
+        with self.assertRaises(ValueError):
+            run(self.tiempo, ["cordoba"], io.StringIO(), max_workers=-1)
+        with contextlib.redirect_stderr(io.StringIO()):
+            for argument in ("--workers", "--max-pending", "--parser-processes"):
+                with self.assertRaises(SystemExit):
+                    main([argument, "0"])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,85 @@
+"""
+Test the columnar forecast table
+"""
+
+import unittest
+from datetime import date
+
+from eltiempoes import ElTiempoEs, ForecastRecord, ForecastTable
+from eltiempoes.utils.dates import resolve_forecast_date
+from tests.http_fixtures import mount_fixtures, station_routes
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+
+class TestResolveForecastDate(unittest.TestCase):
+    """
+    Class to test the year of the forecast dates
+    """
+
+    def test_new_year(self):
+        self.assertEqual(resolve_forecast_date(2, "Ene", date(2026, 12, 28)), date(2027, 1, 2))
+        self.assertEqual(resolve_forecast_date(30, "Dic", date(2027, 1, 1)), date(2026, 12, 30))
+        self.assertEqual(resolve_forecast_date(1, "Nov", date(2026, 10, 25)), date(2026, 11, 1))
+
+
+@unittest.skipIf(np is None, "numpy is not installed")
+class TestForecastTable(unittest.TestCase):
+    """
+    Class to test ForecastTable against the json output
+    """
+
+    def setUp(self):
+        self.tiempo = ElTiempoEs()
+        routes = {**station_routes("cordoba"), **station_routes("sevilla")}
+        mount_fixtures(self.tiempo.session, routes)
+
+    def test_same_data_as_json(self):
+        table = self.tiempo.get_all_data_in_table("cordoba", reference_date=date(2026, 10, 18))
+        all_json_data = self.tiempo.get_all_data_in_json("cordoba")
+
+        self.assertEqual(len(table), 14)
+        self.assertEqual(table.max_temperature.dtype, np.int16)
+        self.assertEqual(table.max_temperature.tolist(), [day["max_temperature"] for day in all_json_data])
+        np.testing.assert_allclose(
+            table.precipitation_probability,
+            [day["precipitation_probability"] for day in all_json_data],
+        )
+        self.assertEqual(table.dates[0], np.datetime64("2026-10-25"))
+        self.assertEqual(table.dates[-1], np.datetime64("2026-11-07"))
+
+        record = next(iter(table))
+        self.assertIsInstance(record, ForecastRecord)
+        self.assertEqual(record.sunrise, all_json_data[0]["sunrise"])
+        self.assertFalse(hasattr(record, "__dict__"))
+
+    def test_records_with_missing_values(self):
+        table = self.tiempo.get_all_data_in_table("cordoba", reference_date=date(2026, 10, 18))
+        record = next(iter(table))
+        fields = {name: getattr(record, name) for name in ForecastRecord.__slots__}
+        fields.update(precipitation_probability=float("nan"), cloud_percentage=float("nan"))
+        missing = ForecastRecord(**fields)
+        same_missing = ForecastRecord(**fields)
+
+        self.assertEqual(missing, same_missing)
+        self.assertNotEqual(missing, record)
+        self.assertEqual(len({missing, same_missing, record}), 2)
+
+    def test_concat(self):
+        tables = [
+            result.data for result in self.tiempo.get_many(["cordoba", "sevilla"], output="table")
+        ]
+        table = ForecastTable.concat(tables)
+
+        self.assertEqual(len(table), 28)
+        self.assertEqual(sorted(table.stations), ["cordoba", "sevilla"])
+        sevilla_table = next(table for table in tables if table.stations == ["sevilla"])
+        self.assertEqual(list(table.select("sevilla")), list(sevilla_table))
+        self.assertEqual(table.station[0], table.stations[0])
+
+
+if __name__ == "__main__":
+    unittest.main()
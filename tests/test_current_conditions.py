@@ -0,0 +1,89 @@
+"""
+Test the current conditions API
+"""
+
+import json
+import unittest
+
+from eltiempoes import ElTiempoEs
+from eltiempoes.utils.create_urls import (
+    create_current_conditions_url,
+    create_search_url,
+    get_url_endpoint,
+)
+from tests.http_fixtures import mount_fixtures, read_fixture
+
+
+class TestCurrentConditions(unittest.TestCase):
+    """
+    Class to test ElTiempoEs.get_current_conditions
+    """
+
+    def setUp(self):
+        self.tiempo = ElTiempoEs()
+        self.adapter = mount_fixtures(
+            self.tiempo.session,
+            {
+                create_search_url(name="cordoba"): (
+                    200,
+                    read_fixture("search_cordoba.json"),
+                ),
+                create_current_conditions_url("ESXX0007"): (
+                    200,
+                    read_fixture("current_conditions_ESXX0007.json"),
+                    {"Content-Type": "application/json"},
+                ),
+            },
+        )
+
+    def tearDown(self):
+        self.tiempo.close()
+
+    def test_url(self):
+        url = create_current_conditions_url("ESXX0007")
+        self.assertEqual(
+            url,
+            "https://www.eltiempo.es/api/v1/get_current_conditions_by_pelmorex_id/ESXX0007",
+        )
+        self.assertEqual(get_url_endpoint(url), "current_conditions")
+
+    def test_by_id_and_by_station(self):
+        expected = json.loads(read_fixture("current_conditions_ESXX0007.json"))
+        self.assertEqual(self.tiempo.get_current_conditions("ESXX0007"), expected)
+
+        station = self.tiempo.search_location("cordoba")[0]
+        self.assertEqual(self.tiempo.get_current_conditions(station), expected)
+        # Only the json API is called, never a forecast page
+        self.assertFalse(
+            [url for url in self.adapter.requested_urls if url.endswith(".html")]
+        )
+
+    def test_unknown_id(self):
+        with self.assertRaises(Exception):
+            self.tiempo.get_current_conditions("XXXX0000")
+
+    def test_many(self):
+        stations = self.tiempo.search_location("cordoba")[:2]
+        results = {
+            result.station_name: result
+            for result in self.tiempo.get_many_current_conditions(stations)
+        }
+
+        self.assertEqual(sorted(results), ["ESXX0007", "MXVZ0025"])
+        self.assertEqual(results["ESXX0007"].data["temperature"], 21)
+        self.assertFalse(results["MXVZ0025"].ok)
+
+    def test_many_with_a_malformed_station(self):
+        stations = [{"id": 1, "name": "x"}, "ESXX0007"]
+        results = {
+            result.station_name: result
+            for result in self.tiempo.get_many_current_conditions(stations)
+        }
+
+        self.assertEqual(sorted(results), ["1", "ESXX0007"])
+        self.assertTrue(results["ESXX0007"].ok)
+        self.assertIsInstance(results["1"].error, ValueError)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,113 @@
+"""
+Test the fetch of the long detallada page when it answers 404
+"""
+
+import unittest
+
+from eltiempoes import ElTiempoEs, ForecastCache
+from eltiempoes.utils.create_urls import create_prediction_url
+from tests.http_fixtures import mount_fixtures, read_fixture
+
+DIAS_URL = create_prediction_url("cordoba", "dias")
+DETALLADA_URL = create_prediction_url("cordoba", "detallada")
+LONG_DETALLADA_URL = create_prediction_url("cordoba", "long_detallada")
+
+
+class TestDetalladaWarmup(unittest.TestCase):
+    """
+    Class to test ElTiempoEs._get_long_detallada
+    """
+
+    def setUp(self):
+        self.tiempo = ElTiempoEs(detallada_retries=3, detallada_backoff=0)
+        self.adapter = mount_fixtures(
+            self.tiempo.session,
+            {
+                DIAS_URL: (200, read_fixture("cordoba_dias.html")),
+                DETALLADA_URL: (200, b"<html></html>"),
+            },
+        )
+
+    def tearDown(self):
+        self.tiempo.close()
+
+    def serve_long_page_after_short_page(self):
+        """The long page answers 200 only right after a visit to the short one"""
+        page = (200, read_fixture("cordoba_detallada.html"))
+        original_send = self.adapter.send
+
+        def send(request, **kwargs):
+            if request.url == DETALLADA_URL:
+                self.adapter.routes[LONG_DETALLADA_URL] = page
+            response = original_send(request, **kwargs)
+            if request.url == LONG_DETALLADA_URL:
+                self.adapter.routes.pop(LONG_DETALLADA_URL, None)
+            return response
+
+        self.adapter.send = send
+
+    def test_station_is_remembered(self):
+        self.serve_long_page_after_short_page()
+
+        self.assertEqual(len(self.tiempo._get_detallada_prediction_json("cordoba")), 14)
+        self.assertEqual(
+            self.adapter.requested_urls,
+            [LONG_DETALLADA_URL, DETALLADA_URL, LONG_DETALLADA_URL],
+        )
+
+        # The short page is visited first, without the failed request
+        self.adapter.requested_urls.clear()
+        self.assertEqual(len(self.tiempo._get_detallada_prediction_json("cordoba")), 14)
+        self.assertEqual(self.adapter.requested_urls, [DETALLADA_URL, LONG_DETALLADA_URL])
+
+    def test_warmup_expires(self):
+        self.serve_long_page_after_short_page()
+        self.tiempo._get_detallada_prediction_json("cordoba")
+        self.assertIn("cordoba", self.tiempo._detallada_warmup_stations)
+
+        # The long page works directly now: no visit to the short page once expired
+        self.tiempo._detallada_warmup_stations["cordoba"] = 0
+        self.adapter.send = type(self.adapter).send.__get__(self.adapter)
+        self.adapter.routes[LONG_DETALLADA_URL] = (200, read_fixture("cordoba_detallada.html"))
+        self.adapter.requested_urls.clear()
+        self.assertEqual(len(self.tiempo._get_detallada_prediction_json("cordoba")), 14)
+        self.assertEqual(self.adapter.requested_urls, [LONG_DETALLADA_URL])
+        self.assertNotIn("cordoba", self.tiempo._detallada_warmup_stations)
+
+    def test_bounded_retries_and_partial_data(self):
+        forecast = self.tiempo.get_all_data_in_json("cordoba")
+
+        long_requests = self.adapter.requested_urls.count(LONG_DETALLADA_URL)
+        self.assertEqual(long_requests, 1 + self.tiempo.detallada_retries)
+        self.assertEqual(len(forecast), 14)
+        for item in forecast:
+            self.assertFalse(item["detallada_available"])
+            self.assertIsNone(item["precipitation_probability"])
+            self.assertIsNone(item["cloud_percentage"])
+            self.assertIsNone(item["ultraviolet_radiation"])
+            self.assertIsInstance(item["max_temperature"], int)
+
+    def test_partial_data_is_not_cached(self):
+        self.tiempo.forecast_cache = ForecastCache()
+        self.tiempo.get_all_data_in_json("cordoba")
+        self.adapter.requested_urls.clear()
+
+        self.tiempo.get_all_data_in_json("cordoba")
+        self.assertIn(DIAS_URL, self.adapter.requested_urls)
+
+    def test_unknown_station(self):
+        with self.assertRaises(Exception):
+            self.tiempo.get_all_data_in_json("unknown")
+        # The short page is missing too, so there are no more retries
+        self.assertEqual(
+            self.adapter.requested_urls[:2],
+            [
+                create_prediction_url("unknown", "long_detallada"),
+                create_prediction_url("unknown", "detallada"),
+            ],
+        )
+        self.assertEqual(len(self.adapter.requested_urls), 3)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,99 @@
+"""
+Test the Arrow, Parquet and pandas exports
+"""
+
+import os
+import tempfile
+import unittest
+from datetime import date
+
+from eltiempoes import ElTiempoEs
+from eltiempoes.columnar import ForecastTable
+from eltiempoes.export import to_arrow, to_pandas, write_parquet
+from eltiempoes.predictions import parse_daily_prediction, parse_detallada_prediction
+from tests.http_fixtures import mount_fixtures, read_fixture, station_routes
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+try:
+    import pyarrow
+    import pyarrow.parquet
+except ImportError:
+    pyarrow = None
+
+try:
+    import pandas
+except ImportError:
+    pandas = None
+
+
+@unittest.skipIf(numpy is None, "numpy is not installed")
+class TestExport(unittest.TestCase):
+    """
+    Class to test the exports against get_all_data_in_json
+    """
+
+    def setUp(self):
+        self.tiempo = ElTiempoEs()
+        mount_fixtures(self.tiempo.session, {**station_routes("cordoba"), **station_routes("sevilla")})
+        self.tables = [
+            self.tiempo.get_all_data_in_table(station, reference_date=date(2026, 10, 18))
+            for station in ("cordoba", "sevilla")
+        ]
+        self.all_json_data = self.tiempo.get_all_data_in_json("cordoba")
+        # The detallada page has 10 days only
+        detallada_prediction = parse_detallada_prediction(
+            read_fixture("cordoba_detallada.html").decode()
+        )
+        self.short_detallada_table = ForecastTable.from_predictions(
+            "cordoba",
+            parse_daily_prediction(read_fixture("cordoba_dias.html").decode()),
+            tuple(column[:10] for column in detallada_prediction),
+            reference_date=date(2026, 10, 18),
+        )
+
+    def tearDown(self):
+        self.tiempo.close()
+
+    @unittest.skipIf(pyarrow is None, "pyarrow is not installed")
+    def test_arrow_and_parquet(self):
+        arrow_table = to_arrow(self.tables)
+        self.assertEqual(arrow_table.num_rows, 28)
+        self.assertEqual(arrow_table.column("station")[14].as_py(), "sevilla")
+        self.assertEqual(arrow_table.column("date")[0].as_py(), date(2026, 10, 25))
+        self.assertEqual(
+            arrow_table.column("max_temperature").to_pylist()[:14],
+            [day["max_temperature"] for day in self.all_json_data],
+        )
+
+        short_arrow_table = to_arrow(self.short_detallada_table)
+        for name in ("precipitation_probability", "ultraviolet_radiation"):
+            column = short_arrow_table.column(name).to_pylist()
+            self.assertIsNotNone(column[9])
+            self.assertEqual(column[10:], [None] * 4)
+
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "forecast.parquet")
+            write_parquet(self.tables, path)
+            self.assertTrue(pyarrow.parquet.read_table(path).equals(arrow_table))
+
+    @unittest.skipIf(pandas is None, "pandas is not installed")
+    def test_pandas(self):
+        data_frame = self.tiempo.get_all_data_in_pandas("cordoba")
+        self.assertEqual(len(data_frame), 14)
+        self.assertEqual(
+            data_frame["ultraviolet_radiation"].tolist(),
+            [day["ultraviolet_radiation"] for day in self.all_json_data],
+        )
+        self.assertEqual(len(to_pandas(self.tables).groupby("station", observed=True)), 2)
+
+        short_data_frame = to_pandas(self.short_detallada_table)
+        self.assertEqual(short_data_frame["ultraviolet_radiation"].isna().tolist(), [False] * 10 + [True] * 4)
+        self.assertTrue(short_data_frame["cloud_percentage"][10:].isna().all())
+
+
+if __name__ == "__main__":
+    unittest.main()
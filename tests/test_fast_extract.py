@@ -0,0 +1,92 @@
+"""
+Test the regex extractor of the daily and detallada pages
+"""
+
+import unittest
+
+from eltiempoes import ElTiempoEs
+from eltiempoes.fast_extract import (
+    FastPathError,
+    extract_daily_prediction,
+    extract_detallada_prediction,
+)
+from eltiempoes.predictions import parse_daily_prediction, parse_detallada_prediction
+from eltiempoes.utils.create_urls import create_prediction_url
+from tests.http_fixtures import mount_fixtures, read_fixture
+
+
+class TestFastExtract(unittest.TestCase):
+    """
+    Class to test the fast path against the parser path
+    """
+
+    def setUp(self):
+        self.daily_html = read_fixture("cordoba_dias.html").decode("utf-8")
+        self.detallada_html = read_fixture("cordoba_detallada.html").decode("utf-8")
+
+    def test_parity_with_parser(self):
+        self.assertEqual(
+            extract_daily_prediction(self.daily_html),
+            parse_daily_prediction(self.daily_html),
+        )
+        self.assertEqual(
+            extract_detallada_prediction(self.detallada_html),
+            parse_detallada_prediction(self.detallada_html),
+        )
+
+    def test_entities_and_extra_classes(self):
+        html_text = self.detallada_html.replace(
+            "<span>Baja</span>", "<span>Muy&nbsp;baja</span>", 1
+        ).replace(
+            'class="m_table_weather_day_date"', 'class="m_table_weather_day_date today"', 1
+        )
+        self.assertEqual(
+            extract_detallada_prediction(html_text),
+            parse_detallada_prediction(html_text),
+        )
+
+    def test_invalid_pages(self):
+        # One row without maximum temperature
+        missing_value = self.daily_html.replace(
+            '<span class="m_table_weather_day_max_temp">19º', "<span>19º", 1
+        )
+        # A value that is not a number
+        wrong_value = self.daily_html.replace("1.5 mm", "- mm", 1)
+        for html_text in (missing_value, wrong_value, "<html></html>"):
+            with self.assertRaises(FastPathError):
+                extract_daily_prediction(html_text)
+
+    def test_fallback_to_parser(self):
+        html_text = self.daily_html.replace(
+            '<span class="m_table_weather_day_max_temp">19º', "<span>19º", 1
+        )
+        self.assertEqual(
+            parse_daily_prediction(html_text, fast_path=True),
+            parse_daily_prediction(html_text),
+        )
+
+    def test_client_option(self):
+        routes = {
+            create_prediction_url("cordoba", "dias"): (200, self.daily_html.encode()),
+            create_prediction_url("cordoba", "long_detallada"): (
+                200,
+                self.detallada_html.encode(),
+            ),
+        }
+        events = []
+        with ElTiempoEs(fast_extraction=True, metrics=events.append) as tiempo:
+            mount_fixtures(tiempo.session, routes)
+            fast_forecast = tiempo.get_all_data_in_json("cordoba")
+        with ElTiempoEs() as tiempo:
+            mount_fixtures(tiempo.session, routes)
+            forecast = tiempo.get_all_data_in_json("cordoba")
+
+        self.assertEqual(fast_forecast, forecast)
+        parse_events = [event for event in events if event.name == "parse"]
+        self.assertEqual(len(parse_events), 2)
+        self.assertTrue(all(event.tags["fast_path"] for event in parse_events))
+        self.assertFalse([event for event in events if event.name == "convert"])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,62 @@
+"""
+Test the in-process cache of the parsed forecasts
+"""
+
+import time
+import unittest
+
+from eltiempoes import ElTiempoEs, ForecastCache
+from eltiempoes.utils.create_urls import create_prediction_url
+from tests.http_fixtures import mount_fixtures, read_fixture
+
+
+class TestForecastCache(unittest.TestCase):
+    """
+    Class to test ForecastCache
+    """
+
+    def test_lru(self):
+        forecast_cache = ForecastCache(maxsize=2, ttl=60)
+        forecast_cache.set(("dias", "cordoba"), 1)
+        forecast_cache.set(("dias", "sevilla"), 2)
+        forecast_cache.get(("dias", "cordoba"))
+        forecast_cache.set(("dias", "madrid"), 3)
+
+        self.assertIsNone(forecast_cache.get(("dias", "sevilla")))
+        self.assertEqual(forecast_cache.get(("dias", "cordoba")), 1)
+        self.assertEqual(forecast_cache.stats()["size"], 2)
+
+    def test_ttl(self):
+        forecast_cache = ForecastCache(ttl=0.01)
+        forecast_cache.set(("dias", "cordoba"), 1)
+        time.sleep(0.02)
+        self.assertIsNone(forecast_cache.get(("dias", "cordoba")))
+
+    def test_client_uses_the_cache(self):
+        tiempo = ElTiempoEs(forecast_cache=ForecastCache())
+        adapter = mount_fixtures(
+            tiempo.session,
+            {
+                create_prediction_url("cordoba", "dias"): (200, read_fixture("cordoba_dias.html")),
+                create_prediction_url("cordoba", "long_detallada"): (
+                    200,
+                    read_fixture("cordoba_detallada.html"),
+                ),
+            },
+        )
+
+        all_json_data = tiempo.get_all_data_in_json("Córdoba")
+        all_json_data[0]["max_temperature"] = 100
+        cached_json_data = tiempo.get_all_data_in_json("cordoba")
+
+        self.assertNotEqual(cached_json_data[0]["max_temperature"], 100)
+        self.assertEqual(len(adapter.requested_urls), 2)
+        self.assertEqual(tiempo.forecast_cache.stats()["hits"], 1)
+
+        tiempo.forecast_cache.invalidate("CÓRDOBA")
+        tiempo.get_all_data_in_json("cordoba")
+        self.assertEqual(len(adapter.requested_urls), 4)
+
+
+if __name__ == "__main__":
+    unittest.main()
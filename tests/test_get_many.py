@@ -0,0 +1,86 @@
+"""
+Test the bulk forecast API
+"""
+
+import time
+import unittest
+
+from eltiempoes import ElTiempoEs
+from eltiempoes.utils.rate_limit import HostRateLimiter
+from tests.http_fixtures import mount_fixtures, station_routes
+
+
+class TestGetMany(unittest.TestCase):
+    """
+    Class to test ElTiempoEs.get_many
+    """
+
+    def setUp(self):
+        self.tiempo = ElTiempoEs(pool_maxsize=4)
+        routes = {}
+        for station in ("cordoba", "sevilla", "madrid"):
+            routes.update(station_routes(station))
+        self.adapter = mount_fixtures(self.tiempo.session, routes)
+
+    def tearDown(self):
+        self.tiempo.close()
+
+    def test_results_and_failures(self):
+        station_names = ["Córdoba", "Sevilla", "unknown", "Madrid"]
+        results = {
+            result.station_name: result
+            for result in self.tiempo.get_many(iter(station_names), max_workers=2)
+        }
+
+        self.assertEqual(sorted(results), sorted(station_names))
+        self.assertTrue(results["Sevilla"].ok)
+        self.assertEqual(len(results["Madrid"].data), 14)
+        self.assertFalse(results["unknown"].ok)
+        self.assertIsNone(results["unknown"].data)
+
+    def test_rate_limit_is_per_batch(self):
+        list(self.tiempo.get_many(["Córdoba", "Sevilla"], rate_limit=1000))
+        self.assertIsNone(self.tiempo.rate_limiter)
+
+    def test_parser_processes(self):
+        station_names = ["Córdoba", "Sevilla", "unknown"]
+        threads = {
+            result.station_name: result for result in self.tiempo.get_many(station_names)
+        }
+        processes = {
+            result.station_name: result
+            for result in self.tiempo.get_many(
+                station_names, max_workers=3, parser_processes=2
+            )
+        }
+
+        self.assertEqual(processes["Córdoba"].data, threads["Córdoba"].data)
+        self.assertEqual(processes["Sevilla"].data, threads["Sevilla"].data)
+        self.assertFalse(processes["unknown"].ok)
+
+        (table_result,) = self.tiempo.get_many(
+            ["Madrid"], output="table", parser_processes=1
+        )
+        self.assertEqual(len(table_result.data), 14)
+        self.assertEqual(table_result.data.stations, ["Madrid"])
+
+
+class TestHostRateLimiter(unittest.TestCase):
+    """
+    Class to test the token bucket
+    """
+
+    def test_rate_per_host(self):
+        rate_limiter = HostRateLimiter(rate=50)
+        start = time.monotonic()
+        for _ in range(6):
+            rate_limiter.acquire("https://www.eltiempo.es/cordoba.html")
+        rate_limiter.acquire("https://example.com/")
+        elapsed = time.monotonic() - start
+
+        self.assertGreaterEqual(elapsed, 0.09)
+        self.assertLess(elapsed, 0.5)
+
+
+if __name__ == "__main__":
+    unittest.main()
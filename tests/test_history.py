@@ -0,0 +1,103 @@
+"""
+Test the sqlite history of the fetched forecasts
+"""
+
+import os
+import tempfile
+import time
+import unittest
+from datetime import date, datetime
+
+from eltiempoes import ElTiempoEs, ForecastHistory
+from eltiempoes.utils.create_urls import create_prediction_url
+from tests.http_fixtures import mount_fixtures, read_fixture
+
+# The fixtures were saved on 25 Oct 2026
+FETCHED_AT = datetime(2026, 10, 25, 9).timestamp()
+
+
+class TestForecastHistory(unittest.TestCase):
+    """
+    Class to test ForecastHistory
+    """
+
+    def setUp(self):
+        self.tiempo = ElTiempoEs()
+        mount_fixtures(
+            self.tiempo.session,
+            {
+                create_prediction_url("cordoba", "dias"): (
+                    200,
+                    read_fixture("cordoba_dias.html"),
+                ),
+                create_prediction_url("cordoba", "long_detallada"): (
+                    200,
+                    read_fixture("cordoba_detallada.html"),
+                ),
+            },
+        )
+        self.forecast = self.tiempo.get_all_data_in_json("cordoba")
+
+    def tearDown(self):
+        self.tiempo.close()
+
+    def test_query_by_target_date(self):
+        history = ForecastHistory(":memory:")
+        for fetch in range(3):
+            history.add("Córdoba", self.forecast, FETCHED_AT + fetch * 3600)
+
+        snapshots = history.query("cordoba", target_date=date(2026, 11, 1))
+        self.assertEqual(len(snapshots), 3)
+        fetch_times = [snapshot.fetched_at for snapshot in snapshots]
+        self.assertEqual(fetch_times, sorted(fetch_times))
+        snapshot = snapshots[0]
+        self.assertEqual(snapshot.station, "cordoba")
+        self.assertEqual(snapshot.lead_days, 7)
+        self.assertEqual(snapshot.max_temperature, self.forecast[7]["max_temperature"])
+        self.assertEqual(
+            snapshot.ultraviolet_radiation, self.forecast[7]["ultraviolet_radiation"]
+        )
+        self.assertTrue(snapshot.detallada_available)
+
+        self.assertEqual(len(history.query("cordoba")), 3 * 14)
+        self.assertEqual(
+            len(history.query("cordoba", fetched_after=FETCHED_AT + 1)), 2 * 14
+        )
+        self.assertEqual(history.query("sevilla"), [])
+        history.close()
+
+    def test_batches_and_persistence(self):
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "history.sqlite")
+            history = ForecastHistory(path, batch_size=20)
+            history.add_many(
+                [("cordoba", self.forecast), ("unknown", None, Exception("404"))],
+                FETCHED_AT,
+            )
+            # 14 days are below the batch size: not written yet
+            other = ForecastHistory(path)
+            self.assertEqual(other.query("cordoba"), [])
+
+            history.add("cordoba", self.forecast, FETCHED_AT + 60)
+            self.assertEqual(len(other.query("cordoba")), 28)
+            history.close()
+            other.close()
+
+            reopened = ForecastHistory(path)
+            self.assertEqual(reopened.stations(), ["cordoba"])
+            reopened.close()
+
+    def test_client_adds_fetched_forecasts(self):
+        history = ForecastHistory(":memory:")
+        self.tiempo.forecast_history = history
+        start = time.time()
+        self.tiempo.get_all_data_in_json("cordoba")
+        self.tiempo.close()
+
+        snapshots = history.query("cordoba", fetched_after=start)
+        self.assertEqual(len(snapshots), 14)
+        history.close()
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,61 @@
+"""
+Test the hour by hour forecast
+"""
+
+import types
+import unittest
+
+from eltiempoes import ElTiempoEs
+from eltiempoes.utils.create_urls import create_prediction_url
+from tests.http_fixtures import mount_fixtures, read_fixture
+
+
+class TestHourlyPrediction(unittest.TestCase):
+    """
+    Class to test ElTiempoEs.stream_hourly_prediction_json
+    """
+
+    def setUp(self):
+        self.tiempo = ElTiempoEs()
+        mount_fixtures(
+            self.tiempo.session,
+            {
+                create_prediction_url("cordoba", "por_hora"): (
+                    200,
+                    read_fixture("cordoba_por_hora.html"),
+                )
+            },
+        )
+
+    def test_hours(self):
+        hours = self.tiempo.stream_hourly_prediction_json("Córdoba", chunk_size=512)
+        self.assertIsInstance(hours, types.GeneratorType)
+
+        hours = list(hours)
+        self.assertEqual(len(hours), 48)
+        self.assertEqual(hours[0]["date"], (25, "Oct"))
+        self.assertEqual(hours[0]["hour"], "00:00")
+        self.assertEqual(hours[-1]["date"], (26, "Oct"))
+        self.assertEqual(hours[-1]["hour"], "23:00")
+        self.assertIsInstance(hours[5]["temperature"], int)
+        self.assertIsInstance(hours[5]["precipitation"], float)
+
+    def test_lazy(self):
+        hours = self.tiempo.stream_hourly_prediction_json("cordoba", chunk_size=512)
+        first_hour = next(hours)
+        hours.close()
+        self.assertEqual(
+            set(first_hour),
+            {
+                "date",
+                "hour",
+                "temperature",
+                "precipitation",
+                "precipitation_probability",
+                "wind_speed",
+            },
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,68 @@
+"""
+Test the disk cache of the responses
+"""
+
+import os
+import tempfile
+import unittest
+
+from eltiempoes import ElTiempoEs, HttpCache
+from eltiempoes.utils.create_urls import create_prediction_url, create_search_url
+from tests.http_fixtures import mount_fixtures, read_fixture
+
+DAILY_URL = create_prediction_url("cordoba", "dias")
+DETALLADA_URL = create_prediction_url("cordoba", "long_detallada")
+SEARCH_URL = create_search_url(name="cordoba")
+
+
+class TestHttpCache(unittest.TestCase):
+    """
+    Class to test HttpCache under ElTiempoEs
+    """
+
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.cache_path = os.path.join(self.directory.name, "cache.sqlite")
+        self.routes = {
+            SEARCH_URL: (200, read_fixture("search_cordoba.json")),
+            DAILY_URL: (200, read_fixture("cordoba_dias.html"), {"ETag": '"v1"'}),
+            DETALLADA_URL: (200, read_fixture("cordoba_detallada.html")),
+        }
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def create_client(self, ttl=None):
+        http_cache = HttpCache(self.cache_path, ttl=ttl)
+        self.addCleanup(http_cache.close)
+        tiempo = ElTiempoEs(http_cache=http_cache)
+        adapter = mount_fixtures(tiempo.session, self.routes)
+        return tiempo, adapter
+
+    def test_fresh_entries_survive_restarts(self):
+        tiempo, adapter = self.create_client()
+        all_json_data = tiempo.get_all_data_in_json("Córdoba")
+        tiempo.search_location("cordoba")
+        self.assertEqual(len(adapter.requested_urls), 3)
+
+        tiempo, adapter = self.create_client()
+        self.assertEqual(tiempo.get_all_data_in_json("Córdoba"), all_json_data)
+        self.assertEqual(tiempo.search_location("cordoba")[0]["urlize"], "cordoba")
+        self.assertEqual(adapter.requested_urls, [])
+
+    def test_revalidation(self):
+        tiempo, adapter = self.create_client(ttl={"dias": 0})
+        daily_json_data = tiempo._get_daily_prediction_json("Córdoba")
+        self.assertEqual(tiempo._get_daily_prediction_json("Córdoba"), daily_json_data)
+
+        self.assertEqual(adapter.requested_urls, [DAILY_URL, DAILY_URL])
+        self.assertEqual(tiempo.http_cache.get(DAILY_URL).etag, '"v1"')
+
+    def test_errors_are_not_cached(self):
+        tiempo, _ = self.create_client()
+        tiempo._get(create_prediction_url("unknown", "dias"))
+        self.assertIsNone(tiempo.http_cache.get(create_prediction_url("unknown", "dias")))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,41 @@
+"""
+Test that importing the package does not load the heavy dependencies
+"""
+
+import subprocess
+import sys
+import unittest
+
+HEAVY_MODULES = ("requests", "bs4", "unidecode", "numpy", "httpx", "sqlite3", "pyarrow", "pandas")
+
+
+def loaded_modules(code):
+    check = f"{code}\nimport sys\nprint(' '.join(m for m in {HEAVY_MODULES!r} if m in sys.modules))"
+    output = subprocess.run(
+        [sys.executable, "-c", check], capture_output=True, text=True, check=True
+    ).stdout
+    return output.split()
+
+
+class TestLazyImports(unittest.TestCase):
+    """
+    Class to test the lazy imports of eltiempoes
+    """
+
+    def test_import_package(self):
+        self.assertEqual(loaded_modules("import eltiempoes"), [])
+
+    def test_import_public_classes(self):
+        code = (
+            "from eltiempoes import ElTiempoEs, AsyncElTiempoEs, HttpCache, "
+            "ForecastCache, StationCatalog, ForecastTable"
+        )
+        self.assertEqual(loaded_modules(code), [])
+
+    def test_loaded_on_first_use(self):
+        code = "from eltiempoes import ElTiempoEs\nElTiempoEs(parser='html.parser')"
+        self.assertEqual(loaded_modules(code), ["requests"])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,98 @@
+"""
+Test the country map snapshot of the ajax-maps-v2 endpoint
+"""
+
+import json
+import unittest
+from datetime import date
+
+from eltiempoes import ElTiempoEs
+from eltiempoes.maps import MapSnapshotError, align_with_stations, parse_map_snapshot
+from eltiempoes.utils.create_urls import create_maps_url, get_url_endpoint
+from tests.http_fixtures import mount_fixtures, read_fixture
+
+
+class TestMaps(unittest.TestCase):
+    """
+    Class to test the map snapshot
+    """
+
+    def setUp(self):
+        self.payload = read_fixture("maps_es.json").decode("utf-8")
+        self.stations = json.loads(read_fixture("search_cordoba.json"))
+
+    def test_url(self):
+        url = create_maps_url(date(2022, 5, 31), hour=1)
+        self.assertEqual(
+            url,
+            "https://www.eltiempo.es/ajax-maps-v2?principal=es&navigator=desktop&day=20220531&hour=1",
+        )
+        self.assertEqual(create_maps_url("20220531", 1), url)
+        self.assertEqual(get_url_endpoint(url), "maps")
+
+    def test_parse_json(self):
+        map_stations = parse_map_snapshot(self.payload)
+
+        names = [map_station.name for map_station in map_stations]
+        self.assertEqual(names, ["Córdoba", "Sevilla", "Madrid"])
+        cordoba = map_stations[0]
+        self.assertEqual(cordoba.id, "102519240")
+        self.assertEqual(cordoba.temperature, 21)
+        self.assertEqual(cordoba.max_temperature, 24)
+        self.assertEqual(cordoba.condition, "Nubes y claros")
+        self.assertEqual(cordoba.raw["temp"], "21º")
+
+    def test_unexpected_payloads(self):
+        cities = json.loads(self.payload)["cities"]
+        keyed_by_id = {city["id"]: city for city in cities}
+        without_id = [{key: value for key, value in city.items() if key != "id"} for city in cities]
+        wrong_temperature = [dict(cities[0], temp="N/D")]
+        for text in (
+            "<html></html>",
+            json.dumps(cities),
+            json.dumps(keyed_by_id),
+            json.dumps({"markers": cities}),
+            json.dumps({"cities": without_id}),
+            json.dumps({"cities": wrong_temperature}),
+        ):
+            with self.assertRaises(MapSnapshotError):
+                parse_map_snapshot(text)
+
+        # Generic keys are not read as fields
+        (map_station,) = parse_map_snapshot(
+            json.dumps({"cities": [dict(cities[0], code="ESXX0007")]})
+        )
+        self.assertIsNone(map_station.pelmorex_id)
+        self.assertEqual(map_station.raw["icon"], "02")
+
+    def test_align_with_stations(self):
+        map_stations = parse_map_snapshot(self.payload)
+        aligned = align_with_stations(map_stations, self.stations)
+        self.assertEqual(list(aligned), ["102519240"])
+
+        # By pelmorex_id when the ids differ, never by name
+        cities = json.loads(self.payload)["cities"]
+        other_ids = [dict(city, id="x" + city["id"]) for city in cities]
+        other_ids[0]["pelmorex_id"] = "ESXX0007"
+        aligned = align_with_stations(
+            parse_map_snapshot(json.dumps({"cities": other_ids})), self.stations
+        )
+        self.assertEqual(list(aligned), ["102519240"])
+        self.assertEqual(aligned["102519240"].id, "x102519240")
+
+    def test_client(self):
+        with ElTiempoEs() as tiempo:
+            adapter = mount_fixtures(
+                tiempo.session,
+                {create_maps_url("20261025", 1): (200, read_fixture("maps_es.json"))},
+            )
+            aligned = tiempo.get_map_snapshot("20261025", 1, stations=self.stations)
+            with self.assertRaises(Exception):
+                tiempo.get_map_snapshot("20261026", 1)
+
+        self.assertEqual(aligned["102519240"].temperature, 21)
+        self.assertEqual(len(adapter.requested_urls), 2)
+
+
+if __name__ == "__main__":
+    unittest.main()
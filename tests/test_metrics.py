@@ -0,0 +1,149 @@
+"""
+Test the metrics sent to the metrics sink
+"""
+
+import threading
+import unittest
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from eltiempoes import ElTiempoEs, MetricEvent
+from eltiempoes.utils.create_urls import create_prediction_url
+from tests.http_fixtures import mount_fixtures, read_fixture
+
+
+class TestMetrics(unittest.TestCase):
+    """
+    Class to test the metrics of ElTiempoEs
+    """
+
+    def setUp(self):
+        self.events = []
+        self.tiempo = ElTiempoEs(metrics=self.events.append)
+        self.adapter = mount_fixtures(
+            self.tiempo.session,
+            {
+                create_prediction_url("cordoba", "dias"): (
+                    200,
+                    read_fixture("cordoba_dias.html"),
+                ),
+                create_prediction_url("cordoba", "long_detallada"): (
+                    200,
+                    read_fixture("cordoba_detallada.html"),
+                ),
+            },
+        )
+
+    def tearDown(self):
+        self.tiempo.close()
+
+    def events_named(self, name):
+        return [event for event in self.events if event.name == name]
+
+    def test_daily_events(self):
+        self.tiempo._get_daily_prediction_json("Córdoba")
+
+        for event in self.events:
+            self.assertIsInstance(event, MetricEvent)
+            self.assertEqual(event.tags["station"], "cordoba")
+            self.assertEqual(event.tags["prediction_type"], "dias")
+
+        (status,) = self.events_named("http.status")
+        self.assertEqual(status.value, 200)
+        (size,) = self.events_named("http.bytes")
+        self.assertEqual(size.value, len(read_fixture("cordoba_dias.html")))
+        self.assertEqual(size.unit, "bytes")
+        self.assertEqual(len(self.events_named("http.download")), 1)
+        self.assertEqual(len(self.events_named("parse")), 1)
+
+        fields = [event.tags["field"] for event in self.events_named("convert")]
+        self.assertEqual(
+            fields,
+            [
+                "date",
+                "max_temperature",
+                "min_temperature",
+                "precipitation",
+                "wind_speed",
+                "sunrise",
+                "sunset",
+            ],
+        )
+        self.assertTrue(all(event.value >= 0 for event in self.events_named("convert")))
+
+    def test_detallada_retry(self):
+        long_detallada_url = create_prediction_url("cordoba", "long_detallada")
+        detallada_url = create_prediction_url("cordoba", "detallada")
+        page = self.adapter.routes.pop(long_detallada_url)
+        self.adapter.routes[detallada_url] = (200, b"<html></html>")
+
+        # The long page is served only after the short page has been visited
+        def send(request, **kwargs):
+            if request.url == detallada_url:
+                self.adapter.routes[long_detallada_url] = page
+            return original_send(request, **kwargs)
+
+        original_send = self.adapter.send
+        self.adapter.send = send
+        self.tiempo._get_detallada_prediction("Córdoba")
+
+        self.assertEqual(
+            [event.value for event in self.events_named("http.status")], [404, 200, 200]
+        )
+        (retry,) = self.events_named("detallada.retry")
+        self.assertEqual(retry.tags["prediction_type"], "detallada")
+
+    def test_no_sink(self):
+        tiempo = ElTiempoEs()
+        self.assertFalse(tiempo.metrics.enabled)
+        mount_fixtures(
+            tiempo.session,
+            {create_prediction_url("cordoba", "dias"): (200, read_fixture("cordoba_dias.html"))},
+        )
+        self.assertEqual(len(tiempo._get_daily_prediction_json("cordoba")), 14)
+        tiempo.close()
+
+    def test_connect_time(self):
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def do_GET(self):
+                self.send_response(200)
+                self.send_header("Content-Length", "2")
+                self.end_headers()
+                self.wfile.write(b"ok")
+
+            def log_message(self, *args):
+                pass
+
+        server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        thread = threading.Thread(target=server.serve_forever, daemon=True)
+        thread.start()
+        try:
+            url = "http://127.0.0.1:%d/" % server.server_address[1]
+            self.tiempo._request(url)
+            self.tiempo._request(url)
+        finally:
+            server.shutdown()
+            server.server_close()
+
+        # The second request reuses the pooled connection
+        (connect,) = self.events_named("http.connect")
+        self.assertEqual(connect.tags["host"], "127.0.0.1")
+        self.assertGreater(connect.value, 0)
+
+    def test_pool_manager_without_pool_classes(self):
+        from requests import Session
+        from requests.adapters import HTTPAdapter
+
+        session = Session()
+        adapter = HTTPAdapter()
+        del adapter.poolmanager.pool_classes_by_scheme
+        session.mount("https://", adapter)
+        tiempo = ElTiempoEs(session=session, metrics=self.events.append)
+
+        self.assertFalse(hasattr(adapter.poolmanager, "pool_classes_by_scheme"))
+        tiempo.close()
+
+
+if __name__ == "__main__":
+    unittest.main()
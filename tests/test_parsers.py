@@ -0,0 +1,65 @@
+"""
+Test that every parser backend returns the same output on the saved pages
+"""
+
+import unittest
+
+from eltiempoes.parsers import is_parser_available, parse_table, resolve_parser
+from eltiempoes.predictions import parse_daily_prediction, parse_detallada_prediction
+from tests.http_fixtures import read_fixture
+
+PAGES = ("cordoba_dias.html", "cordoba_detallada.html")
+
+
+class TestParserParity(unittest.TestCase):
+    """
+    Class to test the parser backends against html.parser
+    """
+
+    def assert_same_as_html_parser(self, parser):
+        if not is_parser_available(parser):
+            self.skipTest(f"{parser} is not installed")
+        for page in PAGES:
+            html_text = read_fixture(page).decode("utf-8")
+            self.assertEqual(
+                parse_table(html_text, parser), parse_table(html_text, "html.parser"), page
+            )
+
+        daily_text = read_fixture("cordoba_dias.html").decode("utf-8")
+        detallada_text = read_fixture("cordoba_detallada.html").decode("utf-8")
+        self.assertEqual(
+            parse_daily_prediction(daily_text, parser),
+            parse_daily_prediction(daily_text, "html.parser"),
+        )
+        self.assertEqual(
+            parse_detallada_prediction(detallada_text, parser),
+            parse_detallada_prediction(detallada_text, "html.parser"),
+        )
+
+    def test_lxml(self):
+        self.assert_same_as_html_parser("lxml")
+
+    def test_selectolax(self):
+        self.assert_same_as_html_parser("selectolax")
+
+    def test_partial_parsing(self):
+        for parser in ("html.parser", "lxml"):
+            if not is_parser_available(parser):
+                continue
+            for page in PAGES:
+                html_text = read_fixture(page).decode("utf-8")
+                self.assertEqual(
+                    parse_table(html_text, parser, partial=True),
+                    parse_table(html_text, parser, partial=False),
+                    (parser, page),
+                )
+
+    def test_resolve_parser(self):
+        self.assertEqual(resolve_parser("html.parser"), "html.parser")
+        self.assertIn(resolve_parser("auto"), ("selectolax", "lxml", "html.parser"))
+        with self.assertRaises(ValueError):
+            resolve_parser("html5")
+
+
+if __name__ == "__main__":
+    unittest.main()
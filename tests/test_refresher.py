@@ -0,0 +1,222 @@
+"""
+Test the coalescing of concurrent fetches and the background refresher
+"""
+
+import threading
+import time
+import unittest
+import warnings
+
+from eltiempoes import ElTiempoEs, ForecastCache, ForecastRefresher
+from eltiempoes.utils.create_urls import create_prediction_url
+from eltiempoes.utils.single_flight import SingleFlight
+from tests.http_fixtures import mount_fixtures, read_fixture
+
+
+def mount_cordoba(tiempo: ElTiempoEs, delay: float = 0):
+    adapter = mount_fixtures(
+        tiempo.session,
+        {
+            create_prediction_url("cordoba", "dias"): (200, read_fixture("cordoba_dias.html")),
+            create_prediction_url("cordoba", "long_detallada"): (
+                200,
+                read_fixture("cordoba_detallada.html"),
+            ),
+        },
+    )
+    send = adapter.send
+
+    def slow_send(request, **kwargs):
+        time.sleep(delay)
+        return send(request, **kwargs)
+
+    adapter.send = slow_send
+    return adapter
+
+
+class TestSingleFlight(unittest.TestCase):
+    """
+    Class to test SingleFlight
+    """
+
+    def test_error_is_shared(self):
+        single_flight = SingleFlight()
+        started = threading.Event()
+        errors = []
+
+        def fail():
+            started.set()
+            time.sleep(0.05)
+            raise ValueError("upstream")
+
+        def follower():
+            started.wait()
+            try:
+                single_flight.do("cordoba", lambda: 1)
+            except ValueError as error:
+                errors.append(error)
+
+        thread = threading.Thread(target=follower)
+        thread.start()
+        with self.assertRaises(ValueError):
+            single_flight.do("cordoba", fail)
+        thread.join()
+
+        self.assertEqual(len(errors), 1)
+        self.assertEqual(single_flight.in_flight(), 0)
+        self.assertEqual(single_flight.do("cordoba", lambda: 1), (1, False))
+
+    def test_concurrent_callers_share_one_fetch(self):
+        tiempo = ElTiempoEs()
+        adapter = mount_cordoba(tiempo, delay=0.1)
+        barrier = threading.Barrier(8)
+        forecasts = []
+
+        def get_forecast():
+            barrier.wait()
+            forecasts.append(tiempo.get_all_data_in_json("Córdoba"))
+
+        threads = [threading.Thread(target=get_forecast) for _ in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        tiempo.close()
+
+        # One request for the daily page and one for the detallada page
+        self.assertEqual(len(adapter.requested_urls), 2)
+        self.assertEqual(len(forecasts), 8)
+        self.assertTrue(all(forecast == forecasts[0] for forecast in forecasts))
+        forecasts[0][0]["max_temperature"] = 100
+        self.assertNotEqual(forecasts[1][0]["max_temperature"], 100)
+
+    def test_refresh_and_get_share_one_fetch(self):
+        tiempo = ElTiempoEs()
+        adapter = mount_cordoba(tiempo, delay=0.1)
+
+        def run_together(first, second):
+            results = []
+            thread = threading.Thread(target=lambda: results.append(first()))
+            thread.start()
+            while not tiempo._single_flight.in_flight():
+                time.sleep(0.001)
+            results.append(second())
+            thread.join()
+            return results
+
+        update, forecast = run_together(
+            lambda: tiempo.refresh_forecast("cordoba"),
+            lambda: tiempo.get_all_data_in_json("Córdoba"),
+        )
+        self.assertEqual(len(adapter.requested_urls), 2)
+        self.assertTrue(update.changed)
+        self.assertEqual(forecast, update.forecast)
+
+        forecast, update = run_together(
+            lambda: tiempo.get_all_data_in_json("Córdoba"),
+            lambda: tiempo.refresh_forecast("cordoba"),
+        )
+        self.assertEqual(len(adapter.requested_urls), 4)
+        self.assertFalse(update.changed)
+        self.assertEqual(forecast, update.forecast)
+        tiempo.close()
+
+
+class TestForecastRefresher(unittest.TestCase):
+    """
+    Class to test ForecastRefresher
+    """
+
+    def test_refreshes_update_the_cache(self):
+        tiempo = ElTiempoEs(forecast_cache=ForecastCache())
+        adapter = mount_cordoba(tiempo)
+        refreshed = []
+        two_refreshes = threading.Event()
+
+        def on_refresh(refreshed_forecast):
+            refreshed.append(refreshed_forecast)
+            if len(refreshed) == 2:
+                two_refreshes.set()
+
+        refresher = ForecastRefresher(
+            tiempo, ["cordoba"], interval=0.05, on_refresh=on_refresh
+        )
+        with refresher:
+            self.assertTrue(two_refreshes.wait(5))
+        requests_done = len(adapter.requested_urls)
+
+        self.assertTrue(all(refreshed_forecast.ok for refreshed_forecast in refreshed))
+        self.assertGreaterEqual(requests_done, 4)
+        # The pages did not change after the first refresh
+        self.assertTrue(refreshed[0].changed)
+        self.assertFalse(refreshed[1].changed)
+        self.assertEqual(refreshed[1].changes, [])
+        self.assertEqual(refreshed[1].update.forecast, refreshed[0].data)
+        self.assertEqual(refresher.get("Córdoba"), refreshed[-1].data)
+        # The refreshes keep the forecast cache warm
+        tiempo.get_all_data_in_json("cordoba")
+        self.assertEqual(len(adapter.requested_urls), requests_done)
+        tiempo.close()
+
+    def test_failed_refresh(self):
+        tiempo = ElTiempoEs()
+        mount_fixtures(tiempo.session, {})
+        refreshed = threading.Event()
+        refresher = ForecastRefresher(
+            tiempo,
+            ["unknown"],
+            interval=60,
+            jitter=0,
+            on_refresh=lambda _: refreshed.set(),
+        )
+        with refresher:
+            # Without jitter, the only station is due at the start
+            self.assertTrue(refreshed.wait(5))
+
+        self.assertFalse(refresher.last_refresh("unknown").ok)
+        with self.assertRaises(Exception):
+            refresher.get("unknown")
+        tiempo.close()
+
+    def test_cache_ttl_shorter_than_the_interval(self):
+        tiempo = ElTiempoEs(forecast_cache=ForecastCache(ttl=600))
+        with self.assertWarns(UserWarning):
+            ForecastRefresher(tiempo, interval=1800)
+        with warnings.catch_warnings():
+            warnings.simplefilter("error")
+            ForecastRefresher(tiempo, interval=500)
+        tiempo.close()
+
+    def test_stagger(self):
+        tiempo = ElTiempoEs()
+        refresher = ForecastRefresher(
+            tiempo, ["cordoba", "sevilla", "madrid", "malaga"], interval=100, jitter=0
+        )
+        refresher._stagger()
+        offsets = sorted(entry[0] for entry in refresher._schedule)
+        steps = [later - earlier for earlier, later in zip(offsets, offsets[1:])]
+        for step in steps:
+            self.assertAlmostEqual(step, 25, places=3)
+
+        refresher.remove("Sevilla")
+        self.assertEqual(len(refresher.stations()), 3)
+        tiempo.close()
+
+    def test_remove_and_add_back(self):
+        tiempo = ElTiempoEs()
+        mount_cordoba(tiempo)
+        refresher = ForecastRefresher(tiempo, ["cordoba"], interval=100)
+        (_, _, old_generation) = refresher._schedule[0]
+        refresher.remove("cordoba")
+        refresher.add("cordoba")
+        self.assertEqual(len(refresher._schedule), 1)
+
+        # A refresh of the removed station that was in flight does not reschedule it
+        refresher._refresh("cordoba", old_generation)
+        self.assertEqual(len(refresher._schedule), 1)
+        self.assertIsNone(refresher.last_refresh("cordoba"))
+        tiempo.close()
+
+
+if __name__ == "__main__":
+    unittest.main()
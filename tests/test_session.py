@@ -0,0 +1,56 @@
+"""
+Test the pooled session shared by the ElTiempoEs calls
+"""
+
+import unittest
+
+from requests import Session
+
+from eltiempoes import ElTiempoEs
+from eltiempoes.utils.create_urls import create_prediction_url, create_search_url
+from tests.http_fixtures import mount_fixtures, read_fixture
+
+
+class TestSession(unittest.TestCase):
+    """
+    Class to test the pooled session
+    """
+
+    def setUp(self):
+        self.tiempo = ElTiempoEs(pool_connections=2, pool_maxsize=20, timeout=3)
+        self.adapter = mount_fixtures(
+            self.tiempo.session,
+            {
+                create_search_url(name="cordoba"): (200, read_fixture("search_cordoba.json")),
+                create_prediction_url("cordoba", "dias"): (200, read_fixture("cordoba_dias.html")),
+                create_prediction_url("cordoba", "long_detallada"): (
+                    200,
+                    read_fixture("cordoba_detallada.html"),
+                ),
+            },
+        )
+
+    def tearDown(self):
+        self.tiempo.close()
+
+    def test_pool_configuration(self):
+        adapter = self.tiempo.session.get_adapter("https://example.com/")
+        self.assertEqual(adapter._pool_maxsize, 20)
+        self.assertEqual(adapter._pool_connections, 2)
+        self.assertEqual(self.tiempo.session.headers["Connection"], "keep-alive")
+
+    def test_all_calls_share_the_session(self):
+        self.tiempo.search_location("cordoba")
+        all_json_data = self.tiempo.get_all_data_in_json(station_name="Córdoba")
+
+        self.assertEqual(len(all_json_data), 14)
+        self.assertEqual(len(self.adapter.requested_urls), 3)
+
+    def test_custom_session(self):
+        session = Session()
+        tiempo = ElTiempoEs(session=session)
+        self.assertIs(tiempo.session, session)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,76 @@
+"""
+Test the streaming parser
+"""
+
+import unittest
+
+from eltiempoes import ElTiempoEs
+from eltiempoes.parsers import parse_table
+from eltiempoes.streaming import iter_table_rows
+from eltiempoes.utils.create_urls import create_prediction_url
+from tests.http_fixtures import mount_fixtures, read_fixture
+
+PAGES = ("cordoba_dias.html", "cordoba_detallada.html")
+
+
+def chunked(text, chunk_size):
+    for index in range(0, len(text), chunk_size):
+        yield text[index : index + chunk_size]
+
+
+class TestIterTableRows(unittest.TestCase):
+    """
+    Class to test the incremental parser against the full parse
+    """
+
+    def test_same_texts_as_extract_table(self):
+        for page in PAGES:
+            html_text = read_fixture(page).decode("utf-8")
+            for chunk_size in (7, 1024, len(html_text)):
+                rows = list(iter_table_rows(chunked(html_text, chunk_size)))
+                table = parse_table(html_text, "html.parser")
+                streamed_table = {
+                    field: [row[field] for row in rows if field in row] for field in table
+                }
+                self.assertEqual(streamed_table, table, (page, chunk_size))
+
+    def test_stops_reading_after_max_rows(self):
+        html_text = read_fixture("cordoba_dias.html").decode("utf-8")
+        chunks = chunked(html_text, 64)
+        rows = list(iter_table_rows(chunks, max_rows=3))
+
+        self.assertEqual(len(rows), 3)
+        self.assertGreater(len(list(chunks)), 0)
+
+
+class TestStreamPrediction(unittest.TestCase):
+    """
+    Class to test the streaming methods of ElTiempoEs
+    """
+
+    def setUp(self):
+        self.tiempo = ElTiempoEs(parser="html.parser")
+        mount_fixtures(
+            self.tiempo.session,
+            {
+                create_prediction_url("cordoba", "dias"): (200, read_fixture("cordoba_dias.html")),
+                create_prediction_url("cordoba", "long_detallada"): (
+                    200,
+                    read_fixture("cordoba_detallada.html"),
+                ),
+            },
+        )
+
+    def test_same_output_as_json_methods(self):
+        self.assertEqual(
+            list(self.tiempo.stream_daily_prediction_json("Córdoba", chunk_size=256)),
+            self.tiempo._get_daily_prediction_json("Córdoba"),
+        )
+        self.assertEqual(
+            list(self.tiempo.stream_detallada_prediction_json("Córdoba", chunk_size=256)),
+            self.tiempo._get_detallada_prediction_json("Córdoba"),
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,77 @@
+"""
+Test the single-pass row extractor against the saved pages
+"""
+
+import unittest
+
+from bs4 import BeautifulSoup
+
+from eltiempoes import web_scraping
+from eltiempoes.parsers import is_parser_available, parse_table
+from eltiempoes.web_scraping import (
+    CLASS_NAME_FIELDS,
+    SPAM_POSITION_FIELDS,
+    extract_table,
+    find_text_with_class_name,
+    find_text_with_spam_position,
+)
+from tests.http_fixtures import read_fixture
+
+
+class TestExtractTable(unittest.TestCase):
+    """
+    Class to test that extract_table matches the per-field lookups
+    """
+
+    daily_soup = BeautifulSoup(read_fixture("cordoba_dias.html"), "html.parser")
+    detallada_soup = BeautifulSoup(read_fixture("cordoba_detallada.html"), "html.parser")
+
+    def test_class_name_fields(self):
+        for soup in (self.daily_soup, self.detallada_soup):
+            table = extract_table(soup)
+            for field, tag in CLASS_NAME_FIELDS.items():
+                expected = find_text_with_class_name(soup, tag["type"], tag["class_name"])
+                self.assertEqual(table[field], expected, field)
+
+    def test_spam_position_fields(self):
+        table = extract_table(self.detallada_soup)
+        for field, spam_position in SPAM_POSITION_FIELDS.items():
+            expected = find_text_with_spam_position(self.detallada_soup, spam_position)
+            self.assertEqual(table[field], expected, field)
+
+    def test_getters_are_views_over_the_table(self):
+        getters = [
+            web_scraping.get_daily_dates,
+            web_scraping.get_max_temperatures,
+            web_scraping.get_min_temperatures,
+            web_scraping.get_precipitations,
+            web_scraping.get_winds_speed,
+            web_scraping.get_sunrise_hours,
+            web_scraping.get_sunset_hours,
+        ]
+        table = extract_table(self.daily_soup)
+        for getter in getters:
+            self.assertEqual(getter(self.daily_soup), getter(table))
+            self.assertEqual(len(getter(table)), 14)
+
+        self.assertEqual(
+            web_scraping.get_precipitation_probabilities(self.detallada_soup)[:2],
+            [0.05, 0.0],
+        )
+        self.assertEqual(web_scraping.get_detallada_dates(self.detallada_soup)[-1], (7, "Nov"))
+
+    def test_row_with_a_missing_spam(self):
+        html_text = read_fixture("cordoba_detallada.html").decode("utf-8")
+        soup = BeautifulSoup(html_text, "html.parser")
+        soup.findAll(attrs={"data-expand-tablechild-item": True})[3].find_all("span")[-1].decompose()
+        with self.assertRaises(IndexError):
+            extract_table(soup)
+        with self.assertRaises(IndexError):
+            find_text_with_spam_position(soup, SPAM_POSITION_FIELDS["ultraviolet_radiation"])
+        if is_parser_available("selectolax"):
+            with self.assertRaises(IndexError):
+                parse_table(str(soup), "selectolax")
+
+
+if __name__ == "__main__":
+    unittest.main()